@@ -0,0 +1 @@
+"""Benchmarks for the Nakama Console MCP tools."""
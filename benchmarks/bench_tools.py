@@ -0,0 +1,376 @@
+"""End-to-end tool benchmarks against the in-process fake Console.
+
+Every entry in TOOL_SPECS is driven through the real ``register_all_tools``
+dispatcher (argument validation, handler, envelope shaping), so numbers include
+everything an MCP client would wait for except stdio framing.
+
+    python -m benchmarks.bench_tools                       # small + large, c=1,8,32
+    python -m benchmarks.bench_tools --datasets small --concurrency 1 --iterations 20
+    python -m benchmarks.bench_tools --latency-ms 20 --output benchmarks/results/slow.json
+
+Results are written as JSON (one record per dataset x tool x concurrency) for
+comparison across runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.resources import ExportCache
+from src.tools import register_all_tools
+from src.tools.registry import TOOL_SPECS
+from tests.fake_console import FakeNakamaConsole, SyntheticDataset, user_id_for
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+DATASETS: Dict[str, Callable[[], SyntheticDataset]] = {
+    "small": lambda: SyntheticDataset(
+        users=100,
+        collections={"progress": 1_000, "inventory": 300},
+        value_bytes=256,
+        ledger_entries_per_user=50,
+    ),
+    "large": lambda: SyntheticDataset(
+        users=5_000,
+        collections={"progress": 1_000_000, "inventory": 250_000},
+        value_bytes=4_096,
+        ledger_entries_per_user=1_000,
+    ),
+}
+
+ArgsFor = Callable[[SyntheticDataset, int], Dict[str, Any]]
+
+
+def _user(ds: SyntheticDataset, i: int) -> str:
+    return user_id_for((i * 7919) % ds.users)
+
+
+def _object_id(ds: SyntheticDataset, i: int, collection: str = "progress") -> Dict[str, str]:
+    index = (i * 104_729) % ds.object_count(collection)
+    return {
+        "collection": collection,
+        "key": ds.key_for(collection, index),
+        "user_id": user_id_for(index % ds.users),
+    }
+
+
+# Arguments per tool; ``i`` varies ids so the response cache does not flatter results.
+TOOL_CASES: Dict[str, ArgsFor] = {
+    "nakama_status": lambda ds, i: {},
+    "nakama_list_accounts": lambda ds, i: {"max_objects": 100},
+    "nakama_get_account": lambda ds, i: {"id": _user(ds, i)},
+    "nakama_export_account": lambda ds, i: {"id": _user(ds, i), "response_mode": "auto"},
+    "nakama_get_friends": lambda ds, i: {"id": _user(ds, i)},
+    "nakama_get_user_groups": lambda ds, i: {"id": _user(ds, i)},
+    "nakama_list_wallet_ledger": lambda ds, i: {"id": _user(ds, i), "max_objects": 200},
+    "nakama_list_collections": lambda ds, i: {},
+    "nakama_list_storage": lambda ds, i: {"collection": "progress", "max_objects": 500},
+    "nakama_list_user_storage": lambda ds, i: {
+        "user_id": _user(ds, i),
+        "collection": "progress",
+    },
+    "nakama_list_storage_keys": lambda ds, i: {"collection": "progress", "max_objects": 1000},
+    "nakama_get_storage_object": lambda ds, i: _object_id(ds, i),
+    "nakama_get_storage_objects": lambda ds, i: {
+        # A collection no other case touches, so the object cache starts cold.
+        "objects": [_object_id(ds, i * 50 + n, "inventory") for n in range(50)],
+    },
+    "nakama_storage_exists": lambda ds, i: {
+        # Scattered ids plus a few that were never written.
+        "objects": [_object_id(ds, i * 40 + n) for n in range(40)]
+        + [{**_object_id(ds, i * 40 + n), "key": f"missing_{i}_{n}"} for n in range(10)],
+    },
+    "nakama_find_storage_keys": lambda ds, i: {
+        "collection": "progress",
+        "contains": f"{i % 10}",
+        "glob": "progress_*",
+        "limit": 50,
+    },
+    "nakama_scan_collection": lambda ds, i: {
+        "collection": "progress",
+        "max_objects": 200,
+        "start_offset": (i * 200) % ds.object_count("progress"),
+    },
+    "nakama_search_storage_values": lambda ds, i: {
+        "collection": "progress",
+        "path": "inventory.0",
+        "equals": f"item_{i % 50}",
+        "max_matches": 5,
+        "max_scanned": 500,
+    },
+    "nakama_aggregate_storage": lambda ds, i: {
+        "collection": "progress",
+        "fields": ["level", "gems"],
+        "group_by": "tier",
+        "histogram_path": "level",
+        "bucket_width": 10,
+        "sample_rate": 0.25,
+        "max_objects": 1000,
+        "start_offset": (i * 1000) % ds.object_count("progress"),
+    },
+    "nakama_sync_storage_index": lambda ds, i: {"collection": "progress"},
+    "nakama_query_storage_index": lambda ds, i: {
+        "collection": "progress",
+        "where": {"permission_read": i % 3},
+        "sort_by": "update_time",
+        "descending": True,
+        "limit": 50,
+    },
+    "nakama_read_result_set": lambda ds, i: {
+        "offset": (i * 100) % 1000,
+        "limit": 100,
+        "sort_by": "update_time",
+    },
+}
+
+# Optional one-off preparation per dataset; returned args are merged into every call.
+ToolSetup = Callable[[Callable], Awaitable[Dict[str, Any]]]
+
+
+async def _result_set_handle(call_tool: Callable) -> Dict[str, Any]:
+    result = await call_tool(
+        "nakama_list_storage", {"collection": "progress", "max_objects": 1000}
+    )
+    return {"handle": result["result_handle"]}
+
+
+async def _synced_index(call_tool: Callable) -> Dict[str, Any]:
+    result = {"complete": False}
+    while not result["complete"]:
+        result = await call_tool("nakama_sync_storage_index", {"collection": "progress"})
+    return {}
+
+
+TOOL_SETUP: Dict[str, ToolSetup] = {
+    "nakama_read_result_set": _result_set_handle,
+    "nakama_query_storage_index": _synced_index,
+}
+
+
+class _CaptureServer:
+    """Stand-in for the MCP Server that keeps the registered handlers."""
+
+    def __init__(self) -> None:
+        self.list_tools_handler: Optional[Callable] = None
+        self.call_tool_handler: Optional[Callable] = None
+
+    def list_tools(self):
+        def decorator(fn):
+            self.list_tools_handler = fn
+            return fn
+
+        return decorator
+
+    def call_tool(self):
+        def decorator(fn):
+            self.call_tool_handler = fn
+            return fn
+
+        return decorator
+
+
+@dataclass
+class BenchResult:
+    dataset: str
+    tool: str
+    concurrency: int
+    calls: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    requests_per_sec: float
+    console_calls_per_tool_call: float
+    console_bytes_per_tool_call: float
+    peak_memory_kb: float
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+async def _bench_tool(
+    call_tool: Callable,
+    console: FakeNakamaConsole,
+    *,
+    dataset_name: str,
+    tool: str,
+    args_for: ArgsFor,
+    concurrency: int,
+    iterations: int,
+    fixed_args: Optional[Dict[str, Any]] = None,
+) -> BenchResult:
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(iterations))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            arguments = {**(fixed_args or {}), **args_for(console.dataset, i)}
+            started = time.perf_counter()
+            try:
+                await call_tool(tool, arguments)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    console.reset_counters()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+
+    latencies.sort()
+    calls = len(latencies)
+    return BenchResult(
+        dataset=dataset_name,
+        tool=tool,
+        concurrency=concurrency,
+        calls=calls,
+        errors=errors,
+        p50_ms=round(_percentile(latencies, 50) * 1000, 3),
+        p95_ms=round(_percentile(latencies, 95) * 1000, 3),
+        p99_ms=round(_percentile(latencies, 99) * 1000, 3),
+        mean_ms=round(sum(latencies) / calls * 1000, 3) if calls else 0.0,
+        requests_per_sec=round(calls / elapsed, 2) if elapsed else 0.0,
+        console_calls_per_tool_call=round(console.total_requests / calls, 2) if calls else 0.0,
+        console_bytes_per_tool_call=round(console.bytes_sent / calls, 1) if calls else 0.0,
+        peak_memory_kb=round(max(peak - baseline, 0) / 1024, 1),
+    )
+
+
+async def run_benchmarks(
+    *,
+    datasets: List[str],
+    concurrency_levels: List[int],
+    iterations: int,
+    latency_ms: float = 0.0,
+    tools: Optional[List[str]] = None,
+) -> List[BenchResult]:
+    selected = [spec.name for spec in TOOL_SPECS if tools is None or spec.name in tools]
+    missing = [name for name in selected if name not in TOOL_CASES]
+    if missing:
+        raise ValueError(f"No benchmark case for tool(s): {', '.join(missing)}")
+
+    results: List[BenchResult] = []
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        for dataset_name in datasets:
+            console = FakeNakamaConsole(DATASETS[dataset_name](), latency=latency_ms / 1000)
+            client = console.client()
+            await client.authenticate()
+            server = _CaptureServer()
+            register_all_tools(
+                server,
+                client,
+                console.settings(nakama_metadata_index_path=":memory:"),
+                ExportCache(),
+            )
+            try:
+                for tool in selected:
+                    setup = TOOL_SETUP.get(tool)
+                    fixed_args = await setup(server.call_tool_handler) if setup else None
+                    for concurrency in concurrency_levels:
+                        results.append(
+                            await _bench_tool(
+                                server.call_tool_handler,
+                                console,
+                                dataset_name=dataset_name,
+                                tool=tool,
+                                args_for=TOOL_CASES[tool],
+                                concurrency=concurrency,
+                                iterations=iterations,
+                                fixed_args=fixed_args,
+                            )
+                        )
+            finally:
+                await client.close()
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    return results
+
+
+def write_report(results: List[BenchResult], path: Path, meta: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"meta": meta, "results": [asdict(r) for r in results]}
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def _print_table(results: List[BenchResult]) -> None:
+    header = (
+        f"{'dataset':<7} {'tool':<28} {'c':>3} {'p50ms':>9} {'p95ms':>9} {'p99ms':>9} "
+        f"{'rps':>9} {'calls/op':>8} {'peakKB':>9} {'err':>4}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.dataset:<7} {r.tool:<28} {r.concurrency:>3} {r.p50_ms:>9.2f} {r.p95_ms:>9.2f} "
+            f"{r.p99_ms:>9.2f} {r.requests_per_sec:>9.1f} {r.console_calls_per_tool_call:>8.1f} "
+            f"{r.peak_memory_kb:>9.1f} {r.errors:>4}"
+        )
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--datasets", default="small,large", help="Comma-separated: small,large")
+    p.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    p.add_argument("--iterations", type=int, default=50, help="Tool calls per scenario")
+    p.add_argument("--latency-ms", type=float, default=0.0, help="Simulated Console latency per request")
+    p.add_argument("--tools", default=None, help="Comma-separated tool names (default: all)")
+    p.add_argument("--output", type=str, default=None, help="JSON report path")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    datasets = [d for d in args.datasets.split(",") if d]
+    concurrency_levels = [int(c) for c in args.concurrency.split(",") if c]
+    tools = args.tools.split(",") if args.tools else None
+
+    results = asyncio.run(
+        run_benchmarks(
+            datasets=datasets,
+            concurrency_levels=concurrency_levels,
+            iterations=args.iterations,
+            latency_ms=args.latency_ms,
+            tools=tools,
+        )
+    )
+    _print_table(results)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / time.strftime("bench-%Y%m%d-%H%M%S.json")
+    write_report(
+        results,
+        output,
+        {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "latency_ms": args.latency_ms,
+        },
+    )
+    print(f"\nWrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Streaming aggregates over storage values: field stats, histograms and group-by.
+
+Each value is folded in as it arrives and then dropped, so memory depends on
+the number of distinct groups/buckets (capped), not on the objects scanned.
+Sampled scans scale counts and sums by ``1 / sample_rate``.
+"""
+
+import json
+import math
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.json_paths import ParsedPath, parse_path, resolve_path
+
+MAX_AGGREGATE_FIELDS = 8
+DEFAULT_MAX_GROUPS = 20
+MAX_GROUPS = 100
+MAX_HISTOGRAM_BUCKETS = 50
+# Distinct groups/buckets tracked while scanning; later newcomers count as "other".
+MAX_TRACKED_GROUPS = 10_000
+
+MISSING_LABEL = "(missing)"
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _label(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, sort_keys=True)[:200]
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, int) or float(value).is_integer():
+        return int(value)
+    return round(value, 4)
+
+
+class FieldStats:
+    """count / sum / min / max of the numeric values seen at one path."""
+
+    __slots__ = ("count", "missing", "non_numeric", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.missing = 0
+        self.non_numeric = 0
+        self.total: float = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, found: bool, value: Any) -> None:
+        if not found:
+            self.missing += 1
+            return
+        number = _number(value)
+        if number is None:
+            self.non_numeric += 1
+            return
+        self.count += 1
+        self.total += number
+        self.min = number if self.min is None else min(self.min, number)
+        self.max = number if self.max is None else max(self.max, number)
+
+    def summary(self, scale: float = 1.0, *, full: bool = True) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {
+            "count": self.count,
+            "sum": _round(self.total),
+            "min": _round(self.min),
+            "max": _round(self.max),
+            "mean": _round(self.total / self.count) if self.count else None,
+        }
+        if full:
+            summary["missing"] = self.missing
+            summary["non_numeric"] = self.non_numeric
+        if scale != 1.0:
+            summary["estimated_sum"] = _round(self.total * scale)
+        return summary
+
+
+class _Counter:
+    """Bounded label → count map; labels past ``MAX_TRACKED_GROUPS`` go to ``other``."""
+
+    def __init__(self) -> None:
+        self.counts: Dict[str, int] = {}
+        self.other = 0
+
+    def add(self, label: str) -> bool:
+        if label in self.counts:
+            self.counts[label] += 1
+            return True
+        if len(self.counts) < MAX_TRACKED_GROUPS:
+            self.counts[label] = 1
+            return True
+        self.other += 1
+        return False
+
+    def top(self, limit: int) -> Tuple[List[Tuple[str, int]], int]:
+        ranked = sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        dropped = sum(count for _, count in ranked[limit:])
+        return ranked[:limit], dropped + self.other
+
+
+class StorageAggregator:
+    """Fold decoded storage values into field stats, one histogram and a group-by.
+
+    ``fields`` are numeric paths summarised overall and per group. The
+    histogram buckets numbers by ``bucket_width`` when given, otherwise counts
+    distinct values. Values that are not JSON objects or arrays count as
+    ``undecodable`` and are otherwise skipped.
+    """
+
+    def __init__(
+        self,
+        *,
+        fields: Sequence[str] = (),
+        histogram_path: Optional[str] = None,
+        bucket_width: Optional[float] = None,
+        group_by: Optional[str] = None,
+        max_groups: int = DEFAULT_MAX_GROUPS,
+        sample_rate: float = 1.0,
+    ):
+        if len(fields) > MAX_AGGREGATE_FIELDS:
+            raise ValueError(f"At most {MAX_AGGREGATE_FIELDS} fields may be aggregated")
+        self.fields: List[Tuple[str, ParsedPath]] = [(f, parse_path(f)) for f in fields]
+        self.histogram_path = histogram_path
+        self._histogram_segments = parse_path(histogram_path) if histogram_path else None
+        self.bucket_width = bucket_width
+        self.group_by = group_by
+        self._group_segments = parse_path(group_by) if group_by else None
+        self.max_groups = max(1, min(int(max_groups), MAX_GROUPS))
+        self.sample_rate = sample_rate
+        self.count = 0
+        self.undecodable = 0
+        self.stats: Dict[str, FieldStats] = {name: FieldStats() for name, _ in self.fields}
+        self._histogram = _Counter()
+        self._bucket_non_numeric = 0
+        self._groups = _Counter()
+        self._group_stats: Dict[str, Dict[str, FieldStats]] = {}
+
+    def add(self, value: Any) -> None:
+        if not isinstance(value, (dict, list)):
+            self.undecodable += 1
+            return
+        self.count += 1
+        resolved = [(name, resolve_path(value, segments)) for name, segments in self.fields]
+        for name, (found, sub) in resolved:
+            self.stats[name].add(found, sub)
+
+        if self._histogram_segments is not None:
+            found, sub = resolve_path(value, self._histogram_segments)
+            if not found:
+                self._histogram.add(MISSING_LABEL)
+            elif self.bucket_width:
+                number = _number(sub)
+                if number is None:
+                    self._bucket_non_numeric += 1
+                else:
+                    low = math.floor(number / self.bucket_width) * self.bucket_width
+                    self._histogram.add(json.dumps(_round(low)))
+            else:
+                self._histogram.add(_label(sub))
+
+        if self._group_segments is not None:
+            found, sub = resolve_path(value, self._group_segments)
+            label = _label(sub) if found else MISSING_LABEL
+            if self._groups.add(label) and self.fields:
+                group = self._group_stats.setdefault(
+                    label, {name: FieldStats() for name, _ in self.fields}
+                )
+                for name, (found_field, field_value) in resolved:
+                    group[name].add(found_field, field_value)
+
+    @property
+    def scale(self) -> float:
+        return 1.0 / self.sample_rate if self.sample_rate < 1.0 else 1.0
+
+    def _histogram_summary(self) -> Dict[str, Any]:
+        if self.bucket_width:
+            numeric = {k: v for k, v in self._histogram.counts.items() if k != MISSING_LABEL}
+            ordered = sorted(numeric.items(), key=lambda kv: float(kv[0]))
+            kept = ordered[:MAX_HISTOGRAM_BUCKETS]
+            buckets = {
+                f"[{low}, {_round(float(low) + self.bucket_width)})": count
+                for low, count in kept
+            }
+            other = sum(c for _, c in ordered[MAX_HISTOGRAM_BUCKETS:]) + self._histogram.other
+            summary: Dict[str, Any] = {"path": self.histogram_path, "buckets": buckets}
+            if MISSING_LABEL in self._histogram.counts:
+                summary["missing"] = self._histogram.counts[MISSING_LABEL]
+            if self._bucket_non_numeric:
+                summary["non_numeric"] = self._bucket_non_numeric
+        else:
+            top, other = self._histogram.top(MAX_HISTOGRAM_BUCKETS)
+            summary = {"path": self.histogram_path, "values": dict(top)}
+        if other:
+            summary["other"] = other
+        return summary
+
+    def summary(self) -> Dict[str, Any]:
+        scale = self.scale
+        summary: Dict[str, Any] = {"count": self.count, "undecodable": self.undecodable}
+        if scale != 1.0:
+            summary["estimated_count"] = round(self.count * scale)
+        if self.fields:
+            summary["fields"] = {
+                name: stats.summary(scale) for name, stats in self.stats.items()
+            }
+        if self._histogram_segments is not None:
+            summary["histogram"] = self._histogram_summary()
+        if self._group_segments is not None:
+            top, other = self._groups.top(self.max_groups)
+            groups = []
+            for label, count in top:
+                group: Dict[str, Any] = {"group": label, "count": count}
+                if scale != 1.0:
+                    group["estimated_count"] = round(count * scale)
+                if label in self._group_stats:
+                    group["fields"] = {
+                        name: stats.summary(scale, full=False)
+                        for name, stats in self._group_stats[label].items()
+                    }
+                groups.append(group)
+            summary["group_by"] = self.group_by
+            summary["groups"] = groups
+            summary["distinct_groups"] = len(self._groups.counts)
+            if other:
+                summary["other_groups_count"] = other
+        return summary
+
+
+def hash_sampler(sample_rate: float) -> Callable[[Any], bool]:
+    """Deterministic row sampler: the same ids are kept for the same rate."""
+    threshold = int(sample_rate * 0x1_0000_0000)
+
+    def keep(row: Any) -> bool:
+        if not isinstance(row, dict):
+            return False
+        ident = f"{row.get('collection', '')}\x00{row.get('key', '')}\x00{row.get('user_id', '')}"
+        return zlib.crc32(ident.encode("utf-8")) < threshold
+
+    return keep
+
+
+__all__ = [
+    "MAX_AGGREGATE_FIELDS",
+    "DEFAULT_MAX_GROUPS",
+    "MAX_GROUPS",
+    "MAX_HISTOGRAM_BUCKETS",
+    "MAX_TRACKED_GROUPS",
+    "MISSING_LABEL",
+    "FieldStats",
+    "StorageAggregator",
+    "hash_sampler",
+]
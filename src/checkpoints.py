@@ -0,0 +1,175 @@
+"""Cursor checkpoints for jumping deep into Console list results.
+
+While pages stream past, each known ``next_cursor`` is recorded against the
+query it belongs to and the raw item offset it starts at. A later ``start_offset``
+request resumes from the nearest checkpoint at or before that offset instead of
+replaying every page from the first cursor.
+"""
+
+from __future__ import annotations
+
+import bisect
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Tuple
+
+from src.singleflight import request_key
+
+DEFAULT_CHECKPOINT_TTL_SECONDS = 5 * 60
+DEFAULT_CHECKPOINT_MAX_QUERIES = 256
+DEFAULT_CHECKPOINTS_PER_QUERY = 1000
+
+
+class _QueryIndex:
+    __slots__ = ("offsets", "cursors", "expires", "by_cursor")
+
+    def __init__(self) -> None:
+        self.offsets: List[int] = []
+        self.cursors: Dict[int, str] = {}
+        self.expires: Dict[int, float] = {}
+        self.by_cursor: Dict[str, int] = {}
+
+    def drop(self, offset: int) -> None:
+        cursor = self.cursors.pop(offset, None)
+        self.expires.pop(offset, None)
+        if cursor is not None and self.by_cursor.get(cursor) == offset:
+            del self.by_cursor[cursor]
+        index = bisect.bisect_left(self.offsets, offset)
+        if index < len(self.offsets) and self.offsets[index] == offset:
+            del self.offsets[index]
+
+
+class CursorCheckpoints:
+    """(query fingerprint, raw item offset) → Console cursor, expiring after a TTL.
+
+    Queries are LRU-bounded by ``max_queries``; each keeps at most
+    ``max_per_query`` checkpoints, dropping the oldest-expiring first.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = DEFAULT_CHECKPOINT_TTL_SECONDS,
+        max_queries: int = DEFAULT_CHECKPOINT_MAX_QUERIES,
+        max_per_query: int = DEFAULT_CHECKPOINTS_PER_QUERY,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_queries = max(1, max_queries)
+        self.max_per_query = max(1, max_per_query)
+        self._queries: "OrderedDict[Hashable, _QueryIndex]" = OrderedDict()
+        self.recorded = 0
+        self.jumps = 0
+        self.misses = 0
+
+    def for_query(
+        self, path: str, params: Optional[Mapping[str, Any]] = None
+    ) -> "QueryCheckpoints":
+        """Checkpoints for one list query; ``params`` must exclude the cursor."""
+        return QueryCheckpoints(self, request_key(path, params))
+
+    def _index(self, fingerprint: Hashable, *, create: bool) -> Optional[_QueryIndex]:
+        index = self._queries.get(fingerprint)
+        if index is None:
+            if not create:
+                return None
+            index = self._queries[fingerprint] = _QueryIndex()
+            while len(self._queries) > self.max_queries:
+                self._queries.popitem(last=False)
+        self._queries.move_to_end(fingerprint)
+        return index
+
+    def _expire(self, index: _QueryIndex) -> None:
+        now = time.monotonic()
+        for offset in [o for o, t in index.expires.items() if t <= now]:
+            index.drop(offset)
+
+    def record(self, fingerprint: Hashable, offset: int, cursor: str) -> None:
+        if self.ttl_seconds <= 0 or offset <= 0 or not cursor:
+            return
+        index = self._index(fingerprint, create=True)
+        if offset not in index.cursors:
+            bisect.insort(index.offsets, offset)
+        elif index.by_cursor.get(index.cursors[offset]) == offset:
+            del index.by_cursor[index.cursors[offset]]
+        index.cursors[offset] = cursor
+        index.expires[offset] = time.monotonic() + self.ttl_seconds
+        index.by_cursor[cursor] = offset
+        self.recorded += 1
+        if len(index.offsets) > self.max_per_query:
+            self._expire(index)
+            while len(index.offsets) > self.max_per_query:
+                index.drop(min(index.expires, key=index.expires.__getitem__))
+
+    def nearest(self, fingerprint: Hashable, offset: int) -> Tuple[int, Optional[str]]:
+        """Closest live checkpoint at or before ``offset``; (0, None) means start over."""
+        index = self._index(fingerprint, create=False)
+        if index is not None and offset > 0:
+            self._expire(index)
+            position = bisect.bisect_right(index.offsets, offset)
+            if position:
+                found = index.offsets[position - 1]
+                self.jumps += 1
+                return found, index.cursors[found]
+        if offset > 0:
+            self.misses += 1
+        return 0, None
+
+    def offset_of(self, fingerprint: Hashable, cursor: str) -> Optional[int]:
+        """Offset a known cursor starts at, if it is still checkpointed."""
+        index = self._index(fingerprint, create=False)
+        if index is None:
+            return None
+        self._expire(index)
+        return index.by_cursor.get(cursor)
+
+    def clear(self) -> None:
+        self._queries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queries": len(self._queries),
+            "checkpoints": sum(len(i.offsets) for i in self._queries.values()),
+            "recorded": self.recorded,
+            "jumps": self.jumps,
+            "misses": self.misses,
+        }
+
+
+class QueryCheckpoints:
+    """``CursorCheckpoints`` bound to one query fingerprint."""
+
+    __slots__ = ("store", "fingerprint")
+
+    def __init__(self, store: CursorCheckpoints, fingerprint: Hashable):
+        self.store = store
+        self.fingerprint = fingerprint
+
+    def record(self, offset: int, cursor: str) -> None:
+        self.store.record(self.fingerprint, offset, cursor)
+
+    def nearest(self, offset: int) -> Tuple[int, Optional[str]]:
+        return self.store.nearest(self.fingerprint, offset)
+
+    def offset_of(self, cursor: str) -> Optional[int]:
+        return self.store.offset_of(self.fingerprint, cursor)
+
+
+def query_checkpoints(
+    checkpoints: Optional[CursorCheckpoints],
+    path: str,
+    params: Optional[Mapping[str, Any]] = None,
+) -> Optional[QueryCheckpoints]:
+    """``checkpoints.for_query`` that tolerates ``checkpoints=None``."""
+    if checkpoints is None:
+        return None
+    return checkpoints.for_query(path, params)
+
+
+__all__ = [
+    "DEFAULT_CHECKPOINT_TTL_SECONDS",
+    "DEFAULT_CHECKPOINT_MAX_QUERIES",
+    "DEFAULT_CHECKPOINTS_PER_QUERY",
+    "CursorCheckpoints",
+    "QueryCheckpoints",
+    "query_checkpoints",
+]
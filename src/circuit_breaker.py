@@ -0,0 +1,129 @@
+"""Circuit breaker that fails fast while the Nakama Console is unreachable."""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT_SECONDS = 15.0
+
+# Connection-level failures that mean "Console unreachable"; HTTP error statuses
+# prove the Console answered and never trip the breaker.
+BREAKER_FAILURE_EXCEPTIONS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadTimeout,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ConsoleUnavailableError(RuntimeError):
+    """Raised without contacting the Console while the circuit is open."""
+
+
+class CircuitBreaker:
+    """Closed → open after consecutive connect failures/timeouts; half-open probes.
+
+    While open every request fails immediately. Once ``reset_timeout`` has elapsed
+    a single request is let through as a probe: success closes the circuit,
+    failure re-opens it for another ``reset_timeout``. ``before_request`` hands
+    the probe a token; only a verdict carrying that token frees the probe slot,
+    so a request admitted before the circuit opened cannot release it.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT_SECONDS,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._open = False
+        self._opened_at = 0.0
+        # Token of the probe in flight, if any.
+        self._probe: Optional[int] = None
+        self.consecutive_failures = 0
+        self.opens = 0
+        self.probes = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if not self._open:
+            return CLOSED
+        if self._probe is not None or self._retry_in() <= 0:
+            return HALF_OPEN
+        return OPEN
+
+    def _retry_in(self) -> float:
+        return self._opened_at + self.reset_timeout - time.monotonic()
+
+    def before_request(self) -> Optional[int]:
+        """Admit a request, or raise ConsoleUnavailableError while open.
+
+        Returns the probe token when the request is the half-open probe, else
+        None; pass it back to ``record_failure``/``record_abandoned``.
+        """
+        if not self._open:
+            return None
+        if self._probe is None and self._retry_in() <= 0:
+            self.probes += 1
+            self._probe = self.probes
+            return self._probe
+        self.rejected += 1
+        raise ConsoleUnavailableError(
+            "Nakama Console unavailable: circuit open after "
+            f"{self.consecutive_failures} consecutive connection failures/timeouts; "
+            f"next probe in {max(self._retry_in(), 0):.0f}s"
+        )
+
+    def record_success(self, probe: Optional[int] = None) -> None:
+        # Any answer proves the Console reachable, whether or not it was the probe.
+        self._open = False
+        self._probe = None
+        self.consecutive_failures = 0
+
+    def record_failure(self, probe: Optional[int] = None) -> None:
+        self.consecutive_failures += 1
+        is_probe = probe is not None and probe == self._probe
+        if is_probe or self.consecutive_failures >= self.failure_threshold:
+            if not self._open:
+                self.opens += 1
+            self._open = True
+            self._opened_at = time.monotonic()
+        if is_probe:
+            self._probe = None
+
+    def record_abandoned(self, probe: Optional[int] = None) -> None:
+        """The request ended without a verdict (e.g. cancelled); free its probe slot."""
+        if probe is not None and probe == self._probe:
+            self._probe = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opens": self.opens,
+            "probes": self.probes,
+            "rejected": self.rejected,
+            "next_probe_in": round(max(self._retry_in(), 0), 1) if self._open else None,
+        }
+
+
+__all__ = [
+    "DEFAULT_FAILURE_THRESHOLD",
+    "DEFAULT_RESET_TIMEOUT_SECONDS",
+    "BREAKER_FAILURE_EXCEPTIONS",
+    "CLOSED",
+    "OPEN",
+    "HALF_OPEN",
+    "ConsoleUnavailableError",
+    "CircuitBreaker",
+]
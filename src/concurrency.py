@@ -0,0 +1,137 @@
+"""Adaptive (AIMD) concurrency limit shared by every Console request, plus rate pacing."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+DEFAULT_INITIAL_LIMIT = 10
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 64
+
+
+class AdaptiveLimiter:
+    """Additive-increase / multiplicative-decrease limit on in-flight requests.
+
+    Each successful request that ran while the limit was saturated adds
+    ``1 / limit`` (about +1 per round trip). A 429/5xx/timeout, or latency above
+    ``latency_tolerance`` times the observed baseline, multiplies the limit by
+    ``backoff_ratio``; at most once per baseline round trip, so a burst of
+    failures from one overload episode counts once.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = DEFAULT_INITIAL_LIMIT,
+        min_limit: int = DEFAULT_MIN_LIMIT,
+        max_limit: int = DEFAULT_MAX_LIMIT,
+        backoff_ratio: float = 0.7,
+        latency_tolerance: float = 3.0,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_use = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._baseline: Optional[float] = None
+        self._last_decrease = 0.0
+        self.overloads = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    async def acquire(self) -> None:
+        if self._in_use < self.limit and not self._waiters:
+            self._in_use += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # A slot was handed over just as we were cancelled; give it back.
+                self._in_use -= 1
+                self._wake()
+            raise
+        finally:
+            if fut in self._waiters:
+                self._waiters.remove(fut)
+
+    def release(self, *, latency: Optional[float] = None, overloaded: bool = False) -> None:
+        saturated = self._in_use >= self.limit
+        self._in_use -= 1
+        if overloaded:
+            self.overloads += 1
+            self._decrease()
+        elif latency is not None:
+            self._observe(latency, saturated)
+        self._wake()
+
+    def _observe(self, latency: float, saturated: bool) -> None:
+        if self._baseline is None:
+            self._baseline = latency
+        else:
+            # Baseline tracks the minimum but drifts up slowly so it can recover.
+            self._baseline = min(latency, self._baseline * 1.01)
+        if latency > self._baseline * self.latency_tolerance:
+            self._decrease()
+        elif saturated:
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        window = max(self._baseline or 0.0, 0.05)
+        if now - self._last_decrease < window:
+            return
+        self._last_decrease = now
+        self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+        self.decreases += 1
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_use < self.limit:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                self._in_use += 1
+                fut.set_result(None)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "limit": self.limit,
+            "in_use": self._in_use,
+            "waiting": len(self._waiters),
+            "overloads": self.overloads,
+            "decreases": self.decreases,
+            "baseline_latency_ms": round(self._baseline * 1000, 1) if self._baseline else None,
+        }
+
+
+class RatePacer:
+    """Spaces ``wait()`` returns at least ``1 / rate`` seconds apart, without bursts."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        now = time.monotonic()
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+__all__ = [
+    "DEFAULT_INITIAL_LIMIT",
+    "DEFAULT_MIN_LIMIT",
+    "DEFAULT_MAX_LIMIT",
+    "AdaptiveLimiter",
+    "RatePacer",
+]
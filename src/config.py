@@ -15,12 +15,97 @@ class NakamaSettings(BaseSettings):
       - NAKAMA_NAKAMA_CONSOLE_URL
       - NAKAMA_NAKAMA_USERNAME
       - NAKAMA_NAKAMA_PASSWORD
+
+    Optional HTTP connection tuning:
+      - NAKAMA_NAKAMA_MAX_CONNECTIONS
+      - NAKAMA_NAKAMA_MAX_KEEPALIVE_CONNECTIONS
+      - NAKAMA_NAKAMA_KEEPALIVE_EXPIRY_SECONDS
+      - NAKAMA_NAKAMA_HTTP2 (requires the ``h2`` package)
+      - NAKAMA_NAKAMA_CACHE_MAX_BYTES (0 disables the GET response cache)
+
+    Optional retry policy for transient GET failures:
+      - NAKAMA_NAKAMA_RETRY_MAX_ATTEMPTS (1 disables retries)
+      - NAKAMA_NAKAMA_RETRY_BASE_DELAY_SECONDS
+      - NAKAMA_NAKAMA_RETRY_MAX_DELAY_SECONDS
+      - NAKAMA_NAKAMA_RETRY_BUDGET_RATIO
+
+    Optional adaptive concurrency limit shared by all tools:
+      - NAKAMA_NAKAMA_CONCURRENCY_INITIAL
+      - NAKAMA_NAKAMA_CONCURRENCY_MIN
+      - NAKAMA_NAKAMA_CONCURRENCY_MAX
+
+    Optional circuit breaker for an unreachable Console:
+      - NAKAMA_NAKAMA_BREAKER_FAILURE_THRESHOLD
+      - NAKAMA_NAKAMA_BREAKER_RESET_SECONDS
+
+    Optional per-tool-call time budget (0 disables; list and batch tools return
+    partial results instead of running past it):
+      - NAKAMA_NAKAMA_TOOL_DEADLINE_SECONDS
+
+    Optional read-ahead depth for auto-pagination (0 fetches pages strictly in turn):
+      - NAKAMA_NAKAMA_PREFETCH_PAGES
+
+    Optional cache of aggregated list results behind result handles (0 disables):
+      - NAKAMA_NAKAMA_RESULT_SET_MAX_BYTES
+      - NAKAMA_NAKAMA_RESULT_SET_TTL_SECONDS
+
+    Optional lifetime of remembered list cursors used by start_offset (0 disables):
+      - NAKAMA_NAKAMA_CHECKPOINT_TTL_SECONDS
+
+    Optional cache of fetched storage objects, served while a storage listing seen
+    within the revalidation window still shows the same version (0 disables):
+      - NAKAMA_NAKAMA_OBJECT_CACHE_MAX_BYTES
+      - NAKAMA_NAKAMA_OBJECT_REVALIDATE_SECONDS
+
+    Optional in-memory key index behind nakama_find_storage_keys (rebuilt after the
+    TTL; rows are capped across all collections):
+      - NAKAMA_NAKAMA_KEY_INDEX_TTL_SECONDS
+      - NAKAMA_NAKAMA_KEY_INDEX_MAX_TOTAL_ROWS
+
+    Optional local SQLite index of storage metadata behind nakama_sync_storage_index
+    and nakama_query_storage_index (a file path, or :memory:; unset disables it):
+      - NAKAMA_NAKAMA_METADATA_INDEX_PATH
     """
 
     nakama_console_url: str
     nakama_username: str
     nakama_password: str
 
+    nakama_max_connections: int = 20
+    nakama_max_keepalive_connections: int = 10
+    nakama_keepalive_expiry_seconds: float = 30.0
+    nakama_http2: bool = False
+    nakama_cache_max_bytes: int = 8 * 1024 * 1024
+
+    nakama_retry_max_attempts: int = 3
+    nakama_retry_base_delay_seconds: float = 0.2
+    nakama_retry_max_delay_seconds: float = 5.0
+    nakama_retry_budget_ratio: float = 0.1
+
+    nakama_concurrency_initial: int = 10
+    nakama_concurrency_min: int = 1
+    nakama_concurrency_max: int = 64
+
+    nakama_breaker_failure_threshold: int = 5
+    nakama_breaker_reset_seconds: float = 15.0
+
+    nakama_tool_deadline_seconds: float = 25.0
+
+    nakama_prefetch_pages: int = 1
+
+    nakama_result_set_max_bytes: int = 16 * 1024 * 1024
+    nakama_result_set_ttl_seconds: float = 600.0
+
+    nakama_checkpoint_ttl_seconds: float = 300.0
+
+    nakama_object_cache_max_bytes: int = 16 * 1024 * 1024
+    nakama_object_revalidate_seconds: float = 60.0
+
+    nakama_key_index_ttl_seconds: float = 300.0
+    nakama_key_index_max_total_rows: int = 2_000_000
+
+    nakama_metadata_index_path: Optional[str] = None
+
     model_config = SettingsConfigDict(
         env_prefix="NAKAMA_",
         env_file_encoding="utf-8",
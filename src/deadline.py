@@ -0,0 +1,66 @@
+"""Per-tool-call time budgets that stop work early instead of timing out."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Awaitable, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_TOOL_DEADLINE_SECONDS = 25.0
+# Time kept back from the budget to shape and return a partial response.
+DEADLINE_RESERVE_SECONDS = 0.25
+
+
+class DeadlineExceeded(Exception):
+    """The tool call's time budget ran out before the awaited work finished."""
+
+
+class Deadline:
+    """Absolute monotonic deadline; ``seconds=None`` means unbounded."""
+
+    def __init__(self, seconds: Optional[float], *, reserve: float = DEADLINE_RESERVE_SECONDS):
+        self.expires_at = time.monotonic() + seconds if seconds else None
+        self.reserve = reserve
+
+    def remaining(self) -> Optional[float]:
+        """Usable seconds left (reserve excluded), or None when unbounded."""
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - self.reserve - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    async def run(self, awaitable: Awaitable[T]) -> T:
+        """Await within the budget; on expiry the work is cancelled."""
+        remaining = self.remaining()
+        if remaining is None:
+            return await awaitable
+        if remaining <= 0:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise DeadlineExceeded("Tool time budget exhausted")
+        try:
+            return await asyncio.wait_for(awaitable, remaining)
+        except asyncio.TimeoutError as e:
+            raise DeadlineExceeded("Tool time budget exhausted") from e
+
+
+async def run_with_deadline(deadline: Optional[Deadline], awaitable: Awaitable[T]) -> T:
+    """``deadline.run`` that tolerates ``deadline=None``."""
+    if deadline is None:
+        return await awaitable
+    return await deadline.run(awaitable)
+
+
+__all__ = [
+    "DEFAULT_TOOL_DEADLINE_SECONDS",
+    "DEADLINE_RESERVE_SECONDS",
+    "Deadline",
+    "DeadlineExceeded",
+    "run_with_deadline",
+]
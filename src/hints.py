@@ -3,9 +3,14 @@
 import math
 from typing import Any, Dict, Optional
 
-from src.pagination import MAX_BATCH_OBJECTS
+from src.pagination import MAX_BATCH_OBJECTS, MAX_BULK_OBJECTS
 from src.response_format import EXPORT_USER_STORAGE_HINT_THRESHOLD
 
+DEADLINE_HINT = (
+    "Stopped early: the Console was too slow for the tool time budget, "
+    "so results are partial."
+)
+
 
 def build_list_hint(
     *,
@@ -16,8 +21,14 @@ def build_list_hint(
     list_kind: str = "storage",
     list_tool: Optional[str] = None,
     next_cursor: Optional[str] = None,
+    deadline_exceeded: bool = False,
+    scanned: Optional[int] = None,
+    scan_limit_reached: bool = False,
 ) -> Optional[str]:
-    """Build an actionable hint for list tool responses."""
+    """Build an actionable hint for list tool responses.
+
+    ``scanned`` is set when a client-side ``where`` filter was applied.
+    """
     if list_kind == "accounts":
         hint = _build_accounts_hint(
             complete=complete,
@@ -32,8 +43,13 @@ def build_list_hint(
             total_count=total_count,
             filters=filters,
             list_tool=list_tool,
+            scanned=scanned,
+            scan_limit_reached=scan_limit_reached,
         )
 
+    if deadline_exceeded:
+        hint = append_hint(DEADLINE_HINT, hint)
+
     if next_cursor:
         cursor_hint = "Pass next_cursor to fetch the next page."
         hint = append_hint(hint, cursor_hint)
@@ -72,6 +88,8 @@ def _build_storage_hint(
     total_count: int,
     filters: Dict[str, Any],
     list_tool: Optional[str] = None,
+    scanned: Optional[int] = None,
+    scan_limit_reached: bool = False,
 ) -> Optional[str]:
     parts: list[str] = []
 
@@ -85,13 +103,19 @@ def _build_storage_hint(
 
     if complete:
         if fetched:
-            if fetched > MAX_BATCH_OBJECTS:
-                batches = math.ceil(fetched / MAX_BATCH_OBJECTS)
+            if fetched > MAX_BULK_OBJECTS:
+                batches = math.ceil(fetched / MAX_BULK_OBJECTS)
                 parts.append(
                     f"{fetched} keys returned. Call nakama_get_storage_objects in "
-                    f"{batches} separate batches of up to {MAX_BATCH_OBJECTS}. "
+                    f"{batches} batches of up to {MAX_BULK_OBJECTS}. "
                     "Fetch only keys you need."
                 )
+            elif fetched > MAX_BATCH_OBJECTS:
+                parts.append(
+                    f"{fetched} keys returned. Pass the keys you need to one "
+                    "nakama_get_storage_objects call; it chunks them internally and "
+                    "spills large results to an MCP resource."
+                )
             else:
                 parts.append(
                     "Load values with nakama_get_storage_objects (batch) or "
@@ -109,6 +133,17 @@ def _build_storage_hint(
                 )
         return " ".join(parts) if parts else None
 
+    if scanned is not None:
+        parts.append(
+            f"Scanned {scanned} of ~{total_count} object(s) for {fetched} match(es)."
+        )
+        if scan_limit_reached:
+            parts.append(
+                "Stopped at max_scanned; narrow collection, user_id or key_prefix "
+                "so the Console does more of the filtering."
+            )
+        return " ".join(parts)
+
     remaining = max(total_count - fetched, 0)
     has_user = bool(user_id)
     has_key = bool(filters.get("key") or filters.get("key_prefix"))
@@ -139,4 +174,4 @@ def append_hint(base: Optional[str], extra: Optional[str]) -> Optional[str]:
     return base or extra
 
 
-__all__ = ["build_list_hint", "append_hint"]
+__all__ = ["DEADLINE_HINT", "build_list_hint", "append_hint"]
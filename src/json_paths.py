@@ -0,0 +1,86 @@
+"""Path selection inside decoded storage values.
+
+Two spellings are accepted for the same thing:
+
+- JSON pointer (RFC 6901): ``/inventory/items/0/id``; ``~1`` and ``~0`` escape
+  ``/`` and ``~`` inside a segment.
+- Dotted path: ``inventory.items[0].id`` or ``inventory.items.0.id``.
+
+Numeric segments index arrays; on objects every segment is a plain key.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+MAX_VALUE_PATHS = 32
+MAX_PATH_CHARS = 256
+
+ParsedPath = Tuple[str, ...]
+
+_BRACKET_INDEX = re.compile(r"\[(\d+)\]")
+
+
+def parse_path(path: str) -> ParsedPath:
+    """Split a JSON pointer or dotted path into raw segments; raises ValueError."""
+    if not isinstance(path, str) or not path.strip():
+        raise ValueError("Value paths must be non-empty strings")
+    if len(path) > MAX_PATH_CHARS:
+        raise ValueError(f"Value paths must be at most {MAX_PATH_CHARS} characters")
+    if path.startswith("/"):
+        segments = [s.replace("~1", "/").replace("~0", "~") for s in path[1:].split("/")]
+    else:
+        segments = _BRACKET_INDEX.sub(r".\1", path.strip()).split(".")
+        if any(segment == "" for segment in segments):
+            raise ValueError(f"Invalid dotted path {path!r}: empty segment")
+    return tuple(segments)
+
+
+def normalize_paths(paths: Optional[Iterable[str]]) -> Optional[List[str]]:
+    """Validate and de-duplicate requested paths; None/empty means the whole value."""
+    if paths is None:
+        return None
+    normalized: List[str] = []
+    for path in paths:
+        parse_path(path)
+        if path not in normalized:
+            normalized.append(path)
+    if len(normalized) > MAX_VALUE_PATHS:
+        raise ValueError(f"At most {MAX_VALUE_PATHS} value paths may be requested")
+    return normalized or None
+
+
+def resolve_path(value: Any, segments: ParsedPath) -> Tuple[bool, Any]:
+    """Walk ``segments`` into ``value``; returns (found, sub-tree)."""
+    current = value
+    for segment in segments:
+        if isinstance(current, dict) and segment in current:
+            current = current[segment]
+        elif isinstance(current, list) and segment.isdigit() and int(segment) < len(current):
+            current = current[int(segment)]
+        else:
+            return False, None
+    return True, current
+
+
+def select_paths(value: Any, paths: Iterable[str]) -> Tuple[Dict[str, Any], List[str]]:
+    """Sub-trees of ``value`` keyed by the requested path, plus the paths not found."""
+    selected: Dict[str, Any] = {}
+    missing: List[str] = []
+    for path in paths:
+        found, sub = resolve_path(value, parse_path(path))
+        if found:
+            selected[path] = sub
+        else:
+            missing.append(path)
+    return selected, missing
+
+
+__all__ = [
+    "MAX_VALUE_PATHS",
+    "MAX_PATH_CHARS",
+    "ParsedPath",
+    "parse_path",
+    "normalize_paths",
+    "resolve_path",
+    "select_paths",
+]
@@ -0,0 +1,277 @@
+"""In-memory key index per collection for prefix, infix, glob and multi-prefix queries.
+
+The Console filters storage keys by a single trailing-``%`` prefix only. A
+``CollectionKeys`` snapshot holds every (key, user_id) of a collection as a
+sorted array of distinct keys plus, per key, a run of interned owner ids, so
+prefix lookups are a bisect and substring lookups one ``str.find`` sweep over
+the joined keys. ``KeyIndexCache`` builds snapshots lazily from key listings
+(a build cut short by the deadline continues on the next call), expires them
+after a TTL and bounds the total rows held across collections.
+"""
+
+from __future__ import annotations
+
+import bisect
+import fnmatch
+import heapq
+import re
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from src.singleflight import SingleFlight
+
+DEFAULT_KEY_INDEX_TTL_SECONDS = 300.0
+# Rows held across all collections' indexes (least recently used dropped first).
+DEFAULT_KEY_INDEX_MAX_TOTAL_ROWS = 2_000_000
+# Rows listed into any one collection's index; the build stops there.
+MAX_KEY_INDEX_ROWS_PER_COLLECTION = 1_000_000
+MAX_KEY_PREFIXES = 100
+
+_GLOB_SPECIAL = re.compile(r"[*?\[]")
+# Separates keys in the joined blob used for substring search.
+_SEP = "\x00"
+
+
+def _prefix_end(prefix: str) -> str:
+    """Smallest string greater than every string starting with ``prefix``."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class CollectionKeys:
+    """Immutable sorted (key, user_id) snapshot of one collection."""
+
+    def __init__(self, keys: List[str], starts: array, owners: array, users: List[str]):
+        self.keys = keys
+        self._starts = starts
+        self._owners = owners
+        self.users = users
+        self._user_index = {user_id: i for i, user_id in enumerate(users)}
+        self._blob: Optional[str] = None
+        self._blob_starts: Optional[array] = None
+
+    @classmethod
+    def from_sorted(cls, pairs: Iterable[Tuple[str, int]], users: List[str]) -> "CollectionKeys":
+        """Build from (key, interned user index) pairs already in sorted order."""
+        keys: List[str] = []
+        starts = array("I")
+        owners = array("I")
+        last: Optional[Tuple[str, int]] = None
+        for pair in pairs:
+            if pair == last:
+                continue
+            key, owner = pair
+            if last is None or key != last[0]:
+                keys.append(key)
+                starts.append(len(owners))
+            owners.append(owner)
+            last = pair
+        starts.append(len(owners))
+        return cls(keys, starts, owners, users)
+
+    def merged(self, pairs: Iterable[Tuple[str, int]], users: List[str]) -> "CollectionKeys":
+        """A new snapshot with (key, user index) ``pairs`` merged into this one.
+
+        ``users`` must extend ``self.users``. Only the new pairs are sorted; the
+        existing rows are already in order and are merged in one pass.
+        """
+        new_pairs = sorted(set(pairs))
+        return CollectionKeys.from_sorted(heapq.merge(self._pairs(), new_pairs), users)
+
+    def _pairs(self) -> Iterator[Tuple[str, int]]:
+        for i, key in enumerate(self.keys):
+            for owner in self._owners[self._starts[i] : self._starts[i + 1]]:
+                yield key, owner
+
+    @property
+    def rows(self) -> int:
+        return len(self._owners)
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        if not prefix:
+            return 0, len(self.keys)
+        return (
+            bisect.bisect_left(self.keys, prefix),
+            bisect.bisect_left(self.keys, _prefix_end(prefix)),
+        )
+
+    def _prefix_indices(self, prefixes: Sequence[str]) -> Iterator[int]:
+        ranges = sorted(self._range(p) for p in set(prefixes))
+        end = 0
+        for lo, hi in ranges:
+            for i in range(max(lo, end), hi):
+                yield i
+            end = max(end, hi)
+
+    def _contains_indices(self, needle: str) -> List[int]:
+        if self._blob is None:
+            self._blob = _SEP.join(self.keys)
+            starts = array("I")
+            position = 0
+            for key in self.keys:
+                starts.append(position)
+                position += len(key) + 1
+            self._blob_starts = starts
+        blob, starts = self._blob, self._blob_starts
+        found: List[int] = []
+        position = blob.find(needle)
+        while position != -1:
+            i = bisect.bisect_right(starts, position) - 1
+            found.append(i)
+            # Resume at the next key: one hit per key is enough.
+            next_start = starts[i + 1] if i + 1 < len(starts) else len(blob)
+            position = blob.find(needle, next_start)
+        return found
+
+    def match(
+        self,
+        *,
+        prefixes: Optional[Sequence[str]] = None,
+        contains: Optional[str] = None,
+        glob: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> Iterator[Tuple[str, str]]:
+        """(key, user_id) pairs matching every given condition, in key order.
+
+        ``prefixes`` match any of several prefixes; ``glob`` uses fnmatch syntax
+        (``*``, ``?``, ``[...]``) against the whole key, case-sensitively.
+        """
+        wanted: Optional[int] = None
+        if user_id is not None:
+            wanted = self._user_index.get(user_id)
+            if wanted is None:
+                return
+        pattern = None
+        if glob is not None:
+            pattern = re.compile(fnmatch.translate(glob))
+            if prefixes is None:
+                # Only keys starting with the glob's literal head can match.
+                prefixes = [_GLOB_SPECIAL.split(glob, 1)[0]]
+        if prefixes is not None:
+            indices: Iterable[int] = self._prefix_indices(prefixes)
+            if contains is not None:
+                indices = (i for i in indices if contains in self.keys[i])
+        elif contains is not None:
+            indices = self._contains_indices(contains)
+        else:
+            indices = range(len(self.keys))
+        for i in indices:
+            key = self.keys[i]
+            if pattern is not None and not pattern.match(key):
+                continue
+            for owner in self._owners[self._starts[i] : self._starts[i + 1]]:
+                if wanted is None or owner == wanted:
+                    yield key, self.users[owner]
+
+
+class KeyIndexEntry:
+    """A collection's key index: the latest snapshot plus rows listed since.
+
+    Each ``freeze`` sorts only the rows added since the previous one and merges
+    them into the snapshot, so a build resumed over many calls stays linear.
+    """
+
+    def __init__(self, collection: str):
+        self.collection = collection
+        self.started_at = time.time()
+        self.next_offset = 0
+        self.complete = False
+        # Stopped at MAX_KEY_INDEX_ROWS_PER_COLLECTION with more keys listed.
+        self.truncated = False
+        self._pairs: List[Tuple[str, int]] = []
+        self._user_ids: Dict[str, int] = {}
+        self._users: List[str] = []
+        self.snapshot = CollectionKeys([], array("I", [0]), array("I"), [])
+
+    @property
+    def rows(self) -> int:
+        return self.snapshot.rows + len(self._pairs)
+
+    def add(self, rows: Iterable[object]) -> int:
+        """Record listed rows; returns how many were added."""
+        added = 0
+        for row in rows:
+            if not isinstance(row, dict) or not isinstance(row.get("key"), str):
+                continue
+            user_id = row.get("user_id") or ""
+            owner = self._user_ids.get(user_id)
+            if owner is None:
+                owner = self._user_ids[user_id] = len(self._users)
+                self._users.append(user_id)
+            self._pairs.append((row["key"], owner))
+            added += 1
+        return added
+
+    def freeze(self, *, complete: bool) -> None:
+        """Merge the rows gathered since the last freeze into a new snapshot."""
+        if self._pairs or len(self._users) != len(self.snapshot.users):
+            self.snapshot = self.snapshot.merged(self._pairs, list(self._users))
+            self._pairs = []
+        self.complete = complete
+        if complete:
+            # The snapshot now owns the data; drop the build buffers.
+            self._user_ids = {}
+
+
+class KeyIndexCache:
+    """Per-collection key indexes, expired after ``ttl_seconds``.
+
+    Rows across all collections are capped at ``max_total_rows``; least recently used
+    collections are dropped first. Concurrent builds of the same collection are
+    coalesced through ``flight``.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = DEFAULT_KEY_INDEX_TTL_SECONDS,
+        max_total_rows: int = DEFAULT_KEY_INDEX_MAX_TOTAL_ROWS,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_total_rows = max_total_rows
+        self.flight = SingleFlight()
+        self._entries: "OrderedDict[str, KeyIndexEntry]" = OrderedDict()
+
+    def get(self, collection: str, *, refresh: bool = False) -> Tuple[KeyIndexEntry, bool]:
+        """The collection's entry and whether it was (re)started for this call."""
+        entry = self._entries.get(collection)
+        if (
+            entry is None
+            or refresh
+            or time.time() - entry.started_at > self.ttl_seconds
+        ):
+            entry = KeyIndexEntry(collection)
+            self._entries[collection] = entry
+            self._entries.move_to_end(collection)
+            return entry, True
+        self._entries.move_to_end(collection)
+        return entry, False
+
+    def settle(self, entry: KeyIndexEntry) -> None:
+        """Evict least recently used collections while over the row cap."""
+        total = sum(e.rows for e in self._entries.values())
+        for collection in list(self._entries):
+            if total <= self.max_total_rows:
+                break
+            if collection == entry.collection:
+                continue
+            total -= self._entries.pop(collection).rows
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "collections": len(self._entries),
+            "rows": sum(e.rows for e in self._entries.values()),
+            "max_total_rows": self.max_total_rows,
+        }
+
+
+__all__ = [
+    "DEFAULT_KEY_INDEX_TTL_SECONDS",
+    "DEFAULT_KEY_INDEX_MAX_TOTAL_ROWS",
+    "MAX_KEY_INDEX_ROWS_PER_COLLECTION",
+    "MAX_KEY_PREFIXES",
+    "CollectionKeys",
+    "KeyIndexEntry",
+    "KeyIndexCache",
+]
@@ -0,0 +1,442 @@
+"""Local SQLite index of storage object metadata.
+
+``nakama_sync_storage_index`` crawls a collection's listing into the index;
+``nakama_query_storage_index`` then answers filtered, sorted and counted
+queries from it without calling the Console. Rows carry the metadata the
+listing returns (no values) plus an optional ``value_bytes`` measured by GET.
+
+Sync is incremental: every pass stamps the rows it lists with the pass's
+generation and rewrites only rows whose version or update_time changed. A pass
+may span several tool calls (it resumes at ``next_offset``) and keeps its
+generation throughout. When a pass that read the listing from offset 0 to the
+end within one call finishes, rows it never saw are deleted. Between calls the
+listing may shift, so a resumed pass can skip rows that still exist: its unseen
+rows are instead rechecked against the Console (``unseen_rows`` /
+``resolve_unseen``), and those not yet confirmed are reported as ``stale_rows``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+from src.predicates import compile_key_regex, parse_timestamp
+
+T = TypeVar("T")
+
+MAX_INDEX_SYNC_OBJECTS = 1_000_000
+DEFAULT_INDEX_QUERY_LIMIT = 100
+MAX_INDEX_QUERY_LIMIT = 1000
+
+INDEX_SORT_FIELDS = (
+    "key",
+    "user_id",
+    "update_time",
+    "create_time",
+    "version",
+    "value_bytes",
+)
+# Timestamps sort and compare on their parsed epoch column.
+_SORT_COLUMNS = {"update_time": "update_ts", "create_time": "create_ts"}
+
+INDEX_ROW_FIELDS = (
+    "collection",
+    "key",
+    "user_id",
+    "version",
+    "permission_read",
+    "permission_write",
+    "create_time",
+    "update_time",
+    "value_bytes",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS storage_objects (
+    collection TEXT NOT NULL,
+    key TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    version TEXT,
+    permission_read INTEGER,
+    permission_write INTEGER,
+    create_time TEXT,
+    update_time TEXT,
+    create_ts REAL,
+    update_ts REAL,
+    value_bytes INTEGER,
+    generation INTEGER NOT NULL,
+    PRIMARY KEY (collection, key, user_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS storage_objects_update
+    ON storage_objects (collection, update_ts);
+CREATE INDEX IF NOT EXISTS storage_objects_user
+    ON storage_objects (collection, user_id, key);
+CREATE TABLE IF NOT EXISTS index_syncs (
+    collection TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    next_offset INTEGER,
+    synced_at REAL,
+    complete INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def _epoch(value: Any) -> Optional[float]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return parse_timestamp(value).timestamp()
+    except ValueError:
+        return None
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _like_prefix(prefix: str) -> str:
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+@dataclass
+class SyncPass:
+    """Position of one (possibly multi-call) sync pass over a collection."""
+
+    collection: str
+    generation: int
+    start_offset: int = 0
+    resumed: bool = False
+
+
+@dataclass
+class PageChanges:
+    """Outcome of applying one listing page: rewritten rows and rows lacking a size."""
+
+    changed: List[Dict[str, Any]] = field(default_factory=list)
+    unsized: List[Dict[str, Any]] = field(default_factory=list)
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+
+class StorageMetadataIndex:
+    """SQLite-backed metadata rows per collection; ``path`` may be ``:memory:``.
+
+    Methods block. Async callers go through ``run``, which executes them on the
+    index's single worker thread: SQLite I/O (page writes, fsyncs on a file
+    index, large sorted queries) stays off the event loop and calls never
+    interleave on the shared connection.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metadata-index")
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.create_function("REGEXP", 2, _regexp, deterministic=True)
+
+    async def run(self, method: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Await ``method(*args, **kwargs)`` on the index's worker thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(method, *args, **kwargs)
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._db.close()
+
+    # --- sync ---
+
+    def begin_sync(self, collection: str, *, full: bool = False) -> SyncPass:
+        """Resume an unfinished pass, or start a new generation (clearing rows if full)."""
+        state = self._db.execute(
+            "SELECT generation, next_offset, complete FROM index_syncs WHERE collection = ?",
+            (collection,),
+        ).fetchone()
+        generation = state[0] if state else 0
+        if state and not full and not state[2] and state[1]:
+            return SyncPass(collection, generation, state[1], resumed=True)
+        generation += 1
+        with self._db:
+            if full:
+                self._db.execute("DELETE FROM storage_objects WHERE collection = ?", (collection,))
+            self._db.execute(
+                "INSERT INTO index_syncs (collection, generation, next_offset, complete) "
+                "VALUES (?, ?, 0, 0) ON CONFLICT (collection) DO UPDATE SET "
+                "generation = excluded.generation, next_offset = 0",
+                (collection, generation),
+            )
+        return SyncPass(collection, generation, 0, resumed=False)
+
+    def apply_page(self, sync: SyncPass, rows: Sequence[Any]) -> PageChanges:
+        """Stamp a listing page into the index and report what changed.
+
+        New rows and those whose version or update_time moved are rewritten with
+        ``value_bytes`` reset; the rest only get the pass's generation.
+        """
+        changes = PageChanges()
+        unchanged: List[Tuple[int, str, str, str]] = []
+        for row in rows:
+            if not isinstance(row, dict) or not isinstance(row.get("key"), str):
+                continue
+            key, user_id = row["key"], row.get("user_id") or ""
+            current = self._db.execute(
+                "SELECT version, update_time, value_bytes FROM storage_objects "
+                "WHERE collection = ? AND key = ? AND user_id = ?",
+                (sync.collection, key, user_id),
+            ).fetchone()
+            if current is not None and current[:2] == (row.get("version"), row.get("update_time")):
+                unchanged.append((sync.generation, sync.collection, key, user_id))
+                if current[2] is None:
+                    changes.unsized.append(row)
+                continue
+            if current is None:
+                changes.inserted += 1
+            else:
+                changes.updated += 1
+            changes.changed.append(row)
+        changes.unchanged = len(unchanged)
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO storage_objects (collection, key, user_id, version, "
+                "permission_read, permission_write, create_time, update_time, create_ts, "
+                "update_ts, value_bytes, generation) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, ?)",
+                [
+                    (
+                        sync.collection,
+                        row["key"],
+                        row.get("user_id") or "",
+                        row.get("version"),
+                        _int_or_none(row.get("permission_read")),
+                        _int_or_none(row.get("permission_write")),
+                        row.get("create_time"),
+                        row.get("update_time"),
+                        _epoch(row.get("create_time")),
+                        _epoch(row.get("update_time")),
+                        sync.generation,
+                    )
+                    for row in changes.changed
+                ],
+            )
+            self._db.executemany(
+                "UPDATE storage_objects SET generation = ? "
+                "WHERE collection = ? AND key = ? AND user_id = ?",
+                unchanged,
+            )
+        return changes
+
+    def set_value_sizes(self, collection: str, sizes: Iterable[Tuple[str, str, int]]) -> None:
+        with self._db:
+            self._db.executemany(
+                "UPDATE storage_objects SET value_bytes = ? "
+                "WHERE collection = ? AND key = ? AND user_id = ?",
+                [(size, collection, key, user_id) for key, user_id, size in sizes],
+            )
+
+    def finish_sync(self, sync: SyncPass, *, next_offset: Optional[int]) -> int:
+        """Record where the pass stopped; an uninterrupted finished pass deletes unseen rows.
+
+        ``next_offset=None`` means the listing was read to the end. Unseen rows
+        are deleted only if the pass was not resumed (see the module docstring);
+        a resumed pass is recorded as complete and leaves them to
+        ``resolve_unseen``. Returns the number of rows deleted.
+        """
+        deleted = 0
+        with self._db:
+            if next_offset is None:
+                if not sync.resumed:
+                    deleted = self._db.execute(
+                        "DELETE FROM storage_objects WHERE collection = ? AND generation < ?",
+                        (sync.collection, sync.generation),
+                    ).rowcount
+                self._db.execute(
+                    "UPDATE index_syncs SET next_offset = NULL, complete = 1, synced_at = ? "
+                    "WHERE collection = ?",
+                    (time.time(), sync.collection),
+                )
+            else:
+                self._db.execute(
+                    "UPDATE index_syncs SET next_offset = ?, complete = 0 WHERE collection = ?",
+                    (next_offset, sync.collection),
+                )
+        return deleted
+
+    def unseen_rows(self, sync: SyncPass) -> List[Tuple[str, str]]:
+        """(key, user_id) of rows the pass has not listed, in key order."""
+        return self._db.execute(
+            "SELECT key, user_id FROM storage_objects WHERE collection = ? AND generation < ? "
+            "ORDER BY key, user_id",
+            (sync.collection, sync.generation),
+        ).fetchall()
+
+    def resolve_unseen(
+        self,
+        sync: SyncPass,
+        *,
+        present: Sequence[Tuple[str, str]],
+        missing: Sequence[Tuple[str, str]],
+    ) -> int:
+        """Stamp rechecked rows that still exist; delete those confirmed gone.
+
+        Only rows still unseen by ``sync`` are touched. Returns the number deleted.
+        """
+        with self._db:
+            self._db.executemany(
+                "UPDATE storage_objects SET generation = ? "
+                "WHERE collection = ? AND key = ? AND user_id = ? AND generation < ?",
+                [(sync.generation, sync.collection, k, u, sync.generation) for k, u in present],
+            )
+            before = self._db.total_changes
+            self._db.executemany(
+                "DELETE FROM storage_objects "
+                "WHERE collection = ? AND key = ? AND user_id = ? AND generation < ?",
+                [(sync.collection, k, u, sync.generation) for k, u in missing],
+            )
+            return self._db.total_changes - before
+
+    # --- queries ---
+
+    def state(self, collection: str) -> Optional[Dict[str, Any]]:
+        """Sync state of a collection, or None if it was never synced."""
+        state = self._db.execute(
+            "SELECT generation, next_offset, synced_at, complete FROM index_syncs "
+            "WHERE collection = ?",
+            (collection,),
+        ).fetchone()
+        if state is None:
+            return None
+        generation, next_offset, synced_at, complete = state
+        stale = 0
+        if complete:
+            # Left unseen by the last finished pass and not yet confirmed gone.
+            stale = self._db.execute(
+                "SELECT COUNT(*) FROM storage_objects WHERE collection = ? AND generation < ?",
+                (collection, generation),
+            ).fetchone()[0]
+        return {
+            "collection": collection,
+            "generation": generation,
+            "rows": self.count(collection),
+            "synced_at": synced_at,
+            "age_seconds": round(time.time() - synced_at, 1) if synced_at else None,
+            "last_sync_complete": bool(complete),
+            "resume_offset": next_offset or None,
+            "stale_rows": stale,
+        }
+
+    def count(self, collection: str) -> int:
+        return self._db.execute(
+            "SELECT COUNT(*) FROM storage_objects WHERE collection = ?", (collection,)
+        ).fetchone()[0]
+
+    def query(
+        self,
+        collection: str,
+        *,
+        user_id: Optional[str] = None,
+        key_prefix: Optional[str] = None,
+        where: Optional[Mapping[str, Any]] = None,
+        min_value_bytes: Optional[int] = None,
+        max_value_bytes: Optional[int] = None,
+        sort_by: str = "key",
+        descending: bool = False,
+        limit: int = DEFAULT_INDEX_QUERY_LIMIT,
+        offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Matching rows (one window) and the total number of matches.
+
+        ``where`` takes the same conditions as the list tools' ``where`` argument.
+        """
+        if sort_by not in INDEX_SORT_FIELDS:
+            raise ValueError(f"sort_by must be one of {', '.join(INDEX_SORT_FIELDS)}")
+        clauses = ["collection = ?"]
+        params: List[Any] = [collection]
+        if user_id is not None:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        if key_prefix:
+            clauses.append("key LIKE ? ESCAPE '\\'")
+            params.append(_like_prefix(key_prefix))
+        conditions = {k: v for k, v in (where or {}).items() if v is not None}
+        for name, column, op in (
+            ("updated_after", "update_ts", ">"),
+            ("updated_before", "update_ts", "<"),
+            ("created_after", "create_ts", ">"),
+            ("created_before", "create_ts", "<"),
+        ):
+            if name in conditions:
+                clauses.append(f"{column} {op} ?")
+                params.append(parse_timestamp(conditions[name]).timestamp())
+        for name in ("permission_read", "permission_write"):
+            if name in conditions:
+                clauses.append(f"{name} = ?")
+                params.append(conditions[name])
+        if "key_contains" in conditions:
+            clauses.append("instr(key, ?) > 0")
+            params.append(conditions["key_contains"])
+        if "key_regex" in conditions:
+            compile_key_regex(conditions["key_regex"])
+            clauses.append("key REGEXP ?")
+            params.append(conditions["key_regex"])
+        if min_value_bytes is not None:
+            clauses.append("value_bytes >= ?")
+            params.append(min_value_bytes)
+        if max_value_bytes is not None:
+            clauses.append("value_bytes <= ?")
+            params.append(max_value_bytes)
+
+        where_sql = " AND ".join(clauses)
+        total = self._db.execute(
+            f"SELECT COUNT(*) FROM storage_objects WHERE {where_sql}", params
+        ).fetchone()[0]
+        if limit <= 0:
+            return [], total
+        column = _SORT_COLUMNS.get(sort_by, sort_by)
+        direction = "DESC" if descending else "ASC"
+        cursor = self._db.execute(
+            f"SELECT {', '.join(INDEX_ROW_FIELDS)} FROM storage_objects WHERE {where_sql} "
+            f"ORDER BY {column} IS NULL, {column} {direction}, key, user_id "
+            "LIMIT ? OFFSET ?",
+            [*params, limit, offset],
+        )
+        return [dict(zip(INDEX_ROW_FIELDS, row)) for row in cursor], total
+
+
+_REGEX_CACHE: Dict[str, "re.Pattern[str]"] = {}
+
+
+def _regexp(pattern: str, value: Optional[str]) -> bool:
+    if value is None:
+        return False
+    compiled = _REGEX_CACHE.get(pattern)
+    if compiled is None:
+        if len(_REGEX_CACHE) > 64:
+            _REGEX_CACHE.clear()
+        compiled = _REGEX_CACHE[pattern] = compile_key_regex(pattern)
+    return compiled.search(value) is not None
+
+
+__all__ = [
+    "MAX_INDEX_SYNC_OBJECTS",
+    "DEFAULT_INDEX_QUERY_LIMIT",
+    "MAX_INDEX_QUERY_LIMIT",
+    "INDEX_SORT_FIELDS",
+    "INDEX_ROW_FIELDS",
+    "SyncPass",
+    "PageChanges",
+    "StorageMetadataIndex",
+]
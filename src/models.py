@@ -2,13 +2,46 @@ from typing import Any, List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
+from src.aggregation import DEFAULT_MAX_GROUPS, MAX_AGGREGATE_FIELDS, MAX_GROUPS
+from src.json_paths import MAX_VALUE_PATHS, normalize_paths, parse_path
+from src.key_index import MAX_KEY_PREFIXES
+from src.metadata_index import (
+    DEFAULT_INDEX_QUERY_LIMIT,
+    MAX_INDEX_QUERY_LIMIT,
+)
 from src.pagination import (
     DEFAULT_MAX_OBJECTS,
-    MAX_BATCH_OBJECTS,
+    MAX_BULK_OBJECTS,
     MAX_OBJECTS_HARD_LIMIT,
 )
+from src.predicates import (
+    DEFAULT_MAX_SCANNED,
+    MAX_KEY_REGEX_CHARS,
+    MAX_SCANNED_HARD_LIMIT,
+    MAX_VALUE_REGEX_CHARS,
+    compile_key_regex,
+    compile_value_regex,
+    parse_timestamp,
+)
+from src.projection import (
+    ACCOUNT_IDENTITY_FIELDS,
+    MAX_PROJECTION_FIELDS,
+    STORAGE_IDENTITY_FIELDS,
+    normalize_fields,
+)
+from src.result_sets import RESULT_SET_READ_MAX_LIMIT
 from src.response_format import DEFAULT_VALUE_PREVIEW_CHARS, MAX_VALUE_PREVIEW_CHARS
 from src.validation import key_prefix_to_filter, validate_storage_key_filter
+from src.value_scan import (
+    DEFAULT_SCAN_CONCURRENCY,
+    DEFAULT_SCAN_OBJECTS,
+    DEFAULT_SCAN_SAMPLE,
+    DEFAULT_SEARCH_MATCHES,
+    MAX_SCAN_CONCURRENCY,
+    MAX_SCAN_OBJECTS,
+    MAX_SCAN_SAMPLE,
+    MAX_SEARCH_MATCHES,
+)
 
 
 class ListCursorArgs(BaseModel):
@@ -27,6 +60,21 @@ class ListCursorArgs(BaseModel):
             f"hard max {MAX_OBJECTS_HARD_LIMIT})"
         ),
     )
+    start_offset: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Skip this many rows before aggregating (e.g. 5000 to start at row 5000). "
+            "Resumes from a remembered cursor near that offset when one exists. "
+            "Not combinable with cursor."
+        ),
+    )
+
+    @model_validator(mode="after")
+    def validate_start_offset(self):
+        if self.start_offset and self.cursor is not None:
+            raise ValueError("Pass either cursor or start_offset, not both")
+        return self
 
 
 class ListPageMeta(BaseModel):
@@ -43,11 +91,47 @@ class ListPageMeta(BaseModel):
         default=None,
         description="Opaque cursor for the next page when complete is false",
     )
+    deadline_exceeded: bool = Field(
+        default=False,
+        description="True if the tool time budget ran out and results are partial",
+    )
+    scanned: Optional[int] = Field(
+        default=None,
+        description="Rows read from the Console to find these matches (set when where is used)",
+    )
+    scan_limit_reached: bool = Field(
+        default=False,
+        description="True if max_scanned stopped the scan; next_cursor resumes it",
+    )
+    start_offset: Optional[int] = Field(
+        default=None, description="Rows skipped before these results (when requested)"
+    )
+    checkpoint_offset: Optional[int] = Field(
+        default=None,
+        description=(
+            "Row offset of the remembered cursor the listing resumed from "
+            "(0 means it had to page from the start)"
+        ),
+    )
+    result_handle: Optional[str] = Field(
+        default=None,
+        description=(
+            "Handle for nakama_read_result_set: re-read, re-sort or re-project these "
+            "aggregated rows without calling the Console again (expires)"
+        ),
+    )
     hint: Optional[str] = Field(
         default=None, description="Suggested next step or narrowing advice"
     )
 
 
+def _fields_description(identity: tuple, examples: str) -> str:
+    return (
+        f"Only return these top-level fields per item (max {MAX_PROJECTION_FIELDS}, "
+        f"e.g. {examples}); {', '.join(identity)} always included. Omit for whole items."
+    )
+
+
 class ListAccountsArgs(ListCursorArgs):
     filter: Optional[str] = Field(
         default=None, description="User ID or username filter"
@@ -55,6 +139,17 @@ class ListAccountsArgs(ListCursorArgs):
     tombstones: Optional[bool] = Field(
         default=None, description="Search only recorded deletes"
     )
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=_fields_description(
+            ACCOUNT_IDENTITY_FIELDS, "['username', 'create_time']"
+        ),
+    )
+
+    @model_validator(mode="after")
+    def normalize_projection(self):
+        self.fields = normalize_fields(self.fields)
+        return self
 
 
 class GetAccountArgs(BaseModel):
@@ -90,7 +185,72 @@ class ExportAccountArgs(BaseModel):
     )
 
 
-class ListStorageArgs(ListCursorArgs):
+class StorageWhere(BaseModel):
+    """Metadata conditions the Console cannot filter on; applied as pages arrive."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    updated_after: Optional[str] = Field(
+        default=None, description="ISO-8601; only objects updated strictly after this"
+    )
+    updated_before: Optional[str] = Field(
+        default=None, description="ISO-8601; only objects updated strictly before this"
+    )
+    created_after: Optional[str] = Field(
+        default=None, description="ISO-8601; only objects created strictly after this"
+    )
+    created_before: Optional[str] = Field(
+        default=None, description="ISO-8601; only objects created strictly before this"
+    )
+    permission_read: Optional[int] = Field(
+        default=None, ge=0, le=2, description="Exact read permission (0 none, 1 owner, 2 public)"
+    )
+    permission_write: Optional[int] = Field(
+        default=None, ge=0, le=1, description="Exact write permission (0 none, 1 owner)"
+    )
+    key_contains: Optional[str] = Field(
+        default=None, min_length=1, description="Key must contain this substring"
+    )
+    key_regex: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        max_length=MAX_KEY_REGEX_CHARS,
+        description="Python regex searched within the key",
+    )
+
+    @model_validator(mode="after")
+    def validate_conditions(self):
+        for name in ("updated_after", "updated_before", "created_after", "created_before"):
+            value = getattr(self, name)
+            if value is not None:
+                parse_timestamp(value)
+        if self.key_regex is not None:
+            compile_key_regex(self.key_regex)
+        return self
+
+
+class StorageFilterArgs(ListCursorArgs):
+    """List args plus client-side ``where`` filtering bounded by max_scanned."""
+
+    where: Optional[StorageWhere] = Field(
+        default=None,
+        description=(
+            "Extra metadata filters evaluated as pages arrive; max_objects then "
+            "counts matching rows only"
+        ),
+    )
+    max_scanned: int = Field(
+        default=DEFAULT_MAX_SCANNED,
+        ge=1,
+        le=MAX_SCANNED_HARD_LIMIT,
+        description=(
+            f"With where: stop after reading this many raw rows (default "
+            f"{DEFAULT_MAX_SCANNED}, max {MAX_SCANNED_HARD_LIMIT}; checked per page)"
+        ),
+    )
+
+
+class ListStorageArgs(StorageFilterArgs):
     collection: Optional[str] = Field(
         default=None, description="Filter by collection name"
     )
@@ -99,6 +259,12 @@ class ListStorageArgs(ListCursorArgs):
         description="Suffix % prefix only (e.g. 'level%'). Requires collection.",
     )
     user_id: Optional[str] = Field(default=None, description="Filter by user/owner ID")
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=_fields_description(
+            STORAGE_IDENTITY_FIELDS, "['version', 'update_time']"
+        ),
+    )
 
     @model_validator(mode="after")
     def validate_key_filters(self):
@@ -106,10 +272,11 @@ class ListStorageArgs(ListCursorArgs):
             raise ValueError("collection is required when key is provided")
         if self.key is not None:
             self.key = validate_storage_key_filter(self.key)
+        self.fields = normalize_fields(self.fields)
         return self
 
 
-class ListUserStorageArgs(ListCursorArgs):
+class ListUserStorageArgs(StorageFilterArgs):
     user_id: str = Field(description="Nakama user id (UUID) — required")
     collection: Optional[str] = Field(
         default=None, description="Filter by collection name"
@@ -125,7 +292,7 @@ class ListUserStorageArgs(ListCursorArgs):
         return self
 
 
-class ListStorageKeysArgs(ListCursorArgs):
+class ListStorageKeysArgs(StorageFilterArgs):
     collection: str = Field(description="Collection name — required")
     user_id: Optional[str] = Field(default=None, description="Filter by user/owner ID")
     key_prefix: Optional[str] = Field(
@@ -139,6 +306,13 @@ class ListStorageKeysArgs(ListCursorArgs):
         return self
 
 
+_VALUE_PATHS_DESCRIPTION = (
+    "Return only these parts of the value, as JSON pointers ('/inventory/items/0') "
+    f"or dotted paths ('inventory.items[0]'); max {MAX_VALUE_PATHS}. The value is "
+    "replaced by value_paths (path → sub-tree) and missing_paths"
+)
+
+
 class GetStorageObjectArgs(BaseModel):
     collection: str = Field(description="Collection name")
     key: str = Field(description="Storage object key")
@@ -155,6 +329,15 @@ class GetStorageObjectArgs(BaseModel):
             f"(default {DEFAULT_VALUE_PREVIEW_CHARS}, max {MAX_VALUE_PREVIEW_CHARS})"
         ),
     )
+    value_paths: Optional[List[str]] = Field(
+        default=None,
+        description=_VALUE_PATHS_DESCRIPTION,
+    )
+
+    @model_validator(mode="after")
+    def validate_value_paths(self):
+        self.value_paths = normalize_paths(self.value_paths)
+        return self
 
 
 class StorageObjectId(BaseModel):
@@ -166,8 +349,11 @@ class StorageObjectId(BaseModel):
 class GetStorageObjectsArgs(BaseModel):
     objects: List[StorageObjectId] = Field(
         min_length=1,
-        max_length=MAX_BATCH_OBJECTS,
-        description=f"Storage object ids to fetch (1–{MAX_BATCH_OBJECTS})",
+        max_length=MAX_BULK_OBJECTS,
+        description=(
+            f"Storage object ids to fetch (1–{MAX_BULK_OBJECTS}); chunked internally, "
+            "repeated ids are fetched once"
+        ),
     )
     include_value: bool = Field(
         default=True, description="Include storage value in the response (default true)"
@@ -181,13 +367,384 @@ class GetStorageObjectsArgs(BaseModel):
             f"(default {DEFAULT_VALUE_PREVIEW_CHARS}, max {MAX_VALUE_PREVIEW_CHARS})"
         ),
     )
+    value_paths: Optional[List[str]] = Field(
+        default=None,
+        description=_VALUE_PATHS_DESCRIPTION,
+    )
+    response_mode: Literal["inline", "resource", "auto"] = Field(
+        default="auto",
+        description=(
+            "inline: all results in the tool result; resource: MCP resource_link; "
+            "auto: resource when results exceed inline byte threshold"
+        ),
+    )
+
+    @model_validator(mode="after")
+    def validate_value_paths(self):
+        self.value_paths = normalize_paths(self.value_paths)
+        return self
+
+
+class StorageExistsArgs(BaseModel):
+    objects: List[StorageObjectId] = Field(
+        min_length=1,
+        max_length=MAX_BULK_OBJECTS,
+        description=(
+            f"Storage object ids to check (1–{MAX_BULK_OBJECTS}); repeated ids are checked once"
+        ),
+    )
+    only_missing: bool = Field(
+        default=False,
+        description="Return only ids that are missing or could not be checked",
+    )
+
+
+class FindStorageKeysArgs(BaseModel):
+    collection: str = Field(description="Collection name — required")
+    prefixes: Optional[List[str]] = Field(
+        default=None,
+        min_length=1,
+        max_length=MAX_KEY_PREFIXES,
+        description=f"Keys starting with any of these prefixes (up to {MAX_KEY_PREFIXES})",
+    )
+    contains: Optional[str] = Field(
+        default=None, min_length=1, description="Keys containing this substring"
+    )
+    glob: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        description="Whole-key glob, case-sensitive: * any run, ? one char, [...] a set",
+    )
+    user_id: Optional[str] = Field(default=None, description="Only objects owned by this user")
+    limit: int = Field(
+        default=DEFAULT_MAX_OBJECTS,
+        ge=1,
+        le=MAX_BULK_OBJECTS,
+        description=(
+            f"Matches to return (default {DEFAULT_MAX_OBJECTS}; max {MAX_OBJECTS_HARD_LIMIT}, "
+            f"or {MAX_BULK_OBJECTS} with fetch_objects)"
+        ),
+    )
+    offset: int = Field(default=0, ge=0, description="Matches to skip (key order)")
+    refresh: bool = Field(
+        default=False, description="Rebuild the collection's key index before matching"
+    )
+    fetch_objects: bool = Field(
+        default=False,
+        description="Fetch the returned matches with nakama_get_storage_objects (under batch)",
+    )
+    include_value: bool = Field(
+        default=True, description="With fetch_objects: include storage values"
+    )
+    max_value_chars: int = Field(
+        default=DEFAULT_VALUE_PREVIEW_CHARS,
+        ge=0,
+        le=MAX_VALUE_PREVIEW_CHARS,
+        description="With fetch_objects: max JSON chars before value is truncated",
+    )
+    value_paths: Optional[List[str]] = Field(
+        default=None, description="With fetch_objects: " + _VALUE_PATHS_DESCRIPTION
+    )
+
+    @model_validator(mode="after")
+    def validate_query(self):
+        if self.prefixes is None and self.contains is None and self.glob is None:
+            raise ValueError("Set at least one of prefixes, contains or glob")
+        if self.prefixes is not None:
+            self.prefixes = [p.rstrip("%") for p in self.prefixes]
+        if self.contains is not None and "\x00" in self.contains:
+            raise ValueError("contains must not include NUL characters")
+        if not self.fetch_objects and self.limit > MAX_OBJECTS_HARD_LIMIT:
+            raise ValueError(
+                f"limit above {MAX_OBJECTS_HARD_LIMIT} requires fetch_objects=true"
+            )
+        self.value_paths = normalize_paths(self.value_paths)
+        return self
+
+
+class ScanCollectionArgs(BaseModel):
+    collection: str = Field(description="Collection name — required")
+    user_id: Optional[str] = Field(default=None, description="Only objects owned by this user")
+    key_prefix: Optional[str] = Field(
+        default=None, description="Key prefix filter (appends % if omitted)"
+    )
+    max_objects: int = Field(
+        default=DEFAULT_SCAN_OBJECTS,
+        ge=1,
+        le=MAX_SCAN_OBJECTS,
+        description=(
+            f"Objects to scan (default {DEFAULT_SCAN_OBJECTS}, max {MAX_SCAN_OBJECTS}); "
+            "values are aggregated, not returned"
+        ),
+    )
+    start_offset: int = Field(
+        default=0, ge=0, description="Listing row to start at (next_offset of a prior scan)"
+    )
+    concurrency: int = Field(
+        default=DEFAULT_SCAN_CONCURRENCY,
+        ge=1,
+        le=MAX_SCAN_CONCURRENCY,
+        description=(
+            f"Value fetches in flight (default {DEFAULT_SCAN_CONCURRENCY}, "
+            f"max {MAX_SCAN_CONCURRENCY}); the shared Console limiter still applies"
+        ),
+    )
+    max_rate: Optional[float] = Field(
+        default=None, gt=0, description="Cap on value fetches started per second"
+    )
+    sample_size: int = Field(
+        default=DEFAULT_SCAN_SAMPLE,
+        ge=0,
+        le=MAX_SCAN_SAMPLE,
+        description=f"Random ids returned in sampled_keys (default {DEFAULT_SCAN_SAMPLE})",
+    )
+    include_values: bool = Field(
+        default=False,
+        description="Also write every value to an NDJSON MCP resource (resource_uri)",
+    )
+
+    @model_validator(mode="after")
+    def normalize_key_prefix(self):
+        if self.key_prefix is not None:
+            self.key_prefix = key_prefix_to_filter(self.key_prefix)
+        return self
+
+
+class SearchStorageValuesArgs(BaseModel):
+    collection: str = Field(description="Collection name — required")
+    user_id: Optional[str] = Field(default=None, description="Only objects owned by this user")
+    key_prefix: Optional[str] = Field(
+        default=None, description="Key prefix filter (appends % if omitted)"
+    )
+    contains: Optional[str] = Field(
+        default=None, min_length=1, description="Substring to find in the value's JSON text"
+    )
+    regex: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        max_length=MAX_VALUE_REGEX_CHARS,
+        description="Regular expression searched in the value's JSON text",
+    )
+    path: Optional[str] = Field(
+        default=None,
+        description="JSON pointer or dotted path compared with equals (e.g. 'inventory.sword')",
+    )
+    equals: Optional[Any] = Field(
+        default=None, description="JSON value the path must equal (omit to match null)"
+    )
+    ignore_case: bool = Field(default=False, description="Case-insensitive contains/regex")
+    max_matches: int = Field(
+        default=DEFAULT_SEARCH_MATCHES,
+        ge=1,
+        le=MAX_SEARCH_MATCHES,
+        description=f"Stop after this many matches (default {DEFAULT_SEARCH_MATCHES})",
+    )
+    max_scanned: int = Field(
+        default=DEFAULT_MAX_SCANNED,
+        ge=1,
+        le=MAX_SCAN_OBJECTS,
+        description=(
+            f"Max objects whose value is fetched (default {DEFAULT_MAX_SCANNED}, "
+            f"max {MAX_SCAN_OBJECTS})"
+        ),
+    )
+    start_offset: int = Field(
+        default=0, ge=0, description="Listing row to start at (next_offset of a prior search)"
+    )
+    concurrency: int = Field(
+        default=DEFAULT_SCAN_CONCURRENCY,
+        ge=1,
+        le=MAX_SCAN_CONCURRENCY,
+        description=f"Value fetches in flight (default {DEFAULT_SCAN_CONCURRENCY})",
+    )
+    max_rate: Optional[float] = Field(
+        default=None, gt=0, description="Cap on value fetches started per second"
+    )
+
+    @model_validator(mode="after")
+    def validate_match(self):
+        if sum(x is not None for x in (self.contains, self.regex, self.path)) != 1:
+            raise ValueError("Set exactly one of contains, regex or path")
+        if self.path is not None:
+            parse_path(self.path)
+        elif "equals" in self.model_fields_set:
+            raise ValueError("equals is only used with path")
+        if self.regex is not None:
+            compile_value_regex(self.regex, ignore_case=self.ignore_case)
+        if self.key_prefix is not None:
+            self.key_prefix = key_prefix_to_filter(self.key_prefix)
+        return self
+
+
+class AggregateStorageArgs(BaseModel):
+    collection: str = Field(description="Collection name — required")
+    user_id: Optional[str] = Field(default=None, description="Only objects owned by this user")
+    key_prefix: Optional[str] = Field(
+        default=None, description="Key prefix filter (appends % if omitted)"
+    )
+    fields: Optional[List[str]] = Field(
+        default=None,
+        max_length=MAX_AGGREGATE_FIELDS,
+        description=(
+            "Numeric value paths (JSON pointer or dotted, e.g. 'stats.level') to "
+            "summarise as count/sum/min/max/mean, overall and per group"
+        ),
+    )
+    histogram_path: Optional[str] = Field(
+        default=None, description="Value path to histogram (distinct values, or numeric buckets)"
+    )
+    bucket_width: Optional[float] = Field(
+        default=None, gt=0, description="Bucket numbers at histogram_path into this width"
+    )
+    group_by: Optional[str] = Field(
+        default=None, description="Value path whose values group the count and fields"
+    )
+    max_groups: int = Field(
+        default=DEFAULT_MAX_GROUPS,
+        ge=1,
+        le=MAX_GROUPS,
+        description=f"Largest groups returned (default {DEFAULT_MAX_GROUPS}, max {MAX_GROUPS})",
+    )
+    sample_rate: float = Field(
+        default=1.0,
+        gt=0,
+        le=1,
+        description=(
+            "Fetch only this fraction of listed objects (hash sample) and extrapolate "
+            "counts and sums; 1 aggregates every object"
+        ),
+    )
+    max_objects: int = Field(
+        default=DEFAULT_SCAN_OBJECTS,
+        ge=1,
+        le=MAX_SCAN_OBJECTS,
+        description=(
+            f"Listed objects to cover (default {DEFAULT_SCAN_OBJECTS}, max {MAX_SCAN_OBJECTS}); "
+            "with sampling only about sample_rate of them are fetched"
+        ),
+    )
+    start_offset: int = Field(
+        default=0, ge=0, description="Listing row to start at (next_offset of a prior call)"
+    )
+    concurrency: int = Field(
+        default=DEFAULT_SCAN_CONCURRENCY,
+        ge=1,
+        le=MAX_SCAN_CONCURRENCY,
+        description=f"Value fetches in flight (default {DEFAULT_SCAN_CONCURRENCY})",
+    )
+    max_rate: Optional[float] = Field(
+        default=None, gt=0, description="Cap on value fetches started per second"
+    )
+
+    @model_validator(mode="after")
+    def validate_paths(self):
+        if self.fields is not None:
+            self.fields = normalize_paths(self.fields)
+        for path in (self.histogram_path, self.group_by):
+            if path is not None:
+                parse_path(path)
+        if self.bucket_width is not None and self.histogram_path is None:
+            raise ValueError("bucket_width is only used with histogram_path")
+        if self.key_prefix is not None:
+            self.key_prefix = key_prefix_to_filter(self.key_prefix)
+        return self
+
+
+class SyncStorageIndexArgs(BaseModel):
+    collection: str = Field(description="Collection to crawl into the local metadata index")
+    full: bool = Field(
+        default=False,
+        description="Drop the collection's indexed rows and crawl from scratch",
+    )
+    include_value_sizes: bool = Field(
+        default=False,
+        description="Also GET new or changed objects to record value_bytes (slower)",
+    )
+    concurrency: int = Field(
+        default=DEFAULT_SCAN_CONCURRENCY,
+        ge=1,
+        le=MAX_SCAN_CONCURRENCY,
+        description=f"Value-size fetches in flight (default {DEFAULT_SCAN_CONCURRENCY})",
+    )
+
+
+class QueryStorageIndexArgs(BaseModel):
+    collection: str = Field(description="Indexed collection — required")
+    user_id: Optional[str] = Field(default=None, description="Only objects owned by this user")
+    key_prefix: Optional[str] = Field(
+        default=None, description="Only keys starting with this prefix (a trailing % is ignored)"
+    )
+    where: Optional[StorageWhere] = Field(
+        default=None, description="Same metadata conditions as the list tools' where"
+    )
+    min_value_bytes: Optional[int] = Field(
+        default=None, ge=0, description="Only objects whose measured value is at least this size"
+    )
+    max_value_bytes: Optional[int] = Field(
+        default=None, ge=0, description="Only objects whose measured value is at most this size"
+    )
+    sort_by: Literal[
+        "key", "user_id", "update_time", "create_time", "version", "value_bytes"
+    ] = Field(
+        default="key", description="Sort field; rows lacking it sort last"
+    )
+    descending: bool = Field(default=False, description="Sort descending")
+    limit: int = Field(
+        default=DEFAULT_INDEX_QUERY_LIMIT,
+        ge=0,
+        le=MAX_INDEX_QUERY_LIMIT,
+        description=(
+            f"Rows to return (default {DEFAULT_INDEX_QUERY_LIMIT}, max "
+            f"{MAX_INDEX_QUERY_LIMIT}); 0 returns only the total count"
+        ),
+    )
+    offset: int = Field(default=0, ge=0, description="Matching rows to skip (after sorting)")
+
+    @model_validator(mode="after")
+    def normalize_key_prefix(self):
+        if self.key_prefix is not None:
+            self.key_prefix = self.key_prefix.rstrip("%") or None
+        return self
+
+
+class ReadResultSetArgs(BaseModel):
+    handle: str = Field(description="result_handle from a previous list tool response")
+    offset: int = Field(default=0, ge=0, description="Rows to skip (after sorting)")
+    limit: int = Field(
+        default=DEFAULT_MAX_OBJECTS,
+        ge=1,
+        le=RESULT_SET_READ_MAX_LIMIT,
+        description=(
+            f"Rows to return (default {DEFAULT_MAX_OBJECTS}, "
+            f"max {RESULT_SET_READ_MAX_LIMIT})"
+        ),
+    )
+    sort_by: Optional[str] = Field(
+        default=None,
+        description="Top-level field to sort by (e.g. 'update_time'); rows lacking it sort last",
+    )
+    descending: bool = Field(default=False, description="Sort descending")
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Only return these top-level fields per row; identity fields always "
+            "included. Can only narrow what the original list call kept."
+        ),
+    )
+
+    @model_validator(mode="after")
+    def normalize_projection(self):
+        self.fields = normalize_fields(self.fields)
+        return self
 
 
 # --- Response envelopes (MCP outputSchema) ---
 
 
 class ListAccountsEnvelope(ListPageMeta):
-    users: list[dict[str, Any]] = Field(description="Account user objects from Nakama")
+    users: list[dict[str, Any]] = Field(
+        description="Account user objects from Nakama (only requested fields when fields is set)"
+    )
 
 
 class ListWalletLedgerEnvelope(ListPageMeta):
@@ -198,7 +755,7 @@ class ListWalletLedgerEnvelope(ListPageMeta):
 
 class ListStorageEnvelope(ListPageMeta):
     objects: list[dict[str, Any]] = Field(
-        description="Storage object metadata only (no values)"
+        description="Storage object metadata only (no values; only requested fields when fields is set)"
     )
 
 
@@ -208,6 +765,26 @@ class ListStorageKeysEnvelope(ListPageMeta):
     )
 
 
+class ReadResultSetEnvelope(BaseModel):
+    handle: str = Field(description="Result set handle that was read")
+    source: str = Field(description="List tool that produced the result set")
+    items: list[Any] = Field(description="Requested window of rows")
+    offset: int = Field(description="Offset of the first returned row")
+    returned: int = Field(description="Number of rows in items")
+    total_items: int = Field(description="Rows held in the result set")
+    next_offset: Optional[int] = Field(
+        default=None, description="Offset for the next window when more rows remain"
+    )
+    source_complete: bool = Field(
+        description="False if the original list call stopped before all matches"
+    )
+    source_next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor for the source list tool to continue past the stored rows",
+    )
+    hint: Optional[str] = Field(default=None, description="Suggested next step")
+
+
 class StorageBatchResultItem(BaseModel):
     collection: str = Field(description="Collection name")
     key: str = Field(description="Storage object key")
@@ -223,10 +800,298 @@ class StorageBatchResultItem(BaseModel):
 
 class GetStorageObjectsEnvelope(BaseModel):
     results: list[StorageBatchResultItem] = Field(
-        description="Per-item results in input order"
+        description="Per-item results in input order (empty when spilled to resource_uri)"
     )
     fetched: int = Field(description="Count of successful fetches")
     failed: int = Field(description="Count of failed fetches")
+    unique: Optional[int] = Field(
+        default=None, description="Distinct ids fetched from the Console"
+    )
+    duplicates: Optional[int] = Field(
+        default=None, description="Repeated ids in the input, answered from one fetch"
+    )
+    complete: bool = Field(
+        default=True,
+        description="False if some items were not attempted before the time budget ran out",
+    )
+    deadline_exceeded: bool = Field(
+        default=False,
+        description="True if the tool time budget ran out and results are partial",
+    )
+    response_mode: Optional[str] = Field(
+        default=None,
+        description="resource when results were spilled to resource_uri (results is then empty)",
+    )
+    resource_uri: Optional[str] = Field(
+        default=None, description="MCP resource URI holding the full results"
+    )
+    hint: Optional[str] = Field(default=None, description="How to read resource results")
+
+
+class StorageExistsItem(BaseModel):
+    collection: str = Field(description="Collection name")
+    key: str = Field(description="Storage object key")
+    user_id: str = Field(description="User/owner ID")
+    exists: Optional[bool] = Field(
+        description="True if present, false if missing, null if it could not be checked"
+    )
+    version: Optional[str] = Field(default=None, description="Version when present")
+    update_time: Optional[str] = Field(default=None, description="Last update when present")
+    source: Optional[str] = Field(
+        default=None,
+        description="What answered it: collection_listing, user_listing, key_listing or get",
+    )
+    error: Optional[str] = Field(default=None, description="Why exists is null")
+
+
+class StorageExistsEnvelope(BaseModel):
+    results: list[StorageExistsItem] = Field(
+        description="Per-id answers in input order (present ids omitted with only_missing)"
+    )
+    present: int = Field(description="Distinct ids that exist")
+    missing: int = Field(description="Distinct ids that do not exist")
+    unknown: int = Field(description="Distinct ids that could not be checked")
+    unique: int = Field(description="Distinct ids checked")
+    duplicates: int = Field(description="Repeated ids in the input, answered once")
+    requests: dict[str, int] = Field(
+        description="Console requests by kind (metadata listings and fallback GETs)"
+    )
+    complete: bool = Field(description="True when every id was answered")
+    deadline_exceeded: bool = Field(
+        default=False,
+        description="True if the tool time budget ran out and some ids are unchecked",
+    )
+    hint: Optional[str] = Field(default=None, description="Suggested next step")
+
+
+class FindStorageKeysEnvelope(BaseModel):
+    collection: str = Field(description="Searched collection")
+    keys: list[dict[str, str]] = Field(
+        description="Matching ids as {key, user_id}, in key order"
+    )
+    returned: int = Field(description="Ids in keys")
+    matched: int = Field(description="All matches in the key index")
+    offset: int = Field(description="Offset of the first returned match")
+    next_offset: Optional[int] = Field(
+        default=None, description="Offset for the next window when more ids match"
+    )
+    index_rows: int = Field(description="(key, user_id) rows held in the key index")
+    index_distinct_keys: int = Field(description="Distinct keys in the key index")
+    index_complete: bool = Field(
+        description="False while the key index is still building (matches may be missing)"
+    )
+    index_built_at: str = Field(description="When the key index listing started (UTC)")
+    index_age_seconds: float = Field(description="Seconds since index_built_at")
+    index_refreshed: bool = Field(description="True if this call listed keys from the Console")
+    batch: Optional[dict[str, Any]] = Field(
+        default=None,
+        description="nakama_get_storage_objects envelope for the returned ids (fetch_objects)",
+    )
+    hint: Optional[str] = Field(default=None, description="Next steps")
+
+
+class ScanCollectionEnvelope(BaseModel):
+    collection: str = Field(description="Scanned collection")
+    listed: int = Field(description="Rows listed from the Console")
+    processed: int = Field(description="Listed rows whose value fetch finished")
+    fetched: int = Field(description="Values fetched successfully")
+    fetch_errors: int = Field(description="Value fetches that failed")
+    error_samples: list[dict[str, Any]] = Field(
+        default_factory=list, description="First few failed ids with their errors"
+    )
+    decode_failures: int = Field(
+        description="Values that are not a JSON object or array after decoding"
+    )
+    decode_failure_samples: list[dict[str, Any]] = Field(
+        default_factory=list, description="First few ids whose value failed to decode"
+    )
+    value_size: dict[str, Any] = Field(
+        description="Value JSON size stats: total/min/max/mean bytes and a histogram"
+    )
+    sampled_keys: list[dict[str, Any]] = Field(
+        default_factory=list,
+        description="Uniform random sample of scanned ids with version and value_bytes",
+    )
+    total_count: int = Field(default=0, description="Console total_count for the listing")
+    complete: bool = Field(description="True if every object of the listing was scanned")
+    limit_reached: bool = Field(
+        default=False, description="Stopped at max_objects with more objects listed"
+    )
+    next_offset: Optional[int] = Field(
+        default=None, description="Pass as start_offset to scan the next slice"
+    )
+    deadline_exceeded: bool = Field(
+        default=False,
+        description="True if the tool time budget ran out and the aggregate is partial",
+    )
+    listing_error: Optional[str] = Field(
+        default=None, description="Listing error that ended the scan early"
+    )
+    elapsed_seconds: float = Field(description="Wall time of the scan")
+    objects_per_second: Optional[float] = Field(
+        default=None, description="Processed objects per second"
+    )
+    resource_uri: Optional[str] = Field(
+        default=None, description="NDJSON resource of values when include_values is true"
+    )
+    values_truncated: Optional[bool] = Field(
+        default=None, description="True if the NDJSON resource hit its size cap"
+    )
+    hint: Optional[str] = Field(default=None, description="Next steps")
+
+
+class SearchStorageValuesEnvelope(BaseModel):
+    collection: str = Field(description="Searched collection")
+    matches: list[dict[str, Any]] = Field(
+        description="Matching ids with version and a short snippet around the match"
+    )
+    matched: int = Field(description="Number of matches returned")
+    scanned: int = Field(description="Values fetched and tested")
+    fetch_errors: int = Field(default=0, description="Value fetches that failed")
+    error_samples: list[dict[str, Any]] = Field(
+        default_factory=list, description="First few failed ids with their errors"
+    )
+    total_count: int = Field(default=0, description="Console total_count for the listing")
+    complete: bool = Field(description="True if every object of the listing was tested")
+    match_limit_reached: bool = Field(default=False, description="Stopped at max_matches")
+    scan_limit_reached: bool = Field(default=False, description="Stopped at max_scanned")
+    next_offset: Optional[int] = Field(
+        default=None, description="Pass as start_offset to continue the search"
+    )
+    deadline_exceeded: bool = Field(
+        default=False,
+        description="True if the tool time budget ran out and the search is partial",
+    )
+    listing_error: Optional[str] = Field(
+        default=None, description="Listing error that ended the search early"
+    )
+    hint: Optional[str] = Field(default=None, description="Next steps")
+
+
+class AggregateStorageEnvelope(BaseModel):
+    collection: str = Field(description="Aggregated collection")
+    listed: int = Field(description="Rows listed from the Console")
+    processed: int = Field(description="Listed (sampled) rows whose value fetch finished")
+    fetch_errors: int = Field(default=0, description="Value fetches that failed")
+    error_samples: list[dict[str, Any]] = Field(
+        default_factory=list, description="First few failed ids with their errors"
+    )
+    sample_rate: float = Field(description="Fraction of listed objects fetched")
+    approximate: bool = Field(description="True when sampled; use the estimated_* fields")
+    count: int = Field(description="Values aggregated")
+    estimated_count: Optional[int] = Field(
+        default=None, description="count extrapolated to every listed object (sampled only)"
+    )
+    undecodable: int = Field(
+        default=0, description="Values skipped because they are not a JSON object or array"
+    )
+    fields: Optional[dict[str, dict[str, Any]]] = Field(
+        default=None,
+        description=(
+            "Per path: count/sum/min/max/mean of numeric values, missing, non_numeric "
+            "(and estimated_sum when sampled)"
+        ),
+    )
+    histogram: Optional[dict[str, Any]] = Field(
+        default=None,
+        description="buckets (bucket_width) or top values with counts; other counts the rest",
+    )
+    group_by: Optional[str] = Field(default=None, description="Grouping path")
+    groups: Optional[list[dict[str, Any]]] = Field(
+        default=None, description="Largest groups with count and per-field stats"
+    )
+    distinct_groups: Optional[int] = Field(default=None, description="Distinct groups seen")
+    other_groups_count: Optional[int] = Field(
+        default=None, description="Values in groups not returned"
+    )
+    total_count: int = Field(default=0, description="Console total_count for the listing")
+    complete: bool = Field(description="True if every object of the listing was covered")
+    limit_reached: bool = Field(
+        default=False, description="Stopped at max_objects with more objects listed"
+    )
+    next_offset: Optional[int] = Field(
+        default=None, description="Pass as start_offset to aggregate the next slice"
+    )
+    deadline_exceeded: bool = Field(
+        default=False,
+        description="True if the tool time budget ran out and the aggregate is partial",
+    )
+    listing_error: Optional[str] = Field(
+        default=None, description="Listing error that ended the scan early"
+    )
+    elapsed_seconds: float = Field(description="Wall time of the scan")
+    hint: Optional[str] = Field(default=None, description="Next steps")
+
+
+class SyncStorageIndexEnvelope(BaseModel):
+    collection: str = Field(description="Synced collection")
+    full: bool = Field(description="True if the collection was crawled from scratch")
+    resumed: bool = Field(description="True if this call continued an unfinished pass")
+    start_offset: int = Field(description="Listing row this call started at")
+    listed: int = Field(description="Metadata rows listed by this call")
+    inserted: int = Field(description="Rows new to the index")
+    updated: int = Field(description="Rows whose version or update_time changed")
+    unchanged: int = Field(description="Rows already current in the index")
+    deleted: int = Field(description="Indexed rows confirmed gone when the pass finished")
+    rechecked: int = Field(
+        default=0,
+        description="Rows a resumed pass did not list, rechecked by id before deleting",
+    )
+    stale_rows: int = Field(
+        default=0,
+        description="Rows the finished pass did not see and could not recheck yet",
+    )
+    value_sizes_measured: int = Field(default=0, description="Values fetched to record size")
+    value_size_errors: int = Field(default=0, description="Value fetches that failed")
+    indexed_rows: int = Field(description="Rows held for the collection after this call")
+    complete: bool = Field(description="True if the pass read the listing to the end")
+    next_offset: Optional[int] = Field(
+        default=None, description="Where the next sync call resumes when not complete"
+    )
+    deadline_exceeded: bool = Field(
+        default=False, description="True if the tool time budget ended this call"
+    )
+    listing_error: Optional[str] = Field(
+        default=None, description="Listing error that ended this call early"
+    )
+    index_synced_at: Optional[str] = Field(
+        default=None, description="When the last complete pass finished (UTC)"
+    )
+    elapsed_seconds: float = Field(description="Wall time of this call")
+    hint: Optional[str] = Field(default=None, description="Next steps")
+
+
+class QueryStorageIndexEnvelope(BaseModel):
+    collection: str = Field(description="Queried collection")
+    objects: list[dict[str, Any]] = Field(
+        description="Matching metadata rows (with value_bytes when measured)"
+    )
+    returned: int = Field(description="Rows in objects")
+    total: int = Field(description="Rows matching the query in the index")
+    offset: int = Field(description="Offset of the first returned row")
+    next_offset: Optional[int] = Field(
+        default=None, description="Offset for the next window when more rows match"
+    )
+    index_backed: bool = Field(
+        default=True, description="Always true: answered from the local index, not the Console"
+    )
+    index_synced_at: Optional[str] = Field(
+        default=None, description="When the last complete sync pass finished (UTC)"
+    )
+    index_age_seconds: Optional[float] = Field(
+        default=None, description="Seconds since index_synced_at"
+    )
+    index_complete: bool = Field(
+        description=(
+            "False while a sync pass is unfinished or stale_rows is non-zero "
+            "(rows may be missing or no longer exist)"
+        )
+    )
+    stale_rows: int = Field(
+        default=0,
+        description="Indexed rows the last pass did not see and could not confirm yet",
+    )
+    hint: Optional[str] = Field(default=None, description="Next steps")
 
 
 class StatusEnvelope(BaseModel):
@@ -244,6 +1109,21 @@ class StatusEnvelope(BaseModel):
     hint: Optional[str] = Field(
         default=None, description="Connection or API notes when status is partial"
     )
+    breaker_state: Optional[str] = Field(
+        default=None,
+        description=(
+            "Console circuit breaker: closed (normal), open (failing fast), "
+            "half_open (probing recovery)"
+        ),
+    )
+    client: Optional[dict[str, Any]] = Field(
+        default=None,
+        description=(
+            "MCP-side Console client statistics (connection pool occupancy, "
+            "coalesced GET and response cache counters, token refresh, retries, "
+            "adaptive concurrency limit, circuit breaker)"
+        ),
+    )
 
 
 class CollectionsEnvelope(BaseModel):
@@ -268,6 +1148,12 @@ class StorageObjectEnvelope(BaseModel):
     value_bytes: Optional[int] = Field(
         default=None, description="Original UTF-8 byte length when truncated"
     )
+    value_paths: Optional[dict[str, Any]] = Field(
+        default=None, description="Requested path → value sub-tree (when value_paths was set)"
+    )
+    missing_paths: Optional[list[str]] = Field(
+        default=None, description="Requested paths not present in the value"
+    )
     version: Optional[str] = Field(default=None, description="Object version hash")
     permission_read: Optional[int] = Field(
         default=None, description="Read permission level"
@@ -368,18 +1254,37 @@ __all__ = [
     "GetAccountArgs",
     "ListWalletLedgerArgs",
     "ExportAccountArgs",
+    "ReadResultSetArgs",
+    "ReadResultSetEnvelope",
+    "StorageWhere",
+    "StorageFilterArgs",
     "ListStorageArgs",
     "ListUserStorageArgs",
     "ListStorageKeysArgs",
     "GetStorageObjectArgs",
     "StorageObjectId",
     "GetStorageObjectsArgs",
+    "ScanCollectionArgs",
+    "SearchStorageValuesArgs",
+    "AggregateStorageArgs",
+    "SyncStorageIndexArgs",
+    "QueryStorageIndexArgs",
+    "FindStorageKeysArgs",
+    "StorageExistsArgs",
     "ListAccountsEnvelope",
     "ListWalletLedgerEnvelope",
     "ListStorageEnvelope",
     "ListStorageKeysEnvelope",
     "StorageBatchResultItem",
     "GetStorageObjectsEnvelope",
+    "ScanCollectionEnvelope",
+    "SearchStorageValuesEnvelope",
+    "AggregateStorageEnvelope",
+    "SyncStorageIndexEnvelope",
+    "QueryStorageIndexEnvelope",
+    "FindStorageKeysEnvelope",
+    "StorageExistsItem",
+    "StorageExistsEnvelope",
     "StatusEnvelope",
     "CollectionsEnvelope",
     "StorageObjectEnvelope",
@@ -1,13 +1,75 @@
 import asyncio
+import base64
+import json
 import logging
+import time
 from typing import Any, Dict, Optional
 
 import httpx
 
+from src.circuit_breaker import BREAKER_FAILURE_EXCEPTIONS, CircuitBreaker
+from src.concurrency import AdaptiveLimiter
 from src.config import NakamaSettings
+from src.response_cache import ResponseCache
+from src.retry import (
+    RETRYABLE_EXCEPTIONS,
+    RETRYABLE_STATUS_CODES,
+    RetryBudget,
+    RetryPolicy,
+    retry_after_seconds,
+)
+from src.singleflight import SingleFlight, request_key
 
 logger = logging.getLogger(__name__)
 
+# Refresh this long before JWT exp (capped at a fifth of the token lifetime).
+TOKEN_REFRESH_MARGIN_SECONDS = 60.0
+# Never schedule a proactive refresh sooner than this, so a token that arrives
+# already expired (clock skew, very short lifetimes) cannot cause a login loop.
+TOKEN_REFRESH_MIN_DELAY_SECONDS = 5.0
+# A failed proactive refresh is retried after the minimum delay doubled per
+# consecutive failure, up to this cap.
+TOKEN_REFRESH_MAX_BACKOFF_SECONDS = 300.0
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _jwt_expiry(token: str) -> Optional[float]:
+    """Return the ``exp`` claim (unix seconds) of a JWT without verifying it."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        exp = claims.get("exp")
+        return float(exp) if exp is not None else None
+    except Exception:
+        return None
+
+
+_POOL_OCCUPANCY_FIELDS = ("open", "idle", "active", "waiting")
+
+
+def _pool_occupancy(client: httpx.AsyncClient) -> Optional[Dict[str, int]]:
+    """Open/idle/active/waiting counts from httpcore internals, or None if unreadable."""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None)
+    requests = getattr(pool, "_requests", None)
+    if connections is None or requests is None:
+        return None
+    try:
+        open_ = len(connections)
+        idle = sum(1 for conn in connections if conn.is_idle())
+        waiting = sum(1 for req in requests if getattr(req, "connection", None) is None)
+    except (AttributeError, TypeError):
+        return None
+    return {"open": open_, "idle": idle, "active": open_ - idle, "waiting": waiting}
+
 
 class NakamaConsoleClient:
     """Async client for Nakama Console API (read-only).
@@ -17,41 +79,138 @@ class NakamaConsoleClient:
         client = NakamaConsoleClient(settings)
         await client.authenticate()
         data = await client.get('/v2/console/account')
+
+    ``transport`` replaces the network transport (e.g. an in-process fake Console).
     """
 
-    def __init__(self, settings: NakamaSettings, timeout: float = 10.0):
+    def __init__(
+        self,
+        settings: NakamaSettings,
+        timeout: float = 10.0,
+        *,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
         self.settings = settings
         self.base_url = settings.nakama_console_url.rstrip("/")
         self._token: Optional[str] = None
-        self._client = httpx.AsyncClient(timeout=timeout)
+        self._token_expires_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._logins = 0
+        self._proactive_refreshes = 0
+        self._refresh_failures = 0
+        self.limits = httpx.Limits(
+            max_connections=settings.nakama_max_connections,
+            max_keepalive_connections=settings.nakama_max_keepalive_connections,
+            keepalive_expiry=settings.nakama_keepalive_expiry_seconds,
+        )
+        self.http2 = settings.nakama_http2 and _http2_available()
+        if settings.nakama_http2 and not self.http2:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+        self._client = httpx.AsyncClient(
+            timeout=timeout, limits=self.limits, http2=self.http2, transport=transport
+        )
         self._lock = asyncio.Lock()
+        self._in_flight = 0
+        self._single_flight = SingleFlight()
+        self.cache = ResponseCache(max_bytes=settings.nakama_cache_max_bytes)
+        self.retry_policy = RetryPolicy(
+            max_attempts=settings.nakama_retry_max_attempts,
+            base_delay=settings.nakama_retry_base_delay_seconds,
+            max_delay=settings.nakama_retry_max_delay_seconds,
+        )
+        self.retry_budget = RetryBudget(ratio=settings.nakama_retry_budget_ratio)
+        self.limiter = AdaptiveLimiter(
+            initial_limit=settings.nakama_concurrency_initial,
+            min_limit=settings.nakama_concurrency_min,
+            max_limit=settings.nakama_concurrency_max,
+        )
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.nakama_breaker_failure_threshold,
+            reset_timeout=settings.nakama_breaker_reset_seconds,
+        )
 
     async def authenticate(self, *, force: bool = False) -> str:
         """Authenticate the console user and store the JWT token.
 
-        When force is True, ignore any cached token and fetch a new one
-        (used after a 401 to reauth).
+        When force is True, ignore any cached token and fetch a new one.
         """
         async with self._lock:
             if self._token and not force:
                 return self._token
-            url = f"{self.base_url}/v2/console/authenticate"
-            payload = {"username": self.settings.nakama_username, "password": self.settings.nakama_password}
-            try:
-                resp = await self._client.post(url, json=payload)
-            except Exception:
-                logger.exception("Failed to reach Nakama Console authenticate endpoint")
-                raise
-            if resp.status_code != 200:
-                logger.error("Authentication failed: %s %s", resp.status_code, resp.text)
-                raise RuntimeError(f"Authentication failed: {resp.status_code} {resp.text}")
-            data = resp.json()
-            token = data.get("token")
-            if not token:
-                raise RuntimeError("Authentication succeeded but no token returned")
-            self._token = token
-            logger.info("Authenticated to Nakama Console; token cached")
-            return self._token
+            return await self._login()
+
+    async def _login(self) -> str:
+        """POST credentials and cache the token; caller must hold ``self._lock``."""
+        url = f"{self.base_url}/v2/console/authenticate"
+        payload = {"username": self.settings.nakama_username, "password": self.settings.nakama_password}
+        try:
+            resp = await self._client.post(url, json=payload)
+        except Exception:
+            logger.exception("Failed to reach Nakama Console authenticate endpoint")
+            raise
+        if resp.status_code != 200:
+            logger.error("Authentication failed: %s %s", resp.status_code, resp.text)
+            raise RuntimeError(f"Authentication failed: {resp.status_code} {resp.text}")
+        data = resp.json()
+        token = data.get("token")
+        if not token:
+            raise RuntimeError("Authentication succeeded but no token returned")
+        self._token = token
+        self._token_expires_at = _jwt_expiry(token)
+        self._logins += 1
+        self._refresh_failures = 0
+        self._schedule_refresh()
+        logger.info("Authenticated to Nakama Console; token cached")
+        return self._token
+
+    async def _reauthenticate(self, stale_token: Optional[str]) -> str:
+        """Replace ``stale_token`` once, however many callers saw it fail.
+
+        Callers that lose the race find a different token already cached and
+        reuse it instead of logging in again.
+        """
+        async with self._lock:
+            if self._token and self._token != stale_token:
+                return self._token
+            return await self._login()
+
+    def _refresh_delay(self) -> Optional[float]:
+        if self._token_expires_at is None:
+            return None
+        if self._refresh_failures:
+            backoff = TOKEN_REFRESH_MIN_DELAY_SECONDS * 2 ** self._refresh_failures
+            return min(backoff, TOKEN_REFRESH_MAX_BACKOFF_SECONDS)
+        lifetime = self._token_expires_at - time.time()
+        margin = min(TOKEN_REFRESH_MARGIN_SECONDS, max(lifetime, 0.0) / 5)
+        return max(lifetime - margin, TOKEN_REFRESH_MIN_DELAY_SECONDS)
+
+    def _schedule_refresh(self) -> None:
+        task = self._refresh_task
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+        self._refresh_task = None
+        delay = self._refresh_delay()
+        if delay is None:
+            return
+        self._refresh_task = asyncio.get_running_loop().create_task(
+            self._refresh_later(delay, self._token)
+        )
+
+    async def _refresh_later(self, delay: float, token: Optional[str]) -> None:
+        """Background task: log in again shortly before ``token`` expires."""
+        await asyncio.sleep(delay)
+        try:
+            if await self._reauthenticate(token) != token:
+                self._proactive_refreshes += 1
+        except Exception:
+            self._refresh_failures += 1
+            logger.warning("Proactive token refresh failed; will reauthenticate on demand", exc_info=True)
+            if not self._token_expired():
+                # Retry with backoff while the current token is still usable.
+                self._schedule_refresh()
+
+    def _token_expired(self) -> bool:
+        return self._token_expires_at is not None and time.time() >= self._token_expires_at
 
     @property
     def is_authenticated(self) -> bool:
@@ -63,6 +222,33 @@ class NakamaConsoleClient:
             headers["Authorization"] = f"Bearer {self._token}"
         return headers
 
+    async def _send(self, method: str, url: str, kwargs: Dict[str, Any]) -> httpx.Response:
+        """Send once with auth; an already-expired token is replaced first and a 401
+        triggers one shared re-login and a single resend."""
+        if self._token_expired():
+            await self._reauthenticate(self._token)
+        token_used = self._token
+        kwargs["headers"] = self._auth_headers()
+        resp = await self._client.request(method, url, **kwargs)
+        if resp.status_code == 401:
+            logger.info("Token unauthorized, reauthenticating and retrying %s %s", method, url)
+            await self._reauthenticate(token_used)
+            kwargs["headers"] = self._auth_headers()
+            resp = await self._client.request(method, url, **kwargs)
+        return resp
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        """Seconds to wait before retrying, or None when the request should fail now."""
+        policy = self.retry_policy
+        if attempt + 1 >= policy.max_attempts:
+            return None
+        delay = retry_after if retry_after is not None else policy.backoff(attempt)
+        if delay > policy.max_delay:
+            return None
+        if not self.retry_budget.try_spend():
+            return None
+        return delay
+
     async def _request(
         self,
         method: str,
@@ -71,32 +257,145 @@ class NakamaConsoleClient:
         params: Optional[Dict[str, Any]] = None,
         json_data: Optional[Dict[str, Any]] = None,
     ) -> Any:
-        """HTTP request with automatic authentication and retry on 401 once."""
+        """HTTP request with automatic authentication and retry on 401 once.
+
+        GETs are also retried on connect errors, timeouts, 429 and 5xx with jittered
+        backoff (honouring Retry-After), limited by the shared retry budget. Every
+        attempt holds a slot of the adaptive limiter, which learns from its latency
+        and overload signals; backoff sleeps do not hold a slot. While the circuit
+        breaker is open requests raise ConsoleUnavailableError without I/O.
+        """
         url = path if path.startswith("http") else f"{self.base_url}{path}"
-        kwargs: Dict[str, Any] = {"headers": self._auth_headers()}
+        kwargs: Dict[str, Any] = {}
         if params is not None:
             kwargs["params"] = params
         if json_data is not None:
             kwargs["json"] = json_data
 
-        resp = await self._client.request(method, url, **kwargs)
-        if resp.status_code == 401:
-            logger.info("Token unauthorized, reauthenticating and retrying %s %s", method, path)
-            await self.authenticate(force=True)
-            kwargs["headers"] = self._auth_headers()
-            resp = await self._client.request(method, url, **kwargs)
+        idempotent = method == "GET"
+        self.retry_budget.record_request()
+        self._in_flight += 1
+        try:
+            attempt = 0
+            while True:
+                probe = self.breaker.before_request()
+                try:
+                    await self.limiter.acquire()
+                except BaseException:
+                    # Cancelled while queued for a slot: hand the probe back.
+                    self.breaker.record_abandoned(probe)
+                    raise
+                started = time.monotonic()
+                try:
+                    resp = await self._send(method, url, kwargs)
+                except RETRYABLE_EXCEPTIONS as e:
+                    self.limiter.release(overloaded=True)
+                    if isinstance(e, BREAKER_FAILURE_EXCEPTIONS):
+                        self.breaker.record_failure(probe)
+                    else:
+                        self.breaker.record_abandoned(probe)
+                    delay = self._retry_delay(attempt, None) if idempotent else None
+                    if delay is None:
+                        raise
+                    logger.info("Retrying %s %s after %s (attempt %d)", method, path, type(e).__name__, attempt + 1)
+                except BaseException:
+                    self.limiter.release()
+                    self.breaker.record_abandoned(probe)
+                    raise
+                else:
+                    self.breaker.record_success(probe)
+                    overloaded = resp.status_code in RETRYABLE_STATUS_CODES
+                    self.limiter.release(latency=time.monotonic() - started, overloaded=overloaded)
+                    if not idempotent or not overloaded:
+                        break
+                    delay = self._retry_delay(attempt, retry_after_seconds(resp))
+                    if delay is None:
+                        break
+                    logger.info("Retrying %s %s after HTTP %s (attempt %d)", method, path, resp.status_code, attempt + 1)
+                await asyncio.sleep(delay)
+                attempt += 1
+        finally:
+            self._in_flight -= 1
         resp.raise_for_status()
         return resp.json()
 
-    async def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
-        """GET request with automatic authentication and retry on 401 once."""
-        return await self._request("GET", path, params=params or {})
+    def auth_stats(self) -> Dict[str, Any]:
+        expires_in = None
+        if self._token_expires_at is not None:
+            expires_in = round(self._token_expires_at - time.time(), 1)
+        return {
+            "logins": self._logins,
+            "proactive_refreshes": self._proactive_refreshes,
+            "refresh_failures": self._refresh_failures,
+            "token_expires_in": expires_in,
+        }
+
+    async def get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        use_cache: bool = True,
+    ) -> Any:
+        """GET request with automatic authentication and retry on 401 once.
+
+        Responses for slow-changing endpoints are served from a TTL cache (see
+        ``src.response_cache``); pass ``use_cache=False`` to force a fresh read,
+        which also refreshes the cached entry. Concurrent GETs for the same path
+        and params share one HTTP round trip.
+        """
+        params = params or {}
+        key = request_key(path, params)
+        ttl = self.cache.ttl_for(path)
+        if ttl > 0 and use_cache:
+            hit, value = self.cache.get(key)
+            if hit:
+                return value
+
+        async def fetch() -> Any:
+            data = await self._request("GET", path, params=params)
+            self.cache.set(key, data, ttl)
+            return data
+
+        return await self._single_flight.do(key, fetch)
 
     async def post(self, path: str, json_data: Optional[Dict[str, Any]] = None) -> Any:
         """POST request with automatic authentication and retry on 401 once."""
         return await self._request("POST", path, json_data=json_data or {})
 
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool occupancy for sizing limits against real Console load.
+
+        ``open``/``idle``/``active``/``waiting`` are read from httpcore's private
+        pool state (tested with httpx 0.27-0.28 on httpcore 1.x). If that layout
+        is missing or changes, they are None and only the configured limits and
+        the client-tracked ``in_flight`` are reported.
+        """
+        occupancy = _pool_occupancy(self._client) or dict.fromkeys(_POOL_OCCUPANCY_FIELDS)
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            **occupancy,
+            "in_flight": self._in_flight,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Client-side instrumentation surfaced by nakama_status."""
+        return {
+            "pool": self.pool_stats(),
+            "singleflight": self._single_flight.stats(),
+            "cache": self.cache.stats(),
+            "auth": self.auth_stats(),
+            "retry": self.retry_budget.stats(),
+            "concurrency": self.limiter.stats(),
+            "breaker": self.breaker.stats(),
+        }
+
     async def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
         await self._client.aclose()
 
 
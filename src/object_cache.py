@@ -0,0 +1,165 @@
+"""Version-aware cache of decoded storage objects.
+
+Every storage row the Console returns, listed or fetched, carries a ``version``
+hash. Listings record the latest version seen per (collection, key, user_id);
+a cached object is served without a GET only while a recent observation still
+shows the version it was cached at. Anything else is a miss and is refetched.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+DEFAULT_OBJECT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_OBJECT_REVALIDATE_SECONDS = 60.0
+DEFAULT_MAX_OBSERVED_VERSIONS = 100_000
+
+ObjectKey = Tuple[str, str, str]
+
+
+@dataclass
+class _CachedObject:
+    version: str
+    payload: bytes
+
+
+def object_key(row: Dict[str, Any]) -> Optional[ObjectKey]:
+    collection, key, user_id = row.get("collection"), row.get("key"), row.get("user_id")
+    if not isinstance(collection, str) or not isinstance(key, str):
+        return None
+    return collection, key, user_id if isinstance(user_id, str) else ""
+
+
+class StorageObjectCache:
+    """Byte-capped LRU of decoded storage objects, revalidated by version.
+
+    ``observe`` records versions from list rows (bounded to ``max_observed``
+    keys, oldest first out). ``get`` hits only when the last listing observation
+    is at most ``revalidate_seconds`` old and matches the cached version. Objects are
+    stored as compact JSON bytes and decoded on every hit, so callers always get
+    a private copy.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = DEFAULT_OBJECT_CACHE_MAX_BYTES,
+        revalidate_seconds: float = DEFAULT_OBJECT_REVALIDATE_SECONDS,
+        max_observed: int = DEFAULT_MAX_OBSERVED_VERSIONS,
+    ):
+        self.max_bytes = max_bytes
+        self.revalidate_seconds = revalidate_seconds
+        self.max_observed = max(1, max_observed)
+        self._objects: "OrderedDict[ObjectKey, _CachedObject]" = OrderedDict()
+        self._observed: "OrderedDict[ObjectKey, Tuple[str, float]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.revalidate_seconds > 0
+
+    def _drop(self, key: ObjectKey) -> None:
+        entry = self._objects.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.payload)
+
+    def _note(self, key: ObjectKey, version: str) -> None:
+        self._observed[key] = (version, time.monotonic())
+        self._observed.move_to_end(key)
+        while len(self._observed) > self.max_observed:
+            self._observed.popitem(last=False)
+
+    def observe(self, rows: Iterable[Any]) -> None:
+        """Record the versions carried by listed storage rows."""
+        if not self.enabled:
+            return
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            key = object_key(row)
+            version = row.get("version")
+            if key is None or not isinstance(version, str) or not version:
+                continue
+            self._note(key, version)
+            cached = self._objects.get(key)
+            if cached is not None and cached.version != version:
+                self._drop(key)
+
+    def get(self, collection: str, key: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Cached object when a recent observation confirms its version, else None."""
+        ident = (collection, key, user_id)
+        entry = self._objects.get(ident)
+        if entry is None:
+            self.misses += 1
+            return None
+        observed = self._observed.get(ident)
+        if (
+            observed is None
+            or observed[0] != entry.version
+            or time.monotonic() - observed[1] > self.revalidate_seconds
+        ):
+            self.stale += 1
+            self.misses += 1
+            return None
+        self._objects.move_to_end(ident)
+        self.hits += 1
+        return json.loads(entry.payload)
+
+    def put(self, obj: Any) -> None:
+        """Cache a fetched object until a listing confirms its version.
+
+        A fetch is not an observation: only listings revalidate, so a write
+        made after the fetch is never hidden for a whole revalidation window.
+        """
+        if not self.enabled or not isinstance(obj, dict):
+            return
+        ident = object_key(obj)
+        version = obj.get("version")
+        if ident is None or not isinstance(version, str) or not version:
+            return
+        try:
+            payload = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+        except (TypeError, ValueError):
+            return
+        self._drop(ident)
+        if len(payload) > self.max_bytes:
+            return
+        self._objects[ident] = _CachedObject(version, payload)
+        self._bytes += len(payload)
+        while self._bytes > self.max_bytes:
+            self._drop(next(iter(self._objects)))
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._objects.clear()
+        self._observed.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "evictions": self.evictions,
+            "entries": len(self._objects),
+            "observed": len(self._observed),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+__all__ = [
+    "DEFAULT_OBJECT_CACHE_MAX_BYTES",
+    "DEFAULT_OBJECT_REVALIDATE_SECONDS",
+    "DEFAULT_MAX_OBSERVED_VERSIONS",
+    "StorageObjectCache",
+    "object_key",
+]
@@ -1,10 +1,23 @@
 """Server-side auto-pagination for Nakama Console list endpoints."""
 
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from src.checkpoints import QueryCheckpoints
+from src.deadline import Deadline, DeadlineExceeded, run_with_deadline
 
 DEFAULT_MAX_OBJECTS = 100
 MAX_OBJECTS_HARD_LIMIT = 1000
+# Fetches in flight per batch call; a batch call takes up to MAX_BULK_OBJECTS ids.
 MAX_BATCH_OBJECTS = 50
+MAX_BULK_OBJECTS = 5000
+# Pages requested ahead of the one being processed; 0 fetches strictly in turn.
+DEFAULT_PREFETCH_PAGES = 1
+MAX_PREFETCH_PAGES = 8
+
+_PAGE = "page"
+_DEADLINE = "deadline"
+_ERROR = "error"
 
 FetchPage = Callable[[Optional[str]], Awaitable[Dict[str, Any]]]
 
@@ -26,9 +39,30 @@ async def fetch_page_once(
     *,
     items_key: str,
     cursor: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+    project: Optional[Callable[[Any], Any]] = None,
+    predicate: Optional[Callable[[Any], bool]] = None,
+    checkpoints: Optional[QueryCheckpoints] = None,
 ) -> Dict[str, Any]:
-    """Fetch a single Nakama list page and expose next_cursor to the client."""
-    page = await fetch_page(cursor)
+    """Fetch a single Nakama list page and expose next_cursor to the client.
+
+    ``predicate`` drops non-matching rows; the envelope then reports ``scanned``.
+    When ``cursor`` is a known checkpoint, next_cursor is checkpointed as well.
+
+    If the deadline expires first, the request is cancelled and an empty,
+    incomplete page is returned whose next_cursor retries the same page.
+    """
+    try:
+        page = await run_with_deadline(deadline, fetch_page(cursor))
+    except DeadlineExceeded:
+        return {
+            items_key: [],
+            "total_count": 0,
+            "fetched": 0,
+            "complete": False,
+            "next_cursor": cursor,
+            "deadline_exceeded": True,
+        }
     if not isinstance(page, dict):
         page = {}
 
@@ -39,14 +73,293 @@ async def fetch_page_once(
     if not isinstance(page_items, list):
         page_items = []
 
+    scanned = len(page_items)
     next_cursor = _normalize_next_cursor(page)
-    return {
+    if checkpoints is not None and next_cursor:
+        base = checkpoints.offset_of(cursor) if cursor else 0
+        if base is not None:
+            checkpoints.record(base + scanned, next_cursor)
+
+    if predicate is not None:
+        page_items = [item for item in page_items if predicate(item)]
+    if project is not None:
+        page_items = [project(item) for item in page_items]
+
+    envelope = {
         items_key: page_items,
         "total_count": total_count,
         "fetched": len(page_items),
         "complete": next_cursor is None,
         "next_cursor": next_cursor,
+        "deadline_exceeded": False,
     }
+    if predicate is not None:
+        envelope["scanned"] = scanned
+    return envelope
+
+
+class PageStream:
+    """Streaming view over Console list pages, bounded by max_objects and a deadline.
+
+    Iterate with ``async for``: ``iter_pages`` yields each page's item list as it
+    arrives, ``iter_items`` yields single items. Once iteration finishes,
+    ``summary()`` carries the same total_count / fetched / complete / next_cursor
+    semantics as ``fetch_pages``.
+
+    With ``prefetch > 0`` a background task requests the next page as soon as
+    its cursor is known, keeping at most ``prefetch`` pages ahead of the one the
+    consumer is processing. Read-ahead stops once the pages received cover
+    max_objects, and is cancelled when iteration ends early.
+
+    A ``predicate`` filters rows client-side as pages arrive; only matching rows
+    count toward max_objects. ``max_scanned`` then caps the raw rows read, checked
+    after each page so next_cursor always resumes on a page boundary.
+
+    ``limit_cap`` bounds max_objects (MAX_OBJECTS_HARD_LIMIT unless a caller that
+    never buffers the items, such as a value scan, raises it).
+
+    ``start_offset`` skips that many raw Console rows. With ``checkpoints`` every
+    next_cursor seen is recorded against its row offset, and a deep start_offset
+    resumes from the nearest recorded cursor instead of the first page.
+    """
+
+    def __init__(
+        self,
+        fetch_page: FetchPage,
+        *,
+        items_key: str,
+        max_objects: int,
+        deadline: Optional[Deadline] = None,
+        per_item: bool = False,
+        prefetch: int = DEFAULT_PREFETCH_PAGES,
+        predicate: Optional[Callable[[Any], bool]] = None,
+        max_scanned: Optional[int] = None,
+        start_offset: int = 0,
+        checkpoints: Optional[QueryCheckpoints] = None,
+        limit_cap: int = MAX_OBJECTS_HARD_LIMIT,
+    ):
+        self._fetch_page = fetch_page
+        self.items_key = items_key
+        self.limit = max(1, min(int(max_objects), limit_cap))
+        self.deadline = deadline
+        self._per_item = per_item
+        self.prefetch = max(0, min(int(prefetch), MAX_PREFETCH_PAGES))
+        self.predicate = predicate
+        self.max_scanned = max_scanned
+        self.start_offset = max(0, int(start_offset))
+        self.checkpoints = checkpoints
+        self.checkpoint_offset = 0
+        self._producer: Optional[asyncio.Task] = None
+        self.pages_requested = 0
+        self.total_count: Optional[int] = None
+        self.fetched = 0
+        self.complete = True
+        self.next_cursor: Optional[str] = None
+        self.deadline_exceeded = False
+        self.scanned = 0
+        self.scan_limit_reached = False
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._items() if self._per_item else self._pages()
+
+    async def _items(self) -> AsyncIterator[Any]:
+        async for page_items in self._pages():
+            for item in page_items:
+                yield item
+
+    def _page_items(self, page: Dict[str, Any]) -> List[Any]:
+        page_items = page.get(self.items_key) or []
+        return page_items if isinstance(page_items, list) else []
+
+    async def _produce(self, queue: asyncio.Queue, slots: asyncio.Semaphore) -> None:
+        """Fetch pages in cursor order, at most ``prefetch`` ahead of the consumer."""
+        cursor: Optional[str] = None
+        offset = 0
+        if self.start_offset and self.checkpoints is not None:
+            offset, cursor = self.checkpoints.nearest(self.start_offset)
+        self.checkpoint_offset = offset
+        matched = 0
+        scanned = 0
+        try:
+            while True:
+                await slots.acquire()
+                self.pages_requested += 1
+                try:
+                    page = await run_with_deadline(self.deadline, self._fetch_page(cursor))
+                except DeadlineExceeded:
+                    queue.put_nowait((_DEADLINE, cursor))
+                    return
+                if not isinstance(page, dict):
+                    page = {}
+                page_items = self._page_items(page)
+                page_start, offset = offset, offset + len(page_items)
+                next_cursor = _normalize_next_cursor(page)
+                if self.checkpoints is not None and next_cursor:
+                    self.checkpoints.record(offset, next_cursor)
+                if page_start < self.start_offset:
+                    page_items = page_items[self.start_offset - page_start :]
+                # Rows before start_offset are skipped unchecked, so they do not
+                # count toward max_scanned.
+                scanned += len(page_items)
+                if self.predicate is not None:
+                    page_items = [item for item in page_items if self.predicate(item)]
+                matched += len(page_items)
+                queue.put_nowait((_PAGE, (page, page_items, scanned)))
+                if matched >= self.limit or not next_cursor or self._scan_capped(scanned):
+                    return
+                cursor = next_cursor
+        except Exception as e:
+            queue.put_nowait((_ERROR, e))
+
+    def _scan_capped(self, scanned: int) -> bool:
+        return self.max_scanned is not None and scanned >= self.max_scanned
+
+    async def _pages(self) -> AsyncIterator[List[Any]]:
+        queue: asyncio.Queue = asyncio.Queue()
+        # One slot for the page being consumed plus ``prefetch`` read-ahead slots.
+        slots = asyncio.Semaphore(self.prefetch + 1)
+        self._producer = asyncio.ensure_future(self._produce(queue, slots))
+        try:
+            while True:
+                kind, payload = await queue.get()
+                if kind is _ERROR:
+                    raise payload
+                if kind is _DEADLINE:
+                    self.deadline_exceeded = True
+                    self.complete = False
+                    self.next_cursor = payload
+                    return
+                page, page_items, self.scanned = payload
+
+                if self.total_count is None:
+                    raw_total = page.get("total_count")
+                    self.total_count = int(raw_total) if raw_total is not None else 0
+
+                remaining = self.limit - self.fetched
+                kept = page_items[:remaining] if len(page_items) > remaining else page_items
+                self.fetched += len(kept)
+                next_cursor = _normalize_next_cursor(page)
+
+                # Settle the summary before yielding so it is final even if the
+                # consumer stops at the last page.
+                done = self.fetched >= self.limit or not next_cursor
+                if self.fetched >= self.limit:
+                    took_partial = len(page_items) > remaining
+                    self.complete = not took_partial and not next_cursor
+                    if not self.complete and next_cursor and not took_partial:
+                        self.next_cursor = next_cursor
+                elif not next_cursor:
+                    self.complete = True
+                elif self._scan_capped(self.scanned):
+                    # Capped on a page boundary, so next_cursor resumes the scan.
+                    done = True
+                    self.scan_limit_reached = True
+                    self.complete = False
+                    self.next_cursor = next_cursor
+
+                if kept:
+                    yield kept
+                if done:
+                    return
+                # The consumer is done with this page; let the producer read ahead.
+                slots.release()
+        finally:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        """Cancel outstanding read-ahead requests."""
+        producer, self._producer = self._producer, None
+        if producer is not None and not producer.done():
+            producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
+
+    def summary(self) -> Dict[str, Any]:
+        summary = {
+            "total_count": self.total_count if self.total_count is not None else 0,
+            "fetched": self.fetched,
+            "complete": self.complete,
+            "next_cursor": self.next_cursor,
+            "deadline_exceeded": self.deadline_exceeded,
+        }
+        if self.predicate is not None:
+            summary["scanned"] = self.scanned
+            summary["scan_limit_reached"] = self.scan_limit_reached
+        if self.start_offset:
+            summary["start_offset"] = self.start_offset
+            summary["checkpoint_offset"] = self.checkpoint_offset
+        return summary
+
+
+def iter_pages(
+    fetch_page: FetchPage,
+    *,
+    items_key: str,
+    max_objects: int,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    predicate: Optional[Callable[[Any], bool]] = None,
+    max_scanned: Optional[int] = None,
+    start_offset: int = 0,
+    checkpoints: Optional[QueryCheckpoints] = None,
+    limit_cap: int = MAX_OBJECTS_HARD_LIMIT,
+) -> PageStream:
+    """Stream page item lists as they arrive (see ``PageStream``)."""
+    return PageStream(
+        fetch_page,
+        items_key=items_key,
+        max_objects=max_objects,
+        deadline=deadline,
+        prefetch=prefetch,
+        predicate=predicate,
+        max_scanned=max_scanned,
+        start_offset=start_offset,
+        checkpoints=checkpoints,
+        limit_cap=limit_cap,
+    )
+
+
+def iter_items(
+    fetch_page: FetchPage,
+    *,
+    items_key: str,
+    max_objects: int,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    predicate: Optional[Callable[[Any], bool]] = None,
+    max_scanned: Optional[int] = None,
+    start_offset: int = 0,
+    checkpoints: Optional[QueryCheckpoints] = None,
+    limit_cap: int = MAX_OBJECTS_HARD_LIMIT,
+) -> PageStream:
+    """Stream individual items as pages arrive (see ``PageStream``)."""
+    return PageStream(
+        fetch_page,
+        items_key=items_key,
+        max_objects=max_objects,
+        deadline=deadline,
+        per_item=True,
+        prefetch=prefetch,
+        predicate=predicate,
+        max_scanned=max_scanned,
+        start_offset=start_offset,
+        checkpoints=checkpoints,
+        limit_cap=limit_cap,
+    )
+
+
+async def collect_items(
+    stream: PageStream,
+    *,
+    project: Optional[Callable[[Any], Any]] = None,
+) -> Dict[str, Any]:
+    """Drain an item stream into a list envelope, shaping each item as it arrives."""
+    items: List[Any] = []
+    async for item in stream:
+        items.append(project(item) if project is not None else item)
+    return {stream.items_key: items, **stream.summary()}
 
 
 async def fetch_pages(
@@ -54,60 +367,47 @@ async def fetch_pages(
     *,
     items_key: str,
     max_objects: int,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    project: Optional[Callable[[Any], Any]] = None,
+    start_offset: int = 0,
+    checkpoints: Optional[QueryCheckpoints] = None,
 ) -> Dict[str, Any]:
-    """Fetch Console list pages until max_objects or exhaustion."""
-    limit = clamp_max_objects(max_objects)
+    """Fetch Console list pages until max_objects, exhaustion or the deadline.
+
+    When the deadline expires the in-flight page request is cancelled and the items
+    gathered so far are returned with complete=False; next_cursor then points at
+    the page that was not fetched (None if the first page never arrived).
+    """
+    stream = iter_pages(
+        fetch_page,
+        items_key=items_key,
+        max_objects=max_objects,
+        deadline=deadline,
+        prefetch=prefetch,
+        start_offset=start_offset,
+        checkpoints=checkpoints,
+    )
     items: List[Any] = []
-    total_count: Optional[int] = None
-    cursor: Optional[str] = None
-    complete = True
-    next_cursor_out: Optional[str] = None
-
-    while True:
-        page = await fetch_page(cursor)
-        if not isinstance(page, dict):
-            page = {}
-
-        if total_count is None:
-            raw_total = page.get("total_count")
-            total_count = int(raw_total) if raw_total is not None else 0
-
-        page_items = page.get(items_key) or []
-        if not isinstance(page_items, list):
-            page_items = []
-
-        remaining = limit - len(items)
-        items.extend(page_items[:remaining])
-
-        next_cursor = _normalize_next_cursor(page)
-
-        if len(items) >= limit:
-            took_partial = len(page_items) > remaining
-            complete = not took_partial and not next_cursor
-            if not complete and next_cursor and not took_partial:
-                next_cursor_out = next_cursor
-            break
-
-        if not next_cursor:
-            complete = True
-            break
-
-        cursor = next_cursor
-
-    return {
-        items_key: items,
-        "total_count": total_count if total_count is not None else 0,
-        "fetched": len(items),
-        "complete": complete,
-        "next_cursor": next_cursor_out,
-    }
+    async for page_items in stream:
+        if project is not None:
+            page_items = [project(item) for item in page_items]
+        items.extend(page_items)
+    return {items_key: items, **stream.summary()}
 
 
 __all__ = [
     "DEFAULT_MAX_OBJECTS",
     "MAX_OBJECTS_HARD_LIMIT",
     "MAX_BATCH_OBJECTS",
+    "MAX_BULK_OBJECTS",
+    "DEFAULT_PREFETCH_PAGES",
+    "MAX_PREFETCH_PAGES",
     "clamp_max_objects",
+    "PageStream",
+    "iter_pages",
+    "iter_items",
+    "collect_items",
     "fetch_page_once",
     "fetch_pages",
 ]
@@ -0,0 +1,225 @@
+"""Client-side row predicates for filters the Nakama Console cannot apply itself.
+
+The Console's storage list only narrows by collection, exact key or trailing-%
+prefix, and user_id. Everything else is evaluated here as each page arrives;
+``ValueMatcher`` does the same for fetched storage values.
+"""
+
+import json
+import re
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional, Pattern
+
+from src.json_paths import parse_path, resolve_path
+
+DEFAULT_MAX_SCANNED = 5000
+MAX_SCANNED_HARD_LIMIT = 50_000
+MAX_KEY_REGEX_CHARS = 200
+MAX_VALUE_REGEX_CHARS = 200
+VALUE_SNIPPET_CHARS = 120
+
+Predicate = Callable[[Any], bool]
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO-8601 / RFC 3339 timestamp; naive values are taken as UTC."""
+    text = value.strip()
+    if text.endswith(("Z", "z")):
+        text = text[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError(
+            f"Invalid timestamp {value!r}; use ISO-8601 such as 2024-05-01T00:00:00Z"
+        ) from None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def compile_key_regex(pattern: str) -> Pattern[str]:
+    if len(pattern) > MAX_KEY_REGEX_CHARS:
+        raise ValueError(f"key_regex must be at most {MAX_KEY_REGEX_CHARS} characters")
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid key_regex: {e}") from None
+
+
+def compile_value_regex(pattern: str, *, ignore_case: bool = False) -> Pattern[str]:
+    if len(pattern) > MAX_VALUE_REGEX_CHARS:
+        raise ValueError(f"regex must be at most {MAX_VALUE_REGEX_CHARS} characters")
+    try:
+        return re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    except re.error as e:
+        raise ValueError(f"Invalid regex: {e}") from None
+
+
+def clamp_max_scanned(max_scanned: int) -> int:
+    return max(1, min(int(max_scanned), MAX_SCANNED_HARD_LIMIT))
+
+
+def _row_time(obj: Dict[str, Any], field: str) -> Optional[datetime]:
+    value = obj.get(field)
+    if not isinstance(value, str):
+        return None
+    try:
+        return parse_timestamp(value)
+    except ValueError:
+        return None
+
+
+class StoragePredicate:
+    """Conjunction of storage metadata conditions; rows lacking a field never match.
+
+    Time bounds are exclusive (``updated_after`` keeps rows strictly after it).
+    Cheap equality and substring checks run before regex and timestamp parsing.
+    """
+
+    def __init__(
+        self,
+        *,
+        updated_after: Optional[str] = None,
+        updated_before: Optional[str] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        permission_read: Optional[int] = None,
+        permission_write: Optional[int] = None,
+        key_contains: Optional[str] = None,
+        key_regex: Optional[str] = None,
+    ):
+        self.permission_read = permission_read
+        self.permission_write = permission_write
+        self.key_contains = key_contains
+        self.key_regex = compile_key_regex(key_regex) if key_regex is not None else None
+        self._time_bounds: List[tuple] = [
+            (field, parse_timestamp(value), after)
+            for field, value, after in (
+                ("update_time", updated_after, True),
+                ("update_time", updated_before, False),
+                ("create_time", created_after, True),
+                ("create_time", created_before, False),
+            )
+            if value is not None
+        ]
+
+    def __call__(self, obj: Any) -> bool:
+        if not isinstance(obj, dict):
+            return False
+        if self.permission_read is not None and obj.get("permission_read") != self.permission_read:
+            return False
+        if self.permission_write is not None and obj.get("permission_write") != self.permission_write:
+            return False
+        if self.key_contains is not None or self.key_regex is not None:
+            key = obj.get("key")
+            if not isinstance(key, str):
+                return False
+            if self.key_contains is not None and self.key_contains not in key:
+                return False
+            if self.key_regex is not None and self.key_regex.search(key) is None:
+                return False
+        parsed: Dict[str, Optional[datetime]] = {}
+        for field, bound, after in self._time_bounds:
+            if field not in parsed:
+                parsed[field] = _row_time(obj, field)
+            row_time = parsed[field]
+            if row_time is None:
+                return False
+            if after and not row_time > bound:
+                return False
+            if not after and not row_time < bound:
+                return False
+        return True
+
+
+def storage_predicate(where: Optional[Mapping[str, Any]]) -> Optional[StoragePredicate]:
+    """Predicate for a list tool's ``where`` argument, or None when it sets nothing."""
+    if not where:
+        return None
+    conditions = {name: value for name, value in where.items() if value is not None}
+    if not conditions:
+        return None
+    return StoragePredicate(**conditions)
+
+
+def _json_equal(left: Any, right: Any) -> bool:
+    # JSON true is not 1: compare booleans only with booleans.
+    if isinstance(left, bool) or isinstance(right, bool):
+        return isinstance(left, bool) and isinstance(right, bool) and left == right
+    return left == right
+
+
+def _snippet(text: str, start: int, end: int) -> str:
+    pad = max(0, (VALUE_SNIPPET_CHARS - (end - start)) // 2)
+    lo, hi = max(0, start - pad), min(len(text), end + pad)
+    return ("…" if lo else "") + text[lo:hi] + ("…" if hi < len(text) else "")
+
+
+class ValueMatcher:
+    """One test against a decoded storage value; ``match`` returns a snippet or None.
+
+    ``contains`` and ``regex`` search the value's compact JSON text; ``path`` with
+    ``equals`` compares one sub-tree (see ``src.json_paths``) for JSON equality.
+    Exactly one of the three must be given.
+    """
+
+    def __init__(
+        self,
+        *,
+        contains: Optional[str] = None,
+        regex: Optional[str] = None,
+        path: Optional[str] = None,
+        equals: Any = None,
+        ignore_case: bool = False,
+    ):
+        if sum(x is not None for x in (contains, regex, path)) != 1:
+            raise ValueError("Set exactly one of contains, regex or path")
+        self.ignore_case = ignore_case
+        self.contains = contains.lower() if contains is not None and ignore_case else contains
+        self.regex = compile_value_regex(regex, ignore_case=ignore_case) if regex else None
+        self.path = parse_path(path) if path is not None else None
+        self.equals = equals
+
+    @property
+    def needs_text(self) -> bool:
+        return self.path is None
+
+    def match(self, value: Any, text: Optional[str] = None) -> Optional[str]:
+        """Snippet around the match, or None; ``text`` is the value's JSON when known."""
+        if self.path is not None:
+            found, sub = resolve_path(value, self.path)
+            if not found or not _json_equal(sub, self.equals):
+                return None
+            text = json.dumps(sub, ensure_ascii=False)
+            return text if len(text) <= VALUE_SNIPPET_CHARS else text[:VALUE_SNIPPET_CHARS] + "…"
+        if text is None:
+            text = value if isinstance(value, str) else json.dumps(
+                value, separators=(",", ":"), ensure_ascii=False
+            )
+        if self.regex is not None:
+            found_match = self.regex.search(text)
+            if found_match is None:
+                return None
+            return _snippet(text, found_match.start(), found_match.end())
+        haystack = text.lower() if self.ignore_case else text
+        start = haystack.find(self.contains)
+        if start < 0:
+            return None
+        return _snippet(text, start, start + len(self.contains))
+
+
+__all__ = [
+    "DEFAULT_MAX_SCANNED",
+    "MAX_SCANNED_HARD_LIMIT",
+    "MAX_KEY_REGEX_CHARS",
+    "MAX_VALUE_REGEX_CHARS",
+    "VALUE_SNIPPET_CHARS",
+    "Predicate",
+    "parse_timestamp",
+    "compile_key_regex",
+    "compile_value_regex",
+    "clamp_max_scanned",
+    "StoragePredicate",
+    "storage_predicate",
+    "ValueMatcher",
+]
@@ -0,0 +1,37 @@
+"""MCP progress notifications for long-running tool calls."""
+
+from typing import Any, Awaitable, Callable, Optional
+
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+
+def progress_reporter(server: Any) -> Optional[ProgressCallback]:
+    """Reporter bound to the current request's progressToken, or None.
+
+    Returns None outside an MCP request or when the client did not ask for
+    progress, so tools can skip reporting entirely.
+    """
+    try:
+        request_context = server.request_context
+    except (AttributeError, LookupError):
+        return None
+    meta = getattr(request_context, "meta", None)
+    token = getattr(meta, "progressToken", None) if meta is not None else None
+    if token is None:
+        return None
+    session = request_context.session
+    request_id = getattr(request_context, "request_id", None)
+
+    async def report(done: int, total: int) -> None:
+        await session.send_progress_notification(
+            token,
+            float(done),
+            total=float(total),
+            message=f"{done}/{total}",
+            related_request_id=request_id,
+        )
+
+    return report
+
+
+__all__ = ["ProgressCallback", "progress_reporter"]
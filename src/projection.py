@@ -0,0 +1,75 @@
+"""Field projections applied to list items as they stream in from the Console."""
+
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+MAX_PROJECTION_FIELDS = 32
+
+# Identity fields every projected row keeps so it stays addressable.
+ACCOUNT_IDENTITY_FIELDS: Tuple[str, ...] = ("id",)
+STORAGE_IDENTITY_FIELDS: Tuple[str, ...] = ("collection", "key", "user_id")
+
+_MISSING = object()
+
+
+def normalize_fields(fields: Optional[Iterable[str]]) -> Optional[List[str]]:
+    """Strip and de-duplicate requested field names; None/empty means all fields."""
+    if fields is None:
+        return None
+    normalized: List[str] = []
+    for name in fields:
+        stripped = name.strip() if isinstance(name, str) else ""
+        if not stripped:
+            raise ValueError("fields entries must be non-empty field names")
+        if stripped not in normalized:
+            normalized.append(stripped)
+    if len(normalized) > MAX_PROJECTION_FIELDS:
+        raise ValueError(f"At most {MAX_PROJECTION_FIELDS} fields may be requested")
+    return normalized or None
+
+
+class Projection:
+    """Keep only the named top-level fields of each dict item.
+
+    ``always`` fields are kept regardless of the request. Missing fields are
+    omitted, or filled with ``default`` when one is given. Non-dict items pass
+    through unchanged.
+    """
+
+    __slots__ = ("fields", "default")
+
+    def __init__(
+        self,
+        fields: Sequence[str],
+        *,
+        always: Sequence[str] = (),
+        default: Any = _MISSING,
+    ):
+        self.fields: Tuple[str, ...] = tuple(dict.fromkeys([*always, *fields]))
+        self.default = default
+
+    def __call__(self, item: Any) -> Any:
+        if not isinstance(item, dict):
+            return item
+        if self.default is _MISSING:
+            return {name: item[name] for name in self.fields if name in item}
+        return {name: item.get(name, self.default) for name in self.fields}
+
+
+def field_projection(
+    fields: Optional[Iterable[str]], *, always: Sequence[str] = ()
+) -> Optional[Projection]:
+    """Projection for a tool's ``fields`` argument, or None to keep whole items."""
+    normalized = normalize_fields(fields)
+    if normalized is None:
+        return None
+    return Projection(normalized, always=always)
+
+
+__all__ = [
+    "MAX_PROJECTION_FIELDS",
+    "ACCOUNT_IDENTITY_FIELDS",
+    "STORAGE_IDENTITY_FIELDS",
+    "normalize_fields",
+    "Projection",
+    "field_projection",
+]
@@ -1,40 +1,49 @@
-"""In-memory MCP resources for large Nakama export payloads."""
+"""In-memory MCP resources for large Nakama payloads (account exports, batch and scan results)."""
 
 from __future__ import annotations
 
 import json
 import time
 import uuid
-from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 
 EXPORT_RESOURCE_SCHEME = "nakama://export"
+BATCH_RESOURCE_SCHEME = "nakama://storage-batch"
+SCAN_RESOURCE_SCHEME = "nakama://storage-scan"
 EXPORT_CACHE_TTL_SECONDS = 15 * 60
 EXPORT_CACHE_MAX_ENTRIES = 10
 
 
-@dataclass
 class CachedExport:
-    account_id: str
-    payload: bytes
-    created_at: float
+    """One cached payload; ``account_id`` is the owning id or a batch/scan label."""
+
+    def __init__(
+        self,
+        account_id: str,
+        payload: bytes,
+        export_id: str,
+        *,
+        scheme: str = EXPORT_RESOURCE_SCHEME,
+        description: str = "Cached Nakama account export JSON",
+        mime_type: str = "application/json",
+    ):
+        self.account_id = account_id
+        self.payload = payload
+        self.created_at = time.time()
+        self.scheme = scheme
+        self.description = description
+        self.mime_type = mime_type
+        self._export_id = export_id
 
     @property
     def uri(self) -> str:
-        return f"{EXPORT_RESOURCE_SCHEME}/{self.account_id}/{self.export_id}"
+        return f"{self.scheme}/{self.account_id}/{self.export_id}"
 
     @property
     def export_id(self) -> str:
-        # last path segment from uri construction helper
         return self._export_id
 
-    def __init__(self, account_id: str, payload: bytes, export_id: str):
-        self.account_id = account_id
-        self.payload = payload
-        self.created_at = time.time()
-        self._export_id = export_id
-
 
 class ExportCache:
     """TTL-bound cache of account export JSON blobs addressable as MCP resources."""
@@ -59,15 +68,40 @@ class ExportCache:
         for uri in expired:
             del self._entries[uri]
 
-    def store(self, account_id: str, data: Dict[str, Any]) -> str:
+    def store(
+        self,
+        account_id: str,
+        data: Any,
+        *,
+        scheme: str = EXPORT_RESOURCE_SCHEME,
+        description: str = "Cached Nakama account export JSON",
+    ) -> str:
+        payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        return self.store_payload(account_id, payload, scheme=scheme, description=description)
+
+    def store_payload(
+        self,
+        account_id: str,
+        payload: bytes,
+        *,
+        scheme: str = EXPORT_RESOURCE_SCHEME,
+        description: str = "Cached Nakama account export JSON",
+        mime_type: str = "application/json",
+    ) -> str:
+        """Cache already-encoded bytes (e.g. NDJSON) and return the resource URI."""
         self._purge_expired()
         while len(self._entries) >= self.max_entries:
             oldest_uri = min(self._entries, key=lambda u: self._entries[u].created_at)
             del self._entries[oldest_uri]
 
-        export_id = uuid.uuid4().hex
-        payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-        entry = CachedExport(account_id, payload, export_id)
+        entry = CachedExport(
+            account_id,
+            payload,
+            uuid.uuid4().hex,
+            scheme=scheme,
+            description=description,
+            mime_type=mime_type,
+        )
         self._entries[entry.uri] = entry
         return entry.uri
 
@@ -79,33 +113,48 @@ class ExportCache:
         self._purge_expired()
         return list(self._entries.keys())
 
+    def list_entries(self) -> List[CachedExport]:
+        self._purge_expired()
+        return list(self._entries.values())
+
 
 def register_resources(server, cache: ExportCache) -> None:
-    """Register MCP resource handlers for cached account exports."""
+    """Register MCP resource handlers for cached exports and batch/scan results."""
     import mcp
+    from mcp.server.lowlevel.helper_types import ReadResourceContents
 
     @server.list_resources()
     async def _list_resources() -> list[mcp.types.Resource]:
         return [
             mcp.types.Resource(
-                uri=uri,
-                name=f"Nakama account export ({uri.rsplit('/', 1)[-1][:8]})",
-                description="Cached Nakama account export JSON",
-                mimeType="application/json",
+                uri=entry.uri,
+                name=(
+                    f"Nakama account export ({entry.export_id[:8]})"
+                    if entry.scheme == EXPORT_RESOURCE_SCHEME
+                    else f"Nakama {entry.account_id} ({entry.export_id[:8]})"
+                ),
+                description=entry.description,
+                mimeType=entry.mime_type,
             )
-            for uri in cache.list_uris()
+            for entry in cache.list_entries()
         ]
 
     @server.read_resource()
     async def _read_resource(uri: str):
         entry = cache.get(uri)
         if entry is None:
-            raise ValueError(f"Unknown or expired export resource: {uri}")
-        return entry.payload.decode("utf-8")
+            raise ValueError(f"Unknown or expired resource: {uri}")
+        return [
+            ReadResourceContents(
+                content=entry.payload.decode("utf-8"), mime_type=entry.mime_type
+            )
+        ]
 
 
 __all__ = [
     "EXPORT_RESOURCE_SCHEME",
+    "BATCH_RESOURCE_SCHEME",
+    "SCAN_RESOURCE_SCHEME",
     "EXPORT_CACHE_TTL_SECONDS",
     "EXPORT_CACHE_MAX_ENTRIES",
     "CachedExport",
@@ -0,0 +1,116 @@
+"""TTL + LRU cache of Console GET responses with per-endpoint policies."""
+
+from __future__ import annotations
+
+import json
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Pattern, Tuple
+
+DEFAULT_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+# First matching pattern wins; unmatched paths are not cached.
+# Storage object GETs stay at 0s: the Console GET has no version parameter, so a
+# cached value could silently be stale. ``src.object_cache`` reuses them only
+# while a recent listing confirms the version.
+DEFAULT_TTL_POLICIES: List[Tuple[str, float]] = [
+    (r"^/v2/console/storage/collections$", 60.0),
+    (r"^/v2/console/status$", 5.0),
+    (r"^/v2/console/account/[^/]+$", 30.0),
+    (r"^/v2/console/account/[^/]+/friend$", 30.0),
+    (r"^/v2/console/account/[^/]+/group$", 30.0),
+    (r"^/v2/console/storage/[^/]+/[^/]+/[^/]+$", 0.0),
+]
+
+
+@dataclass
+class _Entry:
+    payload: bytes
+    expires_at: float
+
+
+class ResponseCache:
+    """Byte-capped LRU of JSON responses; entries expire per endpoint TTL.
+
+    Values are stored as compact JSON bytes and decoded on every hit, so callers
+    always get a private copy they may mutate.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        policies: Optional[List[Tuple[str, float]]] = None,
+    ):
+        self.max_bytes = max_bytes
+        self._policies: List[Tuple[Pattern[str], float]] = [
+            (re.compile(pattern), ttl)
+            for pattern, ttl in (DEFAULT_TTL_POLICIES if policies is None else policies)
+        ]
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, path: str) -> float:
+        for pattern, ttl in self._policies:
+            if pattern.match(path):
+                return ttl
+        return 0.0
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.payload)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (hit, value); expired entries count as misses."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        if entry.expires_at <= time.monotonic():
+            self._drop(key)
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, json.loads(entry.payload)
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        if ttl <= 0 or self.max_bytes <= 0:
+            return
+        try:
+            payload = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        except (TypeError, ValueError):
+            return
+        if len(payload) > self.max_bytes:
+            return
+
+        self._drop(key)
+        self._entries[key] = _Entry(payload, time.monotonic() + ttl)
+        self._bytes += len(payload)
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+__all__ = ["DEFAULT_CACHE_MAX_BYTES", "DEFAULT_TTL_POLICIES", "ResponseCache"]
@@ -1,7 +1,9 @@
 """Response shaping helpers for MCP tool outputs."""
 
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Sequence
+
+from src.json_paths import select_paths
 
 DEFAULT_VALUE_PREVIEW_CHARS = 2000
 MAX_VALUE_PREVIEW_CHARS = 10000
@@ -22,8 +24,13 @@ def format_storage_object(
     *,
     include_value: bool = True,
     max_value_chars: int = DEFAULT_VALUE_PREVIEW_CHARS,
+    value_paths: Optional[Sequence[str]] = None,
 ) -> Any:
-    """Shape a storage object for MCP output with optional value omission/truncation."""
+    """Shape a storage object for MCP output with optional value omission/truncation.
+
+    With ``value_paths`` the value is replaced by ``value_paths`` (path → sub-tree)
+    and ``missing_paths``; the selection is truncated like a whole value would be.
+    """
     if not isinstance(obj, dict):
         return obj
 
@@ -35,11 +42,18 @@ def format_storage_object(
     if "value" not in result:
         return result
 
-    text, byte_len = _value_as_text(result["value"])
+    key = "value"
+    if value_paths:
+        selected, missing = select_paths(result.pop("value"), value_paths)
+        result["value_paths"] = selected
+        result["missing_paths"] = missing
+        key = "value_paths"
+
+    text, byte_len = _value_as_text(result[key])
     if len(text) <= max_value_chars:
         return result
 
-    result.pop("value", None)
+    result.pop(key, None)
     result["value_preview"] = text[:max_value_chars]
     result["value_truncated"] = True
     result["value_bytes"] = byte_len
@@ -0,0 +1,193 @@
+"""Bounded, TTL'd cache of aggregated list results addressable by handle.
+
+Auto-paginated list tools store what they collected here so follow-up reads
+(offset/limit windows, re-sorts, narrower projections) are served locally instead
+of replaying the Console pagination from the first cursor.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+DEFAULT_RESULT_SET_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_RESULT_SET_TTL_SECONDS = 10 * 60
+DEFAULT_RESULT_SET_MAX_ENTRIES = 64
+RESULT_SET_READ_MAX_LIMIT = 1000
+
+
+@dataclass
+class ResultSet:
+    """One stored aggregation: rows as compact JSON plus the source envelope's meta."""
+
+    handle: str
+    source: str
+    items_key: str
+    payload: bytes
+    count: int
+    meta: Dict[str, Any] = field(default_factory=dict)
+    expires_at: float = 0.0
+
+    def items(self) -> List[Any]:
+        """Decode a private copy of the rows."""
+        return json.loads(self.payload)
+
+
+class ResultSetCache:
+    """Byte-capped LRU of result sets; entries also expire after ``ttl_seconds``.
+
+    Rows are stored as JSON bytes (as in ``ResponseCache``) so readers can sort
+    and project their copy freely. A set larger than ``max_bytes`` is not stored.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = DEFAULT_RESULT_SET_MAX_BYTES,
+        ttl_seconds: float = DEFAULT_RESULT_SET_TTL_SECONDS,
+        max_entries: int = DEFAULT_RESULT_SET_MAX_ENTRIES,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, ResultSet]" = OrderedDict()
+        self._bytes = 0
+        self.stores = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _drop(self, handle: str) -> None:
+        entry = self._entries.pop(handle, None)
+        if entry is not None:
+            self._bytes -= len(entry.payload)
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        for handle in [h for h, e in self._entries.items() if e.expires_at <= now]:
+            self._drop(handle)
+
+    def store(
+        self,
+        source: str,
+        items_key: str,
+        items: Sequence[Any],
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        """Keep ``items`` and return a handle, or None when caching is off or too big."""
+        if self.max_bytes <= 0 or self.ttl_seconds <= 0:
+            return None
+        try:
+            payload = json.dumps(list(items), separators=(",", ":")).encode("utf-8")
+        except (TypeError, ValueError):
+            return None
+        if len(payload) > self.max_bytes:
+            return None
+
+        self._purge_expired()
+        handle = f"rs_{uuid.uuid4().hex[:16]}"
+        self._entries[handle] = ResultSet(
+            handle=handle,
+            source=source,
+            items_key=items_key,
+            payload=payload,
+            count=len(items),
+            meta=dict(meta or {}),
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._bytes += len(payload)
+        self.stores += 1
+        while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+        return handle
+
+    def get(self, handle: str) -> Optional[ResultSet]:
+        entry = self._entries.get(handle)
+        if entry is None or entry.expires_at <= time.monotonic():
+            self._drop(handle)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(handle)
+        self.hits += 1
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "stores": self.stores,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def remember_result_set(
+    result_sets: Optional[ResultSetCache],
+    envelope: Dict[str, Any],
+    *,
+    source: str,
+    items_key: str,
+) -> Dict[str, Any]:
+    """Store an aggregated envelope's rows and set ``result_handle`` on it."""
+    items = envelope.get(items_key) or []
+    if result_sets is None or not items:
+        return envelope
+    meta = {
+        name: envelope[name]
+        for name in ("total_count", "complete", "next_cursor", "deadline_exceeded", "scanned")
+        if name in envelope
+    }
+    handle = result_sets.store(source, items_key, items, meta)
+    if handle is not None:
+        envelope["result_handle"] = handle
+    return envelope
+
+
+def _sort_key(field_name: str):
+    # Rows missing the field sort last; mixed value types sort by type name first
+    # so the comparison never raises.
+    def key(item: Any):
+        value = item.get(field_name) if isinstance(item, dict) else None
+        if value is None:
+            return (1, "", "")
+        if isinstance(value, bool):
+            return (0, "bool", value)
+        if isinstance(value, (int, float)):
+            return (0, "number", value)
+        if isinstance(value, str):
+            return (0, "str", value)
+        return (0, type(value).__name__, json.dumps(value, sort_keys=True))
+
+    return key
+
+
+def sort_rows(items: List[Any], sort_by: str, *, descending: bool = False) -> List[Any]:
+    """Stable sort on a top-level field; rows without it stay last either way."""
+    key = _sort_key(sort_by)
+    present = [item for item in items if key(item)[0] == 0]
+    missing = [item for item in items if key(item)[0] == 1]
+    present.sort(key=key, reverse=descending)
+    return present + missing
+
+
+__all__ = [
+    "DEFAULT_RESULT_SET_MAX_BYTES",
+    "DEFAULT_RESULT_SET_TTL_SECONDS",
+    "DEFAULT_RESULT_SET_MAX_ENTRIES",
+    "RESULT_SET_READ_MAX_LIMIT",
+    "ResultSet",
+    "ResultSetCache",
+    "remember_result_set",
+    "sort_rows",
+]
@@ -0,0 +1,97 @@
+"""Retry policy for transient Console failures on idempotent requests."""
+
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import httpx
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+RETRYABLE_EXCEPTIONS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadTimeout,
+    httpx.PoolTimeout,
+    httpx.RemoteProtocolError,
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Capped exponential backoff with full jitter.
+
+    ``max_attempts`` counts the first try, so 3 means up to two retries.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+
+    def backoff(self, retry_number: int) -> float:
+        """Delay before retry ``retry_number`` (0-based)."""
+        ceiling = min(self.max_delay, self.base_delay * (2**retry_number))
+        return random.uniform(0, ceiling)
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header given as delta-seconds or an HTTP date."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+class RetryBudget:
+    """Token bucket capping retries to a fraction of recent requests.
+
+    Every request deposits ``ratio`` tokens (up to ``max_tokens``) and every retry
+    spends one, so during an outage retries add at most ``ratio`` extra load
+    instead of multiplying it by ``max_attempts``.
+    """
+
+    def __init__(self, *, ratio: float = 0.1, min_tokens: float = 10.0, max_tokens: float = 100.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = min_tokens
+        self.retries = 0
+        self.exhausted = 0
+
+    def record_request(self) -> None:
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            self.retries += 1
+            return True
+        self.exhausted += 1
+        return False
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "retries": self.retries,
+            "budget_exhausted": self.exhausted,
+            "budget_tokens": round(self._tokens, 2),
+        }
+
+
+__all__ = [
+    "RETRYABLE_STATUS_CODES",
+    "RETRYABLE_EXCEPTIONS",
+    "RetryPolicy",
+    "RetryBudget",
+    "retry_after_seconds",
+]
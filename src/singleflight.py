@@ -0,0 +1,70 @@
+"""Coalesce concurrent identical async calls into one in-flight task."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+
+def request_key(path: str, params: Optional[Mapping[str, Any]] = None) -> Tuple[Any, ...]:
+    """Normalize path + query params into a hashable key (param order ignored)."""
+    items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return (path, items)
+
+
+class _Call:
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+        self.joined = 0
+
+
+class SingleFlight:
+    """Share one in-flight awaitable between callers that ask for the same key.
+
+    Results are shared only while the call is in flight; once it finishes the key is
+    forgotten. When followers joined a call, each caller gets its own deep copy so
+    in-place shaping by one tool never leaks into another. If every waiter is
+    cancelled the underlying task is cancelled too.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            self.misses += 1
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _task: self._forget(key, call))
+        else:
+            self.hits += 1
+            call.joined += 1
+
+        call.waiters += 1
+        try:
+            result = await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+        if call.joined:
+            return copy.deepcopy(result)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "in_flight": len(self._calls)}
+
+
+__all__ = ["SingleFlight", "request_key"]
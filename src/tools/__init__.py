@@ -5,9 +5,15 @@ from typing import Any, Dict
 from mcp.types import ToolAnnotations
 from pydantic import ValidationError
 
+from src.checkpoints import CursorCheckpoints
 from src.config import NakamaSettings
+from src.key_index import KeyIndexCache
+from src.metadata_index import StorageMetadataIndex
 from src.nakama_client import NakamaConsoleClient
+from src.object_cache import StorageObjectCache
+from src.progress import progress_reporter
 from src.resources import ExportCache
+from src.result_sets import ResultSetCache
 from src.tool_result import ToolResult, tool_result_to_json
 from src.tools.registry import TOOL_SPECS, TOOL_MAP, ToolContext
 
@@ -43,7 +49,31 @@ def register_all_tools(
     """Register all tools with the provided MCP server."""
     import mcp
 
-    ctx = ToolContext(client=client, settings=settings, export_cache=export_cache)
+    ctx = ToolContext(
+        client=client,
+        settings=settings,
+        export_cache=export_cache,
+        result_sets=ResultSetCache(
+            max_bytes=settings.nakama_result_set_max_bytes,
+            ttl_seconds=settings.nakama_result_set_ttl_seconds,
+        ),
+        checkpoints=CursorCheckpoints(
+            ttl_seconds=settings.nakama_checkpoint_ttl_seconds,
+        ),
+        object_cache=StorageObjectCache(
+            max_bytes=settings.nakama_object_cache_max_bytes,
+            revalidate_seconds=settings.nakama_object_revalidate_seconds,
+        ),
+        key_index=KeyIndexCache(
+            ttl_seconds=settings.nakama_key_index_ttl_seconds,
+            max_total_rows=settings.nakama_key_index_max_total_rows,
+        ),
+        metadata_index=(
+            StorageMetadataIndex(settings.nakama_metadata_index_path)
+            if settings.nakama_metadata_index_path
+            else None
+        ),
+    )
 
     tools = [
         mcp.Tool(
@@ -76,6 +106,8 @@ def register_all_tools(
         else:
             kwargs = {}
 
+        if spec.reports_progress:
+            kwargs["progress"] = progress_reporter(server)
         result = await spec.handler(ctx, **kwargs)
         return _normalize_result(result)
 
@@ -1,19 +1,25 @@
 import json
-from typing import Any, Dict, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from mcp.types import ResourceLink, TextContent
 
 from src.envelopes import dump_envelope
-from src.hints import append_hint, build_list_hint
+from src.checkpoints import CursorCheckpoints, query_checkpoints
+from src.deadline import Deadline
+from src.hints import DEADLINE_HINT, append_hint, build_list_hint
 from src.models import ListAccountsEnvelope, ListWalletLedgerEnvelope
 from src.nakama_client import NakamaConsoleClient
 from src.pagination import (
     DEFAULT_MAX_OBJECTS,
+    DEFAULT_PREFETCH_PAGES,
     clamp_max_objects,
+    collect_items,
     fetch_page_once,
-    fetch_pages,
+    iter_items,
 )
+from src.projection import ACCOUNT_IDENTITY_FIELDS, field_projection
 from src.resources import ExportCache
+from src.result_sets import ResultSetCache, remember_result_set
 from src.response_format import (
     EXPORT_INLINE_MAX_BYTES,
     build_export_summary,
@@ -31,24 +37,55 @@ async def nakama_list_accounts(
     tombstones: Optional[bool] = None,
     cursor: Optional[str] = None,
     max_objects: int = DEFAULT_MAX_OBJECTS,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    fields: Optional[List[str]] = None,
+    result_sets: Optional[ResultSetCache] = None,
+    start_offset: int = 0,
+    checkpoints: Optional[CursorCheckpoints] = None,
 ):
-    """List accounts; auto-paginates up to max_objects unless cursor is provided."""
+    """List accounts; auto-paginates up to max_objects unless cursor is provided.
+
+    ``fields`` trims each user to the named fields (plus ``id``) as pages arrive.
+    """
+    project = field_projection(fields, always=ACCOUNT_IDENTITY_FIELDS)
+
+    path = "/v2/console/account"
+    params: Dict[str, Any] = {}
+    if filter is not None:
+        params["filter"] = filter
+    if tombstones is not None:
+        params["tombstones"] = str(tombstones).lower()
+    query = query_checkpoints(checkpoints, path, params)
 
     async def fetch_page(page_cursor: Optional[str]):
-        params = {}
-        if filter is not None:
-            params["filter"] = filter
-        if tombstones is not None:
-            params["tombstones"] = str(tombstones).lower()
-        if page_cursor is not None:
-            params["cursor"] = page_cursor
-        return await client.get("/v2/console/account", params=params)
+        page_params = params if page_cursor is None else {**params, "cursor": page_cursor}
+        return await client.get(path, params=page_params)
 
     if cursor is not None:
-        envelope = await fetch_page_once(fetch_page, items_key="users", cursor=cursor)
+        envelope = await fetch_page_once(
+            fetch_page,
+            items_key="users",
+            cursor=cursor,
+            deadline=deadline,
+            project=project,
+            checkpoints=query,
+        )
     else:
-        envelope = await fetch_pages(
-            fetch_page, items_key="users", max_objects=max_objects
+        envelope = await collect_items(
+            iter_items(
+                fetch_page,
+                items_key="users",
+                max_objects=max_objects,
+                deadline=deadline,
+                prefetch=prefetch,
+                start_offset=start_offset,
+                checkpoints=query,
+            ),
+            project=project,
+        )
+        remember_result_set(
+            result_sets, envelope, source="nakama_list_accounts", items_key="users"
         )
 
     envelope["hint"] = build_list_hint(
@@ -58,6 +95,7 @@ async def nakama_list_accounts(
         filters={"filter": filter},
         list_kind="accounts",
         next_cursor=envelope.get("next_cursor"),
+        deadline_exceeded=envelope.get("deadline_exceeded", False),
     )
     return dump_envelope(ListAccountsEnvelope, envelope)
 
@@ -74,25 +112,49 @@ async def nakama_list_wallet_ledger(
     max_objects: int = DEFAULT_MAX_OBJECTS,
     after: Optional[str] = None,
     before: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    result_sets: Optional[ResultSetCache] = None,
+    start_offset: int = 0,
+    checkpoints: Optional[CursorCheckpoints] = None,
 ):
     """List wallet ledger entries; auto-paginates unless cursor is provided."""
     page_limit = min(_WALLET_LEDGER_PAGE_MAX, clamp_max_objects(max_objects))
 
+    path = f"/v2/console/account/{id}/wallet"
+    params: Dict[str, Any] = {"limit": page_limit}
+    if after is not None:
+        params["after"] = after
+    if before is not None:
+        params["before"] = before
+    query = query_checkpoints(checkpoints, path, params)
+
     async def fetch_page(page_cursor: Optional[str]):
-        params: Dict[str, Any] = {"limit": page_limit}
-        if page_cursor is not None:
-            params["cursor"] = page_cursor
-        if after is not None:
-            params["after"] = after
-        if before is not None:
-            params["before"] = before
-        return await client.get(f"/v2/console/account/{id}/wallet", params=params)
+        page_params = params if page_cursor is None else {**params, "cursor": page_cursor}
+        return await client.get(path, params=page_params)
 
     if cursor is not None:
-        envelope = await fetch_page_once(fetch_page, items_key="items", cursor=cursor)
+        envelope = await fetch_page_once(
+            fetch_page,
+            items_key="items",
+            cursor=cursor,
+            deadline=deadline,
+            checkpoints=query,
+        )
     else:
-        envelope = await fetch_pages(
-            fetch_page, items_key="items", max_objects=max_objects
+        envelope = await collect_items(
+            iter_items(
+                fetch_page,
+                items_key="items",
+                max_objects=max_objects,
+                deadline=deadline,
+                prefetch=prefetch,
+                start_offset=start_offset,
+                checkpoints=query,
+            )
+        )
+        remember_result_set(
+            result_sets, envelope, source="nakama_list_wallet_ledger", items_key="items"
         )
 
     hint = None
@@ -101,6 +163,8 @@ async def nakama_list_wallet_ledger(
             "Use nakama_get_account for current wallet balances. "
             "Prefer nakama_export_account only when a full account dump is required."
         )
+    if envelope.get("deadline_exceeded"):
+        hint = append_hint(DEADLINE_HINT, hint)
     if envelope.get("next_cursor"):
         hint = append_hint(hint, "Pass next_cursor to fetch the next page.")
     envelope["hint"] = hint
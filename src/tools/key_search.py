@@ -0,0 +1,188 @@
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from mcp.types import TextContent
+
+from src.checkpoints import CursorCheckpoints
+from src.deadline import Deadline
+from src.envelopes import dump_envelope
+from src.hints import DEADLINE_HINT, append_hint
+from src.key_index import MAX_KEY_INDEX_ROWS_PER_COLLECTION, KeyIndexCache, KeyIndexEntry
+from src.models import FindStorageKeysEnvelope
+from src.nakama_client import NakamaConsoleClient
+from src.object_cache import StorageObjectCache
+from src.pagination import DEFAULT_MAX_OBJECTS, DEFAULT_PREFETCH_PAGES, iter_pages
+from src.resources import ExportCache
+from src.response_format import DEFAULT_VALUE_PREVIEW_CHARS
+from src.tool_result import ToolResult
+from src.tools.storage import _storage_pages, nakama_get_storage_objects
+
+
+async def _build_key_index(
+    client: NakamaConsoleClient,
+    entry: KeyIndexEntry,
+    *,
+    deadline: Optional[Deadline],
+    prefetch: int,
+    checkpoints: Optional[CursorCheckpoints],
+    object_cache: Optional[StorageObjectCache],
+) -> None:
+    """List keys into ``entry`` from where its build stopped, then publish a snapshot."""
+    fetch_page, query = _storage_pages(
+        client,
+        collection=entry.collection,
+        key=None,
+        user_id=None,
+        checkpoints=checkpoints,
+        object_cache=object_cache,
+    )
+    pages = iter_pages(
+        fetch_page,
+        items_key="objects",
+        max_objects=MAX_KEY_INDEX_ROWS_PER_COLLECTION - entry.next_offset,
+        deadline=deadline,
+        prefetch=prefetch,
+        start_offset=entry.next_offset,
+        checkpoints=query,
+        limit_cap=MAX_KEY_INDEX_ROWS_PER_COLLECTION,
+    )
+    try:
+        async for page_rows in pages:
+            entry.next_offset += len(page_rows)
+            entry.add(page_rows)
+    except BaseException:
+        entry.freeze(complete=False)
+        raise
+    finally:
+        await pages.aclose()
+    entry.truncated = (
+        entry.next_offset >= MAX_KEY_INDEX_ROWS_PER_COLLECTION and not pages.complete
+    )
+    entry.freeze(
+        complete=entry.truncated or (pages.complete and not pages.deadline_exceeded)
+    )
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+async def nakama_find_storage_keys(
+    client: NakamaConsoleClient,
+    key_index: KeyIndexCache,
+    collection: str,
+    prefixes: Optional[List[str]] = None,
+    contains: Optional[str] = None,
+    glob: Optional[str] = None,
+    user_id: Optional[str] = None,
+    limit: int = DEFAULT_MAX_OBJECTS,
+    offset: int = 0,
+    refresh: bool = False,
+    fetch_objects: bool = False,
+    include_value: bool = True,
+    max_value_chars: int = DEFAULT_VALUE_PREVIEW_CHARS,
+    value_paths: Optional[List[str]] = None,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    checkpoints: Optional[CursorCheckpoints] = None,
+    object_cache: Optional[StorageObjectCache] = None,
+    export_cache: Optional[ExportCache] = None,
+) -> Dict[str, Any] | ToolResult:
+    """Match keys of a collection against prefixes, a substring or a glob locally.
+
+    The collection's key index (``src.key_index``) is built on first use and
+    rebuilt after its TTL; queries in between never call the Console. With
+    ``fetch_objects`` the matching window is passed to
+    ``nakama_get_storage_objects`` and its envelope returned under ``batch``.
+    """
+    entry, started = key_index.get(collection, refresh=refresh)
+    built = False
+    if not entry.complete:
+        await key_index.flight.do(
+            ("key_index", collection, id(entry)),
+            lambda: _build_key_index(
+                client,
+                entry,
+                deadline=deadline,
+                prefetch=prefetch,
+                checkpoints=checkpoints,
+                object_cache=object_cache,
+            ),
+        )
+        key_index.settle(entry)
+        built = True
+
+    matches = entry.snapshot.match(
+        prefixes=prefixes, contains=contains, glob=glob, user_id=user_id
+    )
+    window: List[Dict[str, str]] = []
+    matched = 0
+    for key, owner in matches:
+        if offset <= matched < offset + limit:
+            window.append({"key": key, "user_id": owner})
+        matched += 1
+    next_offset = offset + len(window) if offset + len(window) < matched else None
+
+    envelope: Dict[str, Any] = {
+        "collection": collection,
+        "keys": window,
+        "returned": len(window),
+        "matched": matched,
+        "offset": offset,
+        "next_offset": next_offset,
+        "index_rows": entry.snapshot.rows,
+        "index_distinct_keys": len(entry.snapshot.keys),
+        "index_complete": entry.complete and not entry.truncated,
+        "index_built_at": _iso(entry.started_at),
+        "index_age_seconds": round(time.time() - entry.started_at, 1),
+        "index_refreshed": started or built,
+    }
+
+    hint = None
+    if not envelope["index_complete"]:
+        if entry.truncated:
+            hint = (
+                f"Key index stops at {MAX_KEY_INDEX_ROWS_PER_COLLECTION} rows per collection; "
+                "matches beyond it are missing."
+            )
+        else:
+            hint = append_hint(
+                DEADLINE_HINT,
+                "Key index is still building; call again to continue and see every match.",
+            )
+    if next_offset is not None:
+        hint = append_hint(hint, "Pass offset=next_offset for the next window.")
+
+    content = None
+    if fetch_objects and window:
+        batch = await nakama_get_storage_objects(
+            client,
+            objects=[{"collection": collection, **ident} for ident in window],
+            include_value=include_value,
+            max_value_chars=max_value_chars,
+            deadline=deadline,
+            value_paths=value_paths,
+            export_cache=export_cache,
+            object_cache=object_cache,
+        )
+        if isinstance(batch, ToolResult):
+            content = [c for c in batch.content or [] if c.type == "resource_link"]
+            batch = batch.structured
+        envelope["batch"] = batch
+    elif window:
+        hint = append_hint(
+            hint, "Pass fetch_objects=true (or the keys to nakama_get_storage_objects) for values."
+        )
+    envelope["hint"] = hint
+    result = dump_envelope(FindStorageKeysEnvelope, envelope)
+    if content:
+        return ToolResult(
+            structured=result,
+            content=[TextContent(type="text", text=json.dumps(result, indent=2)), *content],
+        )
+    return result
+
+
+__all__ = ["nakama_find_storage_keys"]
@@ -2,17 +2,23 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Awaitable, Callable, Dict, Optional, Type
 
 from pydantic import BaseModel
 
+from src.checkpoints import CursorCheckpoints
 from src.config import NakamaSettings
+from src.deadline import Deadline
 from src.models import (
     AccountEnvelope,
+    AggregateStorageArgs,
+    AggregateStorageEnvelope,
     CollectionsEnvelope,
     ExportAccountArgs,
     ExportAccountEnvelope,
+    FindStorageKeysArgs,
+    FindStorageKeysEnvelope,
     FriendsEnvelope,
     GetAccountArgs,
     GetStorageObjectArgs,
@@ -27,15 +33,40 @@ from src.models import (
     ListUserStorageArgs,
     ListWalletLedgerArgs,
     ListWalletLedgerEnvelope,
+    QueryStorageIndexArgs,
+    QueryStorageIndexEnvelope,
+    ReadResultSetArgs,
+    ReadResultSetEnvelope,
+    ScanCollectionArgs,
+    ScanCollectionEnvelope,
+    SearchStorageValuesArgs,
+    SearchStorageValuesEnvelope,
     StatusEnvelope,
+    StorageExistsArgs,
+    StorageExistsEnvelope,
     StorageObjectEnvelope,
+    SyncStorageIndexArgs,
+    SyncStorageIndexEnvelope,
     UserGroupsEnvelope,
 )
+from src.key_index import KeyIndexCache
+from src.metadata_index import StorageMetadataIndex
 from src.nakama_client import NakamaConsoleClient
-from src.pagination import DEFAULT_MAX_OBJECTS, MAX_BATCH_OBJECTS
+from src.object_cache import StorageObjectCache
+from src.pagination import DEFAULT_MAX_OBJECTS, MAX_BATCH_OBJECTS, MAX_BULK_OBJECTS
 from src.resources import ExportCache
+from src.result_sets import ResultSetCache
 from src.tool_result import ToolResult
-from src.tools import accounts, status, storage
+from src.tools import (
+    accounts,
+    key_search,
+    results,
+    scan,
+    status,
+    storage,
+    storage_exists,
+    storage_index,
+)
 
 Handler = Callable[..., Awaitable[ToolResult | dict[str, Any]]]
 
@@ -45,6 +76,11 @@ class ToolContext:
     client: NakamaConsoleClient
     settings: NakamaSettings
     export_cache: ExportCache
+    result_sets: ResultSetCache = field(default_factory=ResultSetCache)
+    checkpoints: CursorCheckpoints = field(default_factory=CursorCheckpoints)
+    object_cache: StorageObjectCache = field(default_factory=StorageObjectCache)
+    key_index: KeyIndexCache = field(default_factory=KeyIndexCache)
+    metadata_index: Optional[StorageMetadataIndex] = None
 
 
 @dataclass(frozen=True)
@@ -55,6 +91,8 @@ class ToolSpec:
     args_model: Optional[Type[BaseModel]]
     output_model: Type[BaseModel]
     handler: Handler
+    # Handler accepts progress= (see src.progress) for MCP progress notifications.
+    reports_progress: bool = False
 
     def input_schema(self) -> Dict[str, Any]:
         if self.args_model is None:
@@ -65,13 +103,30 @@ class ToolSpec:
         return self.output_model.model_json_schema()
 
 
+def _deadline(ctx: ToolContext) -> Deadline:
+    """Fresh time budget for one tool call."""
+    return Deadline(ctx.settings.nakama_tool_deadline_seconds)
+
+
+def _paging(ctx: ToolContext) -> Dict[str, Any]:
+    """Deadline, read-ahead depth and shared caches for one list call."""
+    return {
+        "deadline": _deadline(ctx),
+        "prefetch": ctx.settings.nakama_prefetch_pages,
+        "result_sets": ctx.result_sets,
+        "checkpoints": ctx.checkpoints,
+    }
+
+
 async def _status(ctx: ToolContext, **_: Any) -> ToolResult:
     return ToolResult(structured=await status.nakama_status(ctx.client, ctx.settings))
 
 
 async def _list_accounts(ctx: ToolContext, **kwargs: Any) -> ToolResult:
     return ToolResult(
-        structured=await accounts.nakama_list_accounts(ctx.client, **kwargs)
+        structured=await accounts.nakama_list_accounts(
+            ctx.client, **_paging(ctx), **kwargs
+        )
     )
 
 
@@ -83,7 +138,9 @@ async def _get_account(ctx: ToolContext, **kwargs: Any) -> ToolResult:
 
 async def _list_wallet_ledger(ctx: ToolContext, **kwargs: Any) -> ToolResult:
     return ToolResult(
-        structured=await accounts.nakama_list_wallet_ledger(ctx.client, **kwargs)
+        structured=await accounts.nakama_list_wallet_ledger(
+            ctx.client, **_paging(ctx), **kwargs
+        )
     )
 
 
@@ -111,31 +168,143 @@ async def _list_collections(ctx: ToolContext, **_: Any) -> ToolResult:
 
 async def _list_storage(ctx: ToolContext, **kwargs: Any) -> ToolResult:
     return ToolResult(
-        structured=await storage.nakama_list_storage(ctx.client, **kwargs)
+        structured=await storage.nakama_list_storage(
+            ctx.client, **_paging(ctx), object_cache=ctx.object_cache, **kwargs
+        )
     )
 
 
 async def _list_user_storage(ctx: ToolContext, **kwargs: Any) -> ToolResult:
     return ToolResult(
-        structured=await storage.nakama_list_user_storage(ctx.client, **kwargs)
+        structured=await storage.nakama_list_user_storage(
+            ctx.client, **_paging(ctx), object_cache=ctx.object_cache, **kwargs
+        )
     )
 
 
 async def _list_storage_keys(ctx: ToolContext, **kwargs: Any) -> ToolResult:
     return ToolResult(
-        structured=await storage.nakama_list_storage_keys(ctx.client, **kwargs)
+        structured=await storage.nakama_list_storage_keys(
+            ctx.client, **_paging(ctx), object_cache=ctx.object_cache, **kwargs
+        )
     )
 
 
 async def _get_storage_object(ctx: ToolContext, **kwargs: Any) -> ToolResult:
     return ToolResult(
-        structured=await storage.nakama_get_storage_object(ctx.client, **kwargs)
+        structured=await storage.nakama_get_storage_object(
+            ctx.client, object_cache=ctx.object_cache, **kwargs
+        )
     )
 
 
 async def _get_storage_objects(ctx: ToolContext, **kwargs: Any) -> ToolResult:
+    result = await storage.nakama_get_storage_objects(
+        ctx.client,
+        deadline=_deadline(ctx),
+        export_cache=ctx.export_cache,
+        object_cache=ctx.object_cache,
+        **kwargs,
+    )
+    if isinstance(result, ToolResult):
+        return result
+    return ToolResult(structured=result)
+
+
+async def _storage_exists(ctx: ToolContext, **kwargs: Any) -> ToolResult:
+    return ToolResult(
+        structured=await storage_exists.nakama_storage_exists(
+            ctx.client,
+            deadline=_deadline(ctx),
+            prefetch=ctx.settings.nakama_prefetch_pages,
+            checkpoints=ctx.checkpoints,
+            object_cache=ctx.object_cache,
+            **kwargs,
+        )
+    )
+
+
+async def _find_storage_keys(ctx: ToolContext, **kwargs: Any) -> ToolResult:
+    result = await key_search.nakama_find_storage_keys(
+        ctx.client,
+        ctx.key_index,
+        deadline=_deadline(ctx),
+        prefetch=ctx.settings.nakama_prefetch_pages,
+        checkpoints=ctx.checkpoints,
+        object_cache=ctx.object_cache,
+        export_cache=ctx.export_cache,
+        **kwargs,
+    )
+    if isinstance(result, ToolResult):
+        return result
+    return ToolResult(structured=result)
+
+
+async def _scan_collection(ctx: ToolContext, **kwargs: Any) -> ToolResult:
+    return ToolResult(
+        structured=await scan.nakama_scan_collection(
+            ctx.client,
+            deadline=_deadline(ctx),
+            prefetch=ctx.settings.nakama_prefetch_pages,
+            checkpoints=ctx.checkpoints,
+            object_cache=ctx.object_cache,
+            export_cache=ctx.export_cache,
+            **kwargs,
+        )
+    )
+
+
+async def _search_storage_values(ctx: ToolContext, **kwargs: Any) -> ToolResult:
     return ToolResult(
-        structured=await storage.nakama_get_storage_objects(ctx.client, **kwargs)
+        structured=await scan.nakama_search_storage_values(
+            ctx.client,
+            deadline=_deadline(ctx),
+            prefetch=ctx.settings.nakama_prefetch_pages,
+            checkpoints=ctx.checkpoints,
+            object_cache=ctx.object_cache,
+            **kwargs,
+        )
+    )
+
+
+async def _aggregate_storage(ctx: ToolContext, **kwargs: Any) -> ToolResult:
+    return ToolResult(
+        structured=await scan.nakama_aggregate_storage(
+            ctx.client,
+            deadline=_deadline(ctx),
+            prefetch=ctx.settings.nakama_prefetch_pages,
+            checkpoints=ctx.checkpoints,
+            object_cache=ctx.object_cache,
+            **kwargs,
+        )
+    )
+
+
+async def _sync_storage_index(ctx: ToolContext, **kwargs: Any) -> ToolResult:
+    return ToolResult(
+        structured=await storage_index.nakama_sync_storage_index(
+            ctx.client,
+            ctx.metadata_index,
+            deadline=_deadline(ctx),
+            prefetch=ctx.settings.nakama_prefetch_pages,
+            checkpoints=ctx.checkpoints,
+            object_cache=ctx.object_cache,
+            **kwargs,
+        )
+    )
+
+
+async def _query_storage_index(ctx: ToolContext, **kwargs: Any) -> ToolResult:
+    return ToolResult(
+        structured=await storage_index.nakama_query_storage_index(
+            ctx.metadata_index, **kwargs
+        )
+    )
+
+
+async def _read_result_set(ctx: ToolContext, **kwargs: Any) -> ToolResult:
+    return ToolResult(
+        structured=await results.nakama_read_result_set(ctx.result_sets, **kwargs)
     )
 
 
@@ -232,7 +401,8 @@ TOOL_SPECS: list[ToolSpec] = [
         title="List Nakama storage objects",
         description=(
             "List storage metadata (no values). Pass cursor for one page. "
-            "Do not use key '%' alone. user_id-only filter has no Nakama pagination."
+            "Do not use key '%' alone. user_id-only filter has no Nakama pagination. "
+            "where filters by update/create time, permissions or key substring/regex."
         ),
         args_model=ListStorageArgs,
         output_model=ListStorageEnvelope,
@@ -254,7 +424,7 @@ TOOL_SPECS: list[ToolSpec] = [
         title="List Nakama storage keys",
         description=(
             "List keys only for a required collection. Lighter than nakama_list_storage. "
-            f"When fetched > {MAX_BATCH_OBJECTS}, hint explains multiple batch-get calls."
+            "Pass the keys you need to one nakama_get_storage_objects call."
         ),
         args_model=ListStorageKeysArgs,
         output_model=ListStorageKeysEnvelope,
@@ -265,6 +435,7 @@ TOOL_SPECS: list[ToolSpec] = [
         title="Get Nakama storage object",
         description=(
             "Fetch one storage object. Set include_value=false for metadata only. "
+            "value_paths returns only the named parts of the value. "
             "Large values truncate to value_preview."
         ),
         args_model=GetStorageObjectArgs,
@@ -275,13 +446,120 @@ TOOL_SPECS: list[ToolSpec] = [
         name="nakama_get_storage_objects",
         title="Get Nakama storage objects (batch)",
         description=(
-            f"Batch-fetch up to {MAX_BATCH_OBJECTS} objects. "
-            "Make multiple calls for more keys (no auto-chunking). "
-            "Use include_value=false or max_value_chars to limit payload size."
+            f"Batch-fetch up to {MAX_BULK_OBJECTS} objects in one call; chunked internally "
+            f"({MAX_BATCH_OBJECTS} in flight), repeated ids fetched once, results in input "
+            "order. Large results return as an MCP resource (response_mode). "
+            "Use include_value=false, value_paths or max_value_chars to limit payload size."
         ),
         args_model=GetStorageObjectsArgs,
         output_model=GetStorageObjectsEnvelope,
         handler=_get_storage_objects,
+        reports_progress=True,
+    ),
+    ToolSpec(
+        name="nakama_storage_exists",
+        title="Check Nakama storage objects exist",
+        description=(
+            f"Check up to {MAX_BULK_OBJECTS} storage ids for existence without fetching "
+            "values: returns exists plus version and update_time per id, answered from "
+            "metadata listings grouped by collection and user (GET only as a fallback). "
+            "only_missing=true returns just the absent ids."
+        ),
+        args_model=StorageExistsArgs,
+        output_model=StorageExistsEnvelope,
+        handler=_storage_exists,
+        reports_progress=True,
+    ),
+    ToolSpec(
+        name="nakama_find_storage_keys",
+        title="Find Nakama storage keys",
+        description=(
+            "Match a collection's keys by several prefixes, a substring (contains) or a "
+            "glob, optionally for one user_id, from an in-memory key index built on first "
+            "use and refreshed after a TTL. fetch_objects=true fetches the matches in one "
+            "batch. Use instead of paging the collection per question."
+        ),
+        args_model=FindStorageKeysArgs,
+        output_model=FindStorageKeysEnvelope,
+        handler=_find_storage_keys,
+    ),
+    ToolSpec(
+        name="nakama_scan_collection",
+        title="Scan Nakama storage values",
+        description=(
+            "Fetch every value in a collection (optionally one user_id or key_prefix) "
+            "server-side and return only an aggregate: counts, value size distribution, "
+            "decode failures and sampled ids. include_values=true also writes the values "
+            "to an NDJSON resource. Resume large collections with next_offset."
+        ),
+        args_model=ScanCollectionArgs,
+        output_model=ScanCollectionEnvelope,
+        handler=_scan_collection,
+        reports_progress=True,
+    ),
+    ToolSpec(
+        name="nakama_search_storage_values",
+        title="Search Nakama storage values",
+        description=(
+            "Find objects whose value matches: contains (substring), regex, or path + "
+            "equals (JSON equality at a pointer/dotted path). Streams the collection "
+            "server-side and returns only matching ids with snippets. Stops at "
+            "max_matches or max_scanned; resume with next_offset."
+        ),
+        args_model=SearchStorageValuesArgs,
+        output_model=SearchStorageValuesEnvelope,
+        handler=_search_storage_values,
+        reports_progress=True,
+    ),
+    ToolSpec(
+        name="nakama_aggregate_storage",
+        title="Aggregate Nakama storage values",
+        description=(
+            "Count, sum, min, max and mean numeric value paths (fields), histogram one "
+            "path and group by another across a collection, server-side; returns only "
+            "the aggregate. sample_rate < 1 fetches a hash sample and extrapolates "
+            "(estimated_* fields). Resume large collections with next_offset."
+        ),
+        args_model=AggregateStorageArgs,
+        output_model=AggregateStorageEnvelope,
+        handler=_aggregate_storage,
+        reports_progress=True,
+    ),
+    ToolSpec(
+        name="nakama_sync_storage_index",
+        title="Sync local storage metadata index",
+        description=(
+            "Crawl a collection's storage metadata (no values) into the local SQLite "
+            "index; later calls refresh only changed rows and apply deletions. Long "
+            "crawls resume on the next call. Requires NAKAMA_NAKAMA_METADATA_INDEX_PATH."
+        ),
+        args_model=SyncStorageIndexArgs,
+        output_model=SyncStorageIndexEnvelope,
+        handler=_sync_storage_index,
+        reports_progress=True,
+    ),
+    ToolSpec(
+        name="nakama_query_storage_index",
+        title="Query local storage metadata index",
+        description=(
+            "Filter (user_id, key_prefix, where, value size), sort and count a synced "
+            "collection's metadata from the local index in milliseconds, without "
+            "calling the Console. Results are index_backed and report index age."
+        ),
+        args_model=QueryStorageIndexArgs,
+        output_model=QueryStorageIndexEnvelope,
+        handler=_query_storage_index,
+    ),
+    ToolSpec(
+        name="nakama_read_result_set",
+        title="Read cached list results",
+        description=(
+            "Re-read rows from a list tool's result_handle with offset/limit, sort_by or "
+            "fields. Served from memory without calling the Console; handles expire."
+        ),
+        args_model=ReadResultSetArgs,
+        output_model=ReadResultSetEnvelope,
+        handler=_read_result_set,
     ),
 ]
 
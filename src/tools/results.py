@@ -0,0 +1,81 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.envelopes import dump_envelope
+from src.hints import append_hint
+from src.models import ReadResultSetEnvelope
+from src.pagination import DEFAULT_MAX_OBJECTS
+from src.projection import (
+    ACCOUNT_IDENTITY_FIELDS,
+    STORAGE_IDENTITY_FIELDS,
+    field_projection,
+)
+from src.result_sets import ResultSetCache, sort_rows
+
+# Identity fields kept when re-projecting rows from each source tool.
+_SOURCE_IDENTITY: Dict[str, Tuple[str, ...]] = {
+    "nakama_list_accounts": ACCOUNT_IDENTITY_FIELDS,
+    "nakama_list_wallet_ledger": ("id",),
+    "nakama_list_storage": STORAGE_IDENTITY_FIELDS,
+    "nakama_list_user_storage": STORAGE_IDENTITY_FIELDS,
+    "nakama_list_storage_keys": ("key", "user_id"),
+}
+
+
+async def nakama_read_result_set(
+    result_sets: ResultSetCache,
+    handle: str,
+    offset: int = 0,
+    limit: int = DEFAULT_MAX_OBJECTS,
+    sort_by: Optional[str] = None,
+    descending: bool = False,
+    fields: Optional[List[str]] = None,
+):
+    """Serve a window of a cached aggregation locally; the Console is not called."""
+    entry = result_sets.get(handle)
+    if entry is None:
+        raise ValueError(
+            f"Unknown or expired result set: {handle}. "
+            "Re-run the list tool to get a fresh result_handle."
+        )
+
+    items: List[Any] = entry.items()
+    if sort_by:
+        items = sort_rows(items, sort_by, descending=descending)
+    window = items[offset : offset + limit]
+    project = field_projection(fields, always=_SOURCE_IDENTITY.get(entry.source, ()))
+    if project is not None:
+        window = [project(item) for item in window]
+
+    next_offset = offset + len(window) if offset + len(window) < entry.count else None
+    source_complete = bool(entry.meta.get("complete", True))
+    source_next_cursor = entry.meta.get("next_cursor")
+
+    hint = None
+    if next_offset is not None:
+        hint = "Pass offset=next_offset for the next window of this result set."
+    if not source_complete:
+        more = (
+            f"Pass source_next_cursor to {entry.source} for rows beyond this set."
+            if source_next_cursor
+            else f"Narrow {entry.source} filters or raise max_objects for rows beyond this set."
+        )
+        hint = append_hint(hint, more)
+
+    return dump_envelope(
+        ReadResultSetEnvelope,
+        {
+            "handle": handle,
+            "source": entry.source,
+            "items": window,
+            "offset": offset,
+            "returned": len(window),
+            "total_items": entry.count,
+            "next_offset": next_offset,
+            "source_complete": source_complete,
+            "source_next_cursor": source_next_cursor,
+            "hint": hint,
+        },
+    )
+
+
+__all__ = ["nakama_read_result_set"]
@@ -0,0 +1,524 @@
+import functools
+import io
+import json
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from src.aggregation import DEFAULT_MAX_GROUPS, StorageAggregator, hash_sampler
+from src.checkpoints import CursorCheckpoints
+from src.deadline import Deadline
+from src.envelopes import dump_envelope
+from src.hints import DEADLINE_HINT, append_hint
+from src.models import (
+    AggregateStorageEnvelope,
+    ScanCollectionEnvelope,
+    SearchStorageValuesEnvelope,
+)
+from src.nakama_client import NakamaConsoleClient
+from src.object_cache import StorageObjectCache
+from src.pagination import DEFAULT_PREFETCH_PAGES
+from src.predicates import DEFAULT_MAX_SCANNED, ValueMatcher
+from src.progress import ProgressCallback
+from src.resources import SCAN_RESOURCE_SCHEME, ExportCache
+from src.tools.storage import _get_storage_object, _storage_pages
+from src.value_scan import (
+    DEFAULT_SCAN_CONCURRENCY,
+    DEFAULT_SCAN_OBJECTS,
+    DEFAULT_SCAN_SAMPLE,
+    DEFAULT_SEARCH_MATCHES,
+    MAX_SCAN_OBJECTS,
+    MAX_SCAN_RESOURCE_BYTES,
+    open_value_scan,
+    value_json_bytes,
+)
+
+# Upper bounds (bytes, inclusive) of the value size histogram; the last bucket is open.
+_SIZE_BUCKETS: Tuple[Tuple[int, str], ...] = (
+    (256, "<=256B"),
+    (1024, "<=1KiB"),
+    (4 * 1024, "<=4KiB"),
+    (16 * 1024, "<=16KiB"),
+    (64 * 1024, "<=64KiB"),
+    (256 * 1024, "<=256KiB"),
+)
+_MAX_ERROR_SAMPLES = 5
+
+
+class _SizeStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+        self.histogram: Dict[str, int] = {}
+
+    def add(self, size: int) -> None:
+        self.count += 1
+        self.total += size
+        self.min = size if self.min is None else min(self.min, size)
+        self.max = size if self.max is None else max(self.max, size)
+        label = next((name for bound, name in _SIZE_BUCKETS if size <= bound), ">256KiB")
+        self.histogram[label] = self.histogram.get(label, 0) + 1
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "total_bytes": self.total,
+            "min_bytes": self.min,
+            "max_bytes": self.max,
+            "mean_bytes": round(self.total / self.count, 1) if self.count else None,
+            "histogram": {
+                name: self.histogram[name]
+                for name in [*(n for _, n in _SIZE_BUCKETS), ">256KiB"]
+                if name in self.histogram
+            },
+        }
+
+
+class _Reservoir:
+    """Uniform sample of up to ``size`` items from a stream of unknown length."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.seen = 0
+        self.items: List[Any] = []
+        self._random = random.Random()
+
+    def offer(self, item: Any) -> None:
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+            return
+        slot = self._random.randrange(self.seen)
+        if slot < self.size:
+            self.items[slot] = item
+
+
+def _open_storage_scan(
+    client: NakamaConsoleClient,
+    *,
+    collection: str,
+    user_id: Optional[str],
+    key_prefix: Optional[str],
+    checkpoints: Optional[CursorCheckpoints],
+    object_cache: Optional[StorageObjectCache],
+    **options: Any,
+):
+    """``open_value_scan`` over a storage listing, fetching through ``object_cache``."""
+    fetch_page, query = _storage_pages(
+        client,
+        collection=collection,
+        key=key_prefix,
+        user_id=user_id,
+        checkpoints=checkpoints,
+        object_cache=object_cache,
+    )
+    get_object = functools.partial(_get_storage_object, client, object_cache=object_cache)
+    return open_value_scan(
+        fetch_page, get_object, collection=collection, checkpoints=query, **options
+    )
+
+
+async def nakama_scan_collection(
+    client: NakamaConsoleClient,
+    collection: str,
+    user_id: Optional[str] = None,
+    key_prefix: Optional[str] = None,
+    max_objects: int = DEFAULT_SCAN_OBJECTS,
+    start_offset: int = 0,
+    concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+    max_rate: Optional[float] = None,
+    sample_size: int = DEFAULT_SCAN_SAMPLE,
+    include_values: bool = False,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    checkpoints: Optional[CursorCheckpoints] = None,
+    object_cache: Optional[StorageObjectCache] = None,
+    export_cache: Optional[ExportCache] = None,
+    progress: Optional[ProgressCallback] = None,
+):
+    """Fetch every value in a collection (or slice of it) and return an aggregate.
+
+    Keys are listed page by page and fed into a bounded window of concurrent
+    GETs (see ``src.value_scan``); each value is folded into the aggregate and
+    dropped. With ``include_values`` the values are also written, one JSON line
+    per object, to an NDJSON MCP resource capped at MAX_SCAN_RESOURCE_BYTES.
+    """
+    if include_values and export_cache is None:
+        raise RuntimeError("Export cache is not configured")
+
+    sizes = _SizeStats()
+    sample = _Reservoir(sample_size)
+    fetch_errors = 0
+    error_samples: List[Dict[str, Any]] = []
+    decode_failures = 0
+    decode_failure_samples: List[Dict[str, Any]] = []
+    ndjson = io.BytesIO() if include_values else None
+    values_truncated = False
+    started = time.monotonic()
+
+    async with _open_storage_scan(
+        client,
+        collection=collection,
+        user_id=user_id,
+        key_prefix=key_prefix,
+        checkpoints=checkpoints,
+        object_cache=object_cache,
+        max_objects=max_objects,
+        start_offset=start_offset,
+        concurrency=concurrency,
+        max_rate=max_rate,
+        deadline=deadline,
+        prefetch=prefetch,
+        progress=progress,
+    ) as scan:
+        async for item in scan:
+            ident = item.ident
+            if item.error is not None:
+                fetch_errors += 1
+                if len(error_samples) < _MAX_ERROR_SAMPLES:
+                    error_samples.append({**ident, "error": str(item.error)})
+            else:
+                obj = item.obj if isinstance(item.obj, dict) else {}
+                value = obj.get("value")
+                encoded = value_json_bytes(value)
+                sizes.add(len(encoded))
+                # Nakama storage values are JSON objects; anything else failed to decode.
+                if not isinstance(value, (dict, list)):
+                    decode_failures += 1
+                    if len(decode_failure_samples) < _MAX_ERROR_SAMPLES:
+                        decode_failure_samples.append(ident)
+                sample.offer({**ident, "version": obj.get("version"), "value_bytes": len(encoded)})
+                if ndjson is not None and not values_truncated:
+                    line = json.dumps(
+                        {**ident, "version": obj.get("version"), "value": value},
+                        separators=(",", ":"),
+                        ensure_ascii=False,
+                    ).encode("utf-8") + b"\n"
+                    if ndjson.tell() + len(line) > MAX_SCAN_RESOURCE_BYTES:
+                        values_truncated = True
+                    else:
+                        ndjson.write(line)
+    rows = scan.rows
+
+    elapsed = time.monotonic() - started
+    limit_reached = (
+        not scan.deadline_exceeded
+        and scan.listing_error is None
+        and scan.processed == scan.listed
+        and rows.fetched >= rows.limit
+        and not rows.complete
+    )
+    resume = not scan.complete and scan.listing_error is None and scan.processed_prefix > 0
+    envelope: Dict[str, Any] = {
+        "collection": collection,
+        "listed": scan.listed,
+        "processed": scan.processed,
+        "fetched": scan.processed - fetch_errors,
+        "fetch_errors": fetch_errors,
+        "error_samples": error_samples,
+        "decode_failures": decode_failures,
+        "decode_failure_samples": decode_failure_samples,
+        "value_size": sizes.summary(),
+        "sampled_keys": sample.items,
+        "total_count": rows.total_count or 0,
+        "complete": scan.complete,
+        "limit_reached": limit_reached,
+        "next_offset": start_offset + scan.processed_prefix if resume else None,
+        "deadline_exceeded": scan.deadline_exceeded,
+        "listing_error": scan.listing_error,
+        "elapsed_seconds": round(elapsed, 3),
+        "objects_per_second": round(scan.processed / elapsed, 1) if elapsed > 0 else None,
+    }
+
+    hint = None
+    if scan.deadline_exceeded:
+        hint = append_hint(
+            DEADLINE_HINT,
+            "Pass next_offset as start_offset to continue, or narrow with user_id or key_prefix.",
+        )
+    elif limit_reached:
+        hint = "Pass next_offset as start_offset to scan the next slice."
+    if ndjson is not None and export_cache is not None:
+        envelope["resource_uri"] = export_cache.store_payload(
+            collection,
+            ndjson.getvalue(),
+            scheme=SCAN_RESOURCE_SCHEME,
+            description=f"NDJSON values scanned from collection {collection}",
+            mime_type="application/x-ndjson",
+        )
+        envelope["values_truncated"] = values_truncated
+        hint = append_hint(
+            hint,
+            "Values are one JSON object per line in resource_uri"
+            + (" (truncated at the size cap)." if values_truncated else "."),
+        )
+    envelope["hint"] = hint
+    return dump_envelope(ScanCollectionEnvelope, envelope)
+
+
+async def nakama_search_storage_values(
+    client: NakamaConsoleClient,
+    collection: str,
+    user_id: Optional[str] = None,
+    key_prefix: Optional[str] = None,
+    contains: Optional[str] = None,
+    regex: Optional[str] = None,
+    path: Optional[str] = None,
+    equals: Any = None,
+    ignore_case: bool = False,
+    max_matches: int = DEFAULT_SEARCH_MATCHES,
+    max_scanned: int = DEFAULT_MAX_SCANNED,
+    start_offset: int = 0,
+    concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+    max_rate: Optional[float] = None,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    checkpoints: Optional[CursorCheckpoints] = None,
+    object_cache: Optional[StorageObjectCache] = None,
+    progress: Optional[ProgressCallback] = None,
+):
+    """Stream a collection's values and return only the ids that match, with snippets.
+
+    Values are fetched through the same bounded window as ``nakama_scan_collection``
+    and tested with a ``ValueMatcher``. The scan stops at ``max_matches`` or after
+    ``max_scanned`` listed objects; ``next_offset`` resumes it without skipping
+    rows (matches past that offset may be reported again).
+    """
+    matcher = ValueMatcher(
+        contains=contains, regex=regex, path=path, equals=equals, ignore_case=ignore_case
+    )
+    matches: List[Dict[str, Any]] = []
+    fetch_errors = 0
+    error_samples: List[Dict[str, Any]] = []
+    async with _open_storage_scan(
+        client,
+        collection=collection,
+        user_id=user_id,
+        key_prefix=key_prefix,
+        checkpoints=checkpoints,
+        object_cache=object_cache,
+        max_objects=max_scanned,
+        start_offset=start_offset,
+        concurrency=concurrency,
+        max_rate=max_rate,
+        deadline=deadline,
+        prefetch=prefetch,
+        progress=progress,
+    ) as scan:
+        async for item in scan:
+            if item.error is not None:
+                fetch_errors += 1
+                if len(error_samples) < _MAX_ERROR_SAMPLES:
+                    error_samples.append({**item.ident, "error": str(item.error)})
+            else:
+                obj = item.obj if isinstance(item.obj, dict) else {}
+                value = obj.get("value")
+                text = value_json_bytes(value).decode("utf-8") if matcher.needs_text else None
+                snippet = matcher.match(value, text)
+                if snippet is not None:
+                    matches.append(
+                        {**item.ident, "version": obj.get("version"), "snippet": snippet}
+                    )
+                    if len(matches) >= max_matches:
+                        break
+    rows = scan.rows
+
+    match_limit_reached = len(matches) >= max_matches
+    stopped_early = match_limit_reached or scan.deadline_exceeded
+    scan_limit_reached = (
+        not stopped_early
+        and scan.listing_error is None
+        and rows.fetched >= rows.limit
+        and not rows.complete
+    )
+    complete = not stopped_early and scan.complete
+    resume = not complete and scan.processed_prefix > 0 and scan.listing_error is None
+    envelope: Dict[str, Any] = {
+        "collection": collection,
+        "matches": matches,
+        "matched": len(matches),
+        "scanned": scan.processed,
+        "fetch_errors": fetch_errors,
+        "error_samples": error_samples,
+        "total_count": rows.total_count or 0,
+        "complete": complete,
+        "match_limit_reached": match_limit_reached,
+        "scan_limit_reached": scan_limit_reached,
+        "next_offset": start_offset + scan.processed_prefix if resume else None,
+        "deadline_exceeded": scan.deadline_exceeded,
+        "listing_error": scan.listing_error,
+    }
+
+    hint = None
+    if scan.deadline_exceeded:
+        hint = DEADLINE_HINT
+    if match_limit_reached:
+        hint = append_hint(hint, "Stopped at max_matches.")
+    elif scan_limit_reached:
+        hint = append_hint(
+            hint, f"Stopped after max_scanned={max_scanned} objects without enough matches."
+        )
+    if envelope["next_offset"] is not None:
+        hint = append_hint(hint, "Pass next_offset as start_offset to keep searching.")
+    if matches:
+        hint = append_hint(
+            hint, "Fetch full values with nakama_get_storage_objects (value_paths to trim)."
+        )
+    envelope["hint"] = hint
+    return dump_envelope(SearchStorageValuesEnvelope, envelope)
+
+
+async def nakama_aggregate_storage(
+    client: NakamaConsoleClient,
+    collection: str,
+    user_id: Optional[str] = None,
+    key_prefix: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    histogram_path: Optional[str] = None,
+    bucket_width: Optional[float] = None,
+    group_by: Optional[str] = None,
+    max_groups: int = DEFAULT_MAX_GROUPS,
+    sample_rate: float = 1.0,
+    max_objects: int = DEFAULT_SCAN_OBJECTS,
+    start_offset: int = 0,
+    concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+    max_rate: Optional[float] = None,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    checkpoints: Optional[CursorCheckpoints] = None,
+    object_cache: Optional[StorageObjectCache] = None,
+    progress: Optional[ProgressCallback] = None,
+):
+    """Stream a collection's values into count/sum/min/max, a histogram and groups.
+
+    Values go through the ``nakama_scan_collection`` window and are folded into
+    a ``StorageAggregator``; only the aggregate is returned. With
+    ``sample_rate < 1`` a deterministic hash of each id decides which listed
+    rows are fetched at all, and counts and sums are extrapolated; the cap on
+    listed rows is then checked at page boundaries.
+    """
+    aggregator = StorageAggregator(
+        fields=fields or (),
+        histogram_path=histogram_path,
+        bucket_width=bucket_width,
+        group_by=group_by,
+        max_groups=max_groups,
+        sample_rate=sample_rate,
+    )
+    sampled = sample_rate < 1.0
+    sampler = hash_sampler(sample_rate)
+    # Raw listing offset of each sampled row not yet known to be processed, so
+    # the resume offset stays exact although fetches finish out of order.
+    unprocessed_offsets: Deque[int] = deque()
+    raw_checked = start_offset
+    first_unprocessed = 0
+
+    def sample(row: Any) -> bool:
+        nonlocal raw_checked
+        offset, raw_checked = raw_checked, raw_checked + 1
+        if not sampler(row):
+            return False
+        unprocessed_offsets.append(offset)
+        return True
+
+    def settle_offsets() -> None:
+        nonlocal first_unprocessed
+        while first_unprocessed < scan.processed_prefix and unprocessed_offsets:
+            unprocessed_offsets.popleft()
+            first_unprocessed += 1
+
+    fetch_errors = 0
+    error_samples: List[Dict[str, Any]] = []
+    started = time.monotonic()
+    async with _open_storage_scan(
+        client,
+        collection=collection,
+        user_id=user_id,
+        key_prefix=key_prefix,
+        checkpoints=checkpoints,
+        object_cache=object_cache,
+        max_objects=MAX_SCAN_OBJECTS if sampled else max_objects,
+        start_offset=start_offset,
+        predicate=sample if sampled else None,
+        max_scanned=max_objects if sampled else None,
+        concurrency=concurrency,
+        max_rate=max_rate,
+        deadline=deadline,
+        prefetch=prefetch,
+        progress=progress,
+    ) as scan:
+        async for item in scan:
+            if item.error is not None:
+                fetch_errors += 1
+                if len(error_samples) < _MAX_ERROR_SAMPLES:
+                    error_samples.append({**item.ident, "error": str(item.error)})
+            else:
+                obj = item.obj if isinstance(item.obj, dict) else {}
+                aggregator.add(obj.get("value"))
+            if sampled:
+                settle_offsets()
+    rows = scan.rows
+
+    elapsed = time.monotonic() - started
+    finished = (
+        not scan.deadline_exceeded
+        and scan.listing_error is None
+        and scan.processed == scan.listed
+    )
+    if sampled:
+        settle_offsets()
+        limit_reached = finished and rows.scan_limit_reached
+        # The first sampled row still unprocessed, or else every row checked
+        # (listings are checked a whole page at a time).
+        next_offset = unprocessed_offsets[0] if unprocessed_offsets else raw_checked
+        listed = rows.scanned
+    else:
+        limit_reached = finished and rows.fetched >= rows.limit and not rows.complete
+        next_offset = start_offset + scan.processed_prefix
+        listed = scan.listed
+    resume = not scan.complete and scan.listing_error is None and next_offset > start_offset
+    envelope: Dict[str, Any] = {
+        "collection": collection,
+        "listed": listed,
+        "processed": scan.processed,
+        "fetch_errors": fetch_errors,
+        "error_samples": error_samples,
+        "sample_rate": sample_rate,
+        "approximate": sampled,
+        **aggregator.summary(),
+        "total_count": rows.total_count or 0,
+        "complete": scan.complete,
+        "limit_reached": limit_reached,
+        "next_offset": next_offset if resume else None,
+        "deadline_exceeded": scan.deadline_exceeded,
+        "listing_error": scan.listing_error,
+        "elapsed_seconds": round(elapsed, 3),
+    }
+
+    hint = None
+    if scan.deadline_exceeded:
+        hint = append_hint(
+            DEADLINE_HINT,
+            "Pass next_offset as start_offset to continue; lower sample_rate or max_objects, "
+            "or narrow with user_id or key_prefix.",
+        )
+    elif limit_reached:
+        hint = (
+            "Aggregate covers the first max_objects rows only; pass next_offset as "
+            "start_offset for the next slice or lower sample_rate to cover more."
+        )
+    if sampled:
+        hint = append_hint(
+            hint, "Counts and sums are estimates from a hash sample (estimated_* fields)."
+        )
+    envelope["hint"] = hint
+    return dump_envelope(AggregateStorageEnvelope, envelope)
+
+
+__all__ = [
+    "nakama_scan_collection",
+    "nakama_search_storage_values",
+    "nakama_aggregate_storage",
+]
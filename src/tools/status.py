@@ -2,6 +2,7 @@ from typing import Any, Dict, Optional
 
 from src.config import NakamaSettings
 from src.envelopes import dump_envelope
+from src.hints import append_hint
 from src.models import StatusEnvelope
 from src.nakama_client import NakamaConsoleClient
 
@@ -24,6 +25,8 @@ async def nakama_status(client: NakamaConsoleClient, settings: NakamaSettings) -
         "nodes": [],
         "timestamp": None,
         "hint": None,
+        "breaker_state": None,
+        "client": None,
     }
 
     try:
@@ -36,6 +39,14 @@ async def nakama_status(client: NakamaConsoleClient, settings: NakamaSettings) -
     except Exception as e:
         result["hint"] = f"Status endpoint unavailable: {e}"
 
+    result["client"] = client.stats()
+    result["breaker_state"] = result["client"]["breaker"]["state"]
+    if result["breaker_state"] != "closed":
+        result["hint"] = append_hint(
+            result["hint"],
+            "Console circuit breaker is open; requests fail fast until a probe succeeds.",
+        )
+
     return dump_envelope(StatusEnvelope, result)
 
 
@@ -1,8 +1,12 @@
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Callable, Dict, List, Literal, Optional, Sequence, Tuple
 import asyncio
 import json
 from urllib.parse import quote
 
+from mcp.types import ResourceLink, TextContent
+
+from src.checkpoints import CursorCheckpoints, QueryCheckpoints, query_checkpoints
+from src.deadline import Deadline
 from src.envelopes import dump_envelope
 from src.hints import append_hint, build_list_hint
 from src.models import (
@@ -12,14 +16,32 @@ from src.models import (
     ListStorageKeysEnvelope,
 )
 from src.nakama_client import NakamaConsoleClient
-from src.pagination import DEFAULT_MAX_OBJECTS, fetch_page_once, fetch_pages
+from src.object_cache import StorageObjectCache
+from src.pagination import (
+    DEFAULT_MAX_OBJECTS,
+    DEFAULT_PREFETCH_PAGES,
+    MAX_BATCH_OBJECTS,
+    FetchPage,
+    collect_items,
+    fetch_page_once,
+    iter_items,
+)
+from src.progress import ProgressCallback
+from src.predicates import DEFAULT_MAX_SCANNED, clamp_max_scanned, storage_predicate
+from src.projection import STORAGE_IDENTITY_FIELDS, Projection, field_projection
+from src.resources import BATCH_RESOURCE_SCHEME, ExportCache
+from src.result_sets import ResultSetCache, remember_result_set
 from src.response_format import (
     DEFAULT_VALUE_PREVIEW_CHARS,
+    EXPORT_INLINE_MAX_BYTES,
+    export_json_size,
     format_storage_object,
 )
+from src.tool_result import ToolResult
 from src.validation import validate_storage_list_cursor
 
-BATCH_CONCURRENCY = 10
+
+_STORAGE_LIST_PATH = "/v2/console/storage"
 
 
 async def nakama_list_collections(client: NakamaConsoleClient):
@@ -50,11 +72,46 @@ def _attach_storage_hint(
         },
         list_tool=list_tool,
         next_cursor=envelope.get("next_cursor"),
+        deadline_exceeded=envelope.get("deadline_exceeded", False),
+        scanned=envelope.get("scanned"),
+        scan_limit_reached=envelope.get("scan_limit_reached", False),
     )
     envelope["hint"] = append_hint(hint, extra_hint)
     return envelope
 
 
+def _storage_pages(
+    client: NakamaConsoleClient,
+    *,
+    collection: Optional[str] = None,
+    key: Optional[str] = None,
+    user_id: Optional[str] = None,
+    checkpoints: Optional[CursorCheckpoints] = None,
+    object_cache: Optional[StorageObjectCache] = None,
+) -> Tuple[FetchPage, Optional[QueryCheckpoints]]:
+    """Page fetcher and cursor checkpoints for one storage listing query.
+
+    Every raw row's version is recorded in ``object_cache`` for later GETs.
+    """
+    params: Dict[str, Any] = {}
+    if collection is not None:
+        params["collection"] = collection
+        if key is not None:
+            params["key"] = key
+    if user_id is not None:
+        params["user_id"] = user_id
+    query = query_checkpoints(checkpoints, _STORAGE_LIST_PATH, params)
+
+    async def fetch_page(page_cursor: Optional[str]):
+        page_params = params if page_cursor is None else {**params, "cursor": page_cursor}
+        page = await client.get(_STORAGE_LIST_PATH, params=page_params)
+        if object_cache is not None and isinstance(page, dict):
+            object_cache.observe(page.get("objects") or [])
+        return page
+
+    return fetch_page, query
+
+
 async def _list_storage_envelope(
     client: NakamaConsoleClient,
     *,
@@ -63,7 +120,27 @@ async def _list_storage_envelope(
     user_id: Optional[str] = None,
     cursor: Optional[str] = None,
     max_objects: int = DEFAULT_MAX_OBJECTS,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    project: Optional[Callable[[Any], Any]] = None,
+    where: Optional[Dict[str, Any]] = None,
+    max_scanned: int = DEFAULT_MAX_SCANNED,
+    result_sets: Optional[ResultSetCache] = None,
+    start_offset: int = 0,
+    checkpoints: Optional[CursorCheckpoints] = None,
+    object_cache: Optional[StorageObjectCache] = None,
+    source: str = "nakama_list_storage",
+    items_key: str = "objects",
 ) -> Dict[str, Any]:
+    """List storage metadata into an ``objects`` envelope, streaming page by page.
+
+    ``where`` conditions are checked before ``project`` shapes each object, so
+    callers never hold full metadata dicts they are about to discard. With
+    ``where`` set, max_objects counts matches and ``max_scanned`` caps rows read.
+    Aggregated (cursor-less) results are kept in ``result_sets`` when given.
+    ``start_offset`` skips raw rows, resuming from the nearest cursor checkpoint.
+    """
+    predicate = storage_predicate(where)
     validate_storage_list_cursor(
         collection=collection,
         key=key,
@@ -71,22 +148,43 @@ async def _list_storage_envelope(
         cursor=cursor,
     )
 
-    async def fetch_page(page_cursor: Optional[str]):
-        params = {}
-        if collection is not None:
-            params["collection"] = collection
-            if key is not None:
-                params["key"] = key
-        if user_id is not None:
-            params["user_id"] = user_id
-        if page_cursor is not None:
-            params["cursor"] = page_cursor
-        return await client.get("/v2/console/storage", params=params)
+    fetch_page, query = _storage_pages(
+        client,
+        collection=collection,
+        key=key,
+        user_id=user_id,
+        checkpoints=checkpoints,
+        object_cache=object_cache,
+    )
 
     if cursor is not None:
-        return await fetch_page_once(fetch_page, items_key="objects", cursor=cursor)
-
-    return await fetch_pages(fetch_page, items_key="objects", max_objects=max_objects)
+        return await fetch_page_once(
+            fetch_page,
+            items_key="objects",
+            cursor=cursor,
+            deadline=deadline,
+            project=project,
+            predicate=predicate,
+            checkpoints=query,
+        )
+
+    stream = iter_items(
+        fetch_page,
+        items_key="objects",
+        max_objects=max_objects,
+        deadline=deadline,
+        prefetch=prefetch,
+        predicate=predicate,
+        max_scanned=clamp_max_scanned(max_scanned) if predicate is not None else None,
+        start_offset=start_offset,
+        checkpoints=query,
+    )
+    envelope = await collect_items(stream, project=project)
+    if items_key != "objects":
+        envelope[items_key] = envelope.pop("objects")
+    return remember_result_set(
+        result_sets, envelope, source=source, items_key=items_key
+    )
 
 
 async def nakama_list_storage(
@@ -96,8 +194,21 @@ async def nakama_list_storage(
     user_id: Optional[str] = None,
     cursor: Optional[str] = None,
     max_objects: int = DEFAULT_MAX_OBJECTS,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    fields: Optional[List[str]] = None,
+    where: Optional[Dict[str, Any]] = None,
+    max_scanned: int = DEFAULT_MAX_SCANNED,
+    result_sets: Optional[ResultSetCache] = None,
+    start_offset: int = 0,
+    checkpoints: Optional[CursorCheckpoints] = None,
+    object_cache: Optional[StorageObjectCache] = None,
 ):
-    """List storage objects with optional filtering."""
+    """List storage objects with optional filtering.
+
+    ``fields`` trims each object to the named metadata fields (plus its
+    collection/key/user_id identity) as pages arrive.
+    """
     envelope = await _list_storage_envelope(
         client,
         collection=collection,
@@ -105,6 +216,15 @@ async def nakama_list_storage(
         user_id=user_id,
         cursor=cursor,
         max_objects=max_objects,
+        deadline=deadline,
+        prefetch=prefetch,
+        project=field_projection(fields, always=STORAGE_IDENTITY_FIELDS),
+        where=where,
+        max_scanned=max_scanned,
+        result_sets=result_sets,
+        start_offset=start_offset,
+        checkpoints=checkpoints,
+        object_cache=object_cache,
     )
     envelope = _attach_storage_hint(
         envelope,
@@ -123,6 +243,14 @@ async def nakama_list_user_storage(
     key_prefix: Optional[str] = None,
     cursor: Optional[str] = None,
     max_objects: int = DEFAULT_MAX_OBJECTS,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    where: Optional[Dict[str, Any]] = None,
+    max_scanned: int = DEFAULT_MAX_SCANNED,
+    result_sets: Optional[ResultSetCache] = None,
+    start_offset: int = 0,
+    checkpoints: Optional[CursorCheckpoints] = None,
+    object_cache: Optional[StorageObjectCache] = None,
 ):
     """List storage objects for a specific user with optional collection and key prefix."""
     envelope = await _list_storage_envelope(
@@ -132,6 +260,15 @@ async def nakama_list_user_storage(
         user_id=user_id,
         cursor=cursor,
         max_objects=max_objects,
+        deadline=deadline,
+        prefetch=prefetch,
+        where=where,
+        max_scanned=max_scanned,
+        result_sets=result_sets,
+        start_offset=start_offset,
+        checkpoints=checkpoints,
+        object_cache=object_cache,
+        source="nakama_list_user_storage",
     )
     envelope = _attach_storage_hint(
         envelope,
@@ -144,6 +281,10 @@ async def nakama_list_user_storage(
     return dump_envelope(ListStorageEnvelope, envelope)
 
 
+# Collection is implicit in nakama_list_storage_keys, so rows carry only these.
+_KEY_IDENTITY = Projection(("key", "user_id"), default="")
+
+
 async def nakama_list_storage_keys(
     client: NakamaConsoleClient,
     collection: str,
@@ -151,6 +292,14 @@ async def nakama_list_storage_keys(
     key_prefix: Optional[str] = None,
     cursor: Optional[str] = None,
     max_objects: int = DEFAULT_MAX_OBJECTS,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    where: Optional[Dict[str, Any]] = None,
+    max_scanned: int = DEFAULT_MAX_SCANNED,
+    result_sets: Optional[ResultSetCache] = None,
+    start_offset: int = 0,
+    checkpoints: Optional[CursorCheckpoints] = None,
+    object_cache: Optional[StorageObjectCache] = None,
 ):
     """List storage keys (metadata only) for a collection with optional filters."""
     envelope = await _list_storage_envelope(
@@ -160,20 +309,32 @@ async def nakama_list_storage_keys(
         user_id=user_id,
         cursor=cursor,
         max_objects=max_objects,
+        deadline=deadline,
+        prefetch=prefetch,
+        project=_KEY_IDENTITY,
+        where=where,
+        max_scanned=max_scanned,
+        result_sets=result_sets,
+        start_offset=start_offset,
+        checkpoints=checkpoints,
+        object_cache=object_cache,
+        source="nakama_list_storage_keys",
+        items_key="keys",
     )
 
-    keys = [
-        {"key": obj.get("key", ""), "user_id": obj.get("user_id", "")}
-        for obj in envelope.get("objects", [])
-        if isinstance(obj, dict)
-    ]
-
+    keys = envelope.get("keys", envelope.get("objects", []))
     result = {
         "keys": keys,
         "total_count": envelope.get("total_count", 0),
         "fetched": envelope.get("fetched", len(keys)),
         "complete": envelope.get("complete", True),
         "next_cursor": envelope.get("next_cursor"),
+        "deadline_exceeded": envelope.get("deadline_exceeded", False),
+        "scanned": envelope.get("scanned"),
+        "scan_limit_reached": envelope.get("scan_limit_reached", False),
+        "result_handle": envelope.get("result_handle"),
+        "start_offset": envelope.get("start_offset"),
+        "checkpoint_offset": envelope.get("checkpoint_offset"),
     }
     result = _attach_storage_hint(
         result,
@@ -186,6 +347,10 @@ async def nakama_list_storage_keys(
     return dump_envelope(ListStorageKeysEnvelope, result)
 
 
+# Storage values at least this long (chars of JSON text) are decoded off the event loop.
+_THREAD_DECODE_MIN_CHARS = 64 * 1024
+
+
 def _encode_path_segment(segment: str) -> str:
     return quote(segment, safe="")
 
@@ -201,17 +366,48 @@ def _decode_storage_value(obj: Any) -> Any:
     return obj
 
 
+async def _decode_storage_value_async(obj: Any) -> Any:
+    """``_decode_storage_value`` that parses large values on a worker thread.
+
+    Decoding a multi-hundred-KiB value blocks the event loop for milliseconds,
+    stalling every other fetch in a scan window; below the threshold the thread
+    hop costs more than the parse.
+    """
+    value = obj.get("value") if isinstance(obj, dict) else None
+    if not isinstance(value, str) or len(value) < _THREAD_DECODE_MIN_CHARS:
+        return _decode_storage_value(obj)
+    try:
+        obj["value"] = await asyncio.to_thread(json.loads, value)
+    except Exception:
+        pass
+    return obj
+
+
 async def _get_storage_object(
-    client: NakamaConsoleClient, collection: str, key: str, user_id: str
+    client: NakamaConsoleClient,
+    collection: str,
+    key: str,
+    user_id: str,
+    object_cache: Optional[StorageObjectCache] = None,
 ) -> Any:
-    """GET one storage object and decode JSON value when applicable."""
+    """GET one storage object and decode JSON value when applicable.
+
+    With ``object_cache``, an object whose version a recent listing confirmed is
+    served from the cache without a Console request.
+    """
+    if object_cache is not None:
+        cached = object_cache.get(collection, key, user_id)
+        if cached is not None:
+            return cached
     path = "/v2/console/storage/{}/{}/{}".format(
         _encode_path_segment(collection),
         _encode_path_segment(key),
         _encode_path_segment(user_id),
     )
-    obj = await client.get(path)
-    return _decode_storage_value(obj)
+    obj = await _decode_storage_value_async(await client.get(path))
+    if object_cache is not None:
+        object_cache.put(obj)
+    return obj
 
 
 async def nakama_get_storage_object(
@@ -221,48 +417,167 @@ async def nakama_get_storage_object(
     user_id: str,
     include_value: bool = True,
     max_value_chars: int = DEFAULT_VALUE_PREVIEW_CHARS,
+    value_paths: Optional[List[str]] = None,
+    object_cache: Optional[StorageObjectCache] = None,
 ):
     """Get a specific storage object by collection, key, and user_id."""
-    obj = await _get_storage_object(client, collection, key, user_id)
+    obj = await _get_storage_object(client, collection, key, user_id, object_cache)
     return format_storage_object(
         obj,
         include_value=include_value,
         max_value_chars=max_value_chars,
+        value_paths=value_paths,
     )
 
 
+def _storage_id(item: Dict[str, str]) -> Dict[str, str]:
+    return {
+        "collection": item.get("collection", ""),
+        "key": item.get("key", ""),
+        "user_id": item.get("user_id", ""),
+    }
+
+
 async def nakama_get_storage_objects(
     client: NakamaConsoleClient,
     objects: Sequence[Dict[str, str]],
     include_value: bool = True,
     max_value_chars: int = DEFAULT_VALUE_PREVIEW_CHARS,
-):
-    """Fetch multiple storage objects concurrently (max 50)."""
-    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
-
-    async def fetch_one(item: Dict[str, str]) -> Dict[str, Any]:
-        collection = item.get("collection", "")
-        key = item.get("key", "")
-        user_id = item.get("user_id", "")
-        base = {"collection": collection, "key": key, "user_id": user_id}
-        try:
-            async with semaphore:
-                obj = await _get_storage_object(client, collection, key, user_id)
-            shaped = format_storage_object(
-                obj,
-                include_value=include_value,
-                max_value_chars=max_value_chars,
-            )
-            return {**base, "ok": True, "object": shaped}
-        except Exception as e:
-            return {**base, "ok": False, "error": str(e)}
-
-    results = list(await asyncio.gather(*(fetch_one(item) for item in objects)))
+    deadline: Optional[Deadline] = None,
+    value_paths: Optional[List[str]] = None,
+    response_mode: Literal["inline", "resource", "auto"] = "auto",
+    export_cache: Optional[ExportCache] = None,
+    progress: Optional[ProgressCallback] = None,
+    object_cache: Optional[StorageObjectCache] = None,
+) -> Dict[str, Any] | ToolResult:
+    """Fetch up to MAX_BULK_OBJECTS storage objects, chunked internally.
+
+    Repeated ids are fetched once. At most MAX_BATCH_OBJECTS workers drain the
+    unique ids, and Console parallelism stays governed by the client-wide adaptive
+    limiter shared with every other tool call in flight. Results come back in input
+    order. Fetches still running when the deadline expires are cancelled and
+    reported as failed items with complete=False. Large envelopes are returned as an
+    MCP resource link (see ``response_mode``).
+    """
+    ids = [_storage_id(item) for item in objects]
+    unique: Dict[tuple, Dict[str, str]] = {}
+    for ident in ids:
+        unique.setdefault((ident["collection"], ident["key"], ident["user_id"]), ident)
+
+    outcomes: Dict[tuple, Dict[str, Any]] = {}
+    queue: "asyncio.Queue[tuple]" = asyncio.Queue()
+    for ident_key in unique:
+        queue.put_nowait(ident_key)
+    total = len(unique)
+    # Report roughly every 5% (at most every MAX_BATCH_OBJECTS items) and at the end.
+    step = max(1, min(MAX_BATCH_OBJECTS, total // 20))
+
+    async def report() -> None:
+        done = len(outcomes)
+        if progress is not None and (done == total or done % step == 0):
+            try:
+                await progress(done, total)
+            except Exception:
+                pass
+
+    async def worker() -> None:
+        while True:
+            try:
+                ident_key = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            ident = unique[ident_key]
+            try:
+                obj = await _get_storage_object(
+                    client,
+                    ident["collection"],
+                    ident["key"],
+                    ident["user_id"],
+                    object_cache,
+                )
+                shaped = format_storage_object(
+                    obj,
+                    include_value=include_value,
+                    max_value_chars=max_value_chars,
+                    value_paths=value_paths,
+                )
+                outcomes[ident_key] = {**ident, "ok": True, "object": shaped}
+            except Exception as e:
+                outcomes[ident_key] = {**ident, "ok": False, "error": str(e)}
+            await report()
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(min(MAX_BATCH_OBJECTS, total))]
+    timeout = deadline.remaining() if deadline is not None else None
+    deadline_exceeded = False
+    if workers:
+        _done, pending = await asyncio.wait(workers, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        deadline_exceeded = len(outcomes) < total
+
+    results = []
+    for ident in ids:
+        outcome = outcomes.get((ident["collection"], ident["key"], ident["user_id"]))
+        if outcome is None:
+            outcome = {
+                **ident,
+                "ok": False,
+                "error": "Deadline exceeded before the fetch completed",
+            }
+        results.append(outcome)
     fetched = sum(1 for r in results if r.get("ok"))
-    failed = len(results) - fetched
-    return dump_envelope(
+    envelope = dump_envelope(
         GetStorageObjectsEnvelope,
-        {"results": results, "fetched": fetched, "failed": failed},
+        {
+            "results": results,
+            "fetched": fetched,
+            "failed": len(results) - fetched,
+            "unique": total,
+            "duplicates": len(ids) - total,
+            "complete": not deadline_exceeded,
+            "deadline_exceeded": deadline_exceeded,
+        },
+    )
+
+    use_resource = response_mode == "resource"
+    if response_mode == "auto":
+        use_resource = export_json_size(envelope) > EXPORT_INLINE_MAX_BYTES
+    if not use_resource:
+        return envelope
+    if export_cache is None:
+        raise RuntimeError("Export cache is not configured")
+
+    resource_uri = export_cache.store(
+        "batch",
+        envelope,
+        scheme=BATCH_RESOURCE_SCHEME,
+        description="Cached nakama_get_storage_objects results (input order)",
+    )
+    payload = {
+        "results": [],
+        "fetched": envelope["fetched"],
+        "failed": envelope["failed"],
+        "unique": envelope["unique"],
+        "duplicates": envelope["duplicates"],
+        "complete": envelope["complete"],
+        "deadline_exceeded": envelope["deadline_exceeded"],
+        "response_mode": "resource",
+        "resource_uri": resource_uri,
+        "hint": "Read the full per-item results via the MCP resource URI.",
+    }
+    return ToolResult(
+        structured=payload,
+        content=[
+            TextContent(type="text", text=json.dumps(payload, indent=2)),
+            ResourceLink(
+                type="resource_link",
+                uri=resource_uri,
+                name=f"Nakama storage batch ({len(results)} objects)",
+                mimeType="application/json",
+            ),
+        ],
     )
 
 
@@ -0,0 +1,290 @@
+import asyncio
+import math
+from os.path import commonprefix
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from src.checkpoints import CursorCheckpoints
+from src.deadline import Deadline, DeadlineExceeded, run_with_deadline
+from src.envelopes import dump_envelope
+from src.hints import DEADLINE_HINT, append_hint
+from src.models import StorageExistsEnvelope
+from src.nakama_client import NakamaConsoleClient
+from src.object_cache import StorageObjectCache
+from src.pagination import DEFAULT_PREFETCH_PAGES, MAX_BATCH_OBJECTS, iter_pages
+from src.progress import ProgressCallback
+from src.tools.storage import _get_storage_object, _storage_id, _storage_pages
+
+StorageIdent = Tuple[str, str, str]
+
+# A collection listing stops once it has read this many rows.
+_MAX_COLLECTION_LISTING_ROWS = 100_000
+# A user with at least this many unresolved ids is answered by one user listing.
+_USER_LISTING_MIN_IDS = 2
+
+
+def _found(row: Dict[str, Any], source: str) -> Dict[str, Any]:
+    return {
+        "exists": True,
+        "version": row.get("version"),
+        "update_time": row.get("update_time"),
+        "source": source,
+    }
+
+
+def _missing(source: str) -> Dict[str, Any]:
+    return {"exists": False, "source": source}
+
+
+def _key_listable(ident: StorageIdent) -> bool:
+    # A key ending in % would be read as a prefix filter, and an empty user_id
+    # as no owner filter at all.
+    return bool(ident[2]) and not ident[1].endswith("%")
+
+
+def _row_ident(row: Any) -> Optional[StorageIdent]:
+    if not isinstance(row, dict):
+        return None
+    return (row.get("collection") or "", row.get("key") or "", row.get("user_id") or "")
+
+
+async def nakama_storage_exists(
+    client: NakamaConsoleClient,
+    objects: Sequence[Dict[str, str]],
+    only_missing: bool = False,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    checkpoints: Optional[CursorCheckpoints] = None,
+    object_cache: Optional[StorageObjectCache] = None,
+    progress: Optional[ProgressCallback] = None,
+):
+    """Report which storage ids exist, with version and update_time, without values.
+
+    Ids are answered from metadata listings, cheapest first: a collection
+    listing (narrowed to the keys' common prefix) when its estimated page count
+    is no more than the ids it would answer; one user listing per user with
+    several remaining ids; then an exact key listing per id. A per-object GET
+    (404 means missing) is used only where a listing cannot express the id or
+    failed.
+    """
+    ids = [_storage_id(item) for item in objects]
+    pending: Dict[StorageIdent, Dict[str, str]] = {}
+    for ident in ids:
+        pending.setdefault((ident["collection"], ident["key"], ident["user_id"]), ident)
+    total = len(pending)
+    answers: Dict[StorageIdent, Dict[str, Any]] = {}
+    failures: Dict[StorageIdent, str] = {}
+    requests = {"collection_listing": 0, "user_listing": 0, "key_listing": 0, "get": 0}
+    deadline_exceeded = False
+
+    async def report() -> None:
+        if progress is not None:
+            try:
+                await progress(len(answers), total)
+            except Exception:
+                pass
+
+    def resolve(ident: StorageIdent, answer: Dict[str, Any]) -> None:
+        if pending.pop(ident, None) is not None:
+            answers[ident] = answer
+
+    async def list_collection(collection: str, wanted: List[StorageIdent]) -> bool:
+        """List ``collection`` while that is cheaper than per-id requests."""
+        keys = sorted({ident[1] for ident in wanted})
+        prefix = commonprefix(keys)
+        fetch_page, query = _storage_pages(
+            client,
+            collection=collection,
+            key=f"{prefix}%" if prefix else None,
+            user_id=None,
+            checkpoints=checkpoints,
+            object_cache=object_cache,
+        )
+
+        async def counted_fetch(cursor: Optional[str]) -> Any:
+            requests["collection_listing"] += 1
+            return await fetch_page(cursor)
+
+        def take(rows: List[Any]) -> List[StorageIdent]:
+            for row in rows:
+                ident = _row_ident(row)
+                if ident is not None:
+                    resolve(ident, _found(row, "collection_listing"))
+            return [i for i in wanted if i in pending]
+
+        # The first page is fetched without read-ahead so its total_count can
+        # decide whether the rest of the listing is worth requesting.
+        try:
+            first = await run_with_deadline(deadline, counted_fetch(None))
+        except DeadlineExceeded:
+            return True
+        first_rows = first.get("objects") or [] if isinstance(first, dict) else []
+        unresolved = take(first_rows)
+        if not unresolved or not first_rows:
+            return False
+        estimate = math.ceil((first.get("total_count") or 0) / len(first_rows))
+        if estimate - 1 > len(unresolved):
+            return False
+
+        async def rest(cursor: Optional[str]) -> Any:
+            return first if cursor is None else await counted_fetch(cursor)
+
+        pages = iter_pages(
+            rest,
+            items_key="objects",
+            max_objects=_MAX_COLLECTION_LISTING_ROWS,
+            deadline=deadline,
+            prefetch=prefetch,
+            checkpoints=query,
+            limit_cap=_MAX_COLLECTION_LISTING_ROWS,
+        )
+        stopped = False
+        try:
+            async for page_rows in pages:
+                if not take(page_rows):
+                    stopped = True
+                    break
+        finally:
+            await pages.aclose()
+        await report()
+        if not stopped and pages.complete and not pages.deadline_exceeded:
+            # The whole prefix range was listed: ids not seen do not exist.
+            for ident in wanted:
+                resolve(ident, _missing("collection_listing"))
+        return pages.deadline_exceeded
+
+    async def list_user(user_id: str) -> None:
+        fetch_page, _ = _storage_pages(client, user_id=user_id, object_cache=object_cache)
+        requests["user_listing"] += 1
+        try:
+            page = await fetch_page(None)
+        except Exception:
+            return  # Left to per-id checks.
+        if not isinstance(page, dict):
+            return
+        for row in page.get("objects") or []:
+            ident = _row_ident(row)
+            if ident is not None:
+                resolve(ident, _found(row, "user_listing"))
+        if not page.get("next_cursor"):
+            for ident in [i for i in pending if i[2] == user_id]:
+                resolve(ident, _missing("user_listing"))
+
+    async def get_object(ident: StorageIdent) -> None:
+        requests["get"] += 1
+        try:
+            obj = await _get_storage_object(client, *ident, object_cache)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                resolve(ident, _missing("get"))
+            else:
+                failures[ident] = str(e)
+            return
+        except Exception as e:
+            failures[ident] = str(e)
+            return
+        resolve(ident, _found(obj if isinstance(obj, dict) else {}, "get"))
+
+    async def list_key(ident: StorageIdent) -> None:
+        collection, key, user_id = ident
+        fetch_page, _ = _storage_pages(
+            client, collection=collection, key=key, user_id=user_id, object_cache=object_cache
+        )
+        requests["key_listing"] += 1
+        try:
+            page = await fetch_page(None)
+        except Exception:
+            page = None
+        if not isinstance(page, dict):
+            await get_object(ident)
+            return
+        for row in page.get("objects") or []:
+            if _row_ident(row) == ident:
+                resolve(ident, _found(row, "key_listing"))
+                return
+        resolve(ident, _missing("key_listing"))
+
+    async def run_all(jobs: List[Callable[[], Awaitable[None]]]) -> bool:
+        """Run jobs MAX_BATCH_OBJECTS at a time; True if the deadline cut them short."""
+        queue = list(reversed(jobs))
+
+        async def worker() -> None:
+            while queue:
+                await queue.pop()()
+                await report()
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(MAX_BATCH_OBJECTS, len(jobs)))]
+        if not workers:
+            return False
+        timeout = deadline.remaining() if deadline is not None else None
+        _done, unfinished = await asyncio.wait(workers, timeout=timeout)
+        for task in unfinished:
+            task.cancel()
+        if unfinished:
+            await asyncio.gather(*unfinished, return_exceptions=True)
+        return bool(unfinished)
+
+    by_collection: Dict[str, List[StorageIdent]] = {}
+    for ident in pending:
+        by_collection.setdefault(ident[0], []).append(ident)
+    listed = [
+        list_collection(collection, wanted)
+        for collection, wanted in by_collection.items()
+        if len(wanted) >= 2
+    ]
+    if listed:
+        outcomes = await asyncio.gather(*listed, return_exceptions=True)
+        deadline_exceeded = any(outcome is True for outcome in outcomes)
+
+    if not deadline_exceeded:
+        by_user: Dict[str, int] = {}
+        for ident in pending:
+            if ident[2]:
+                by_user[ident[2]] = by_user.get(ident[2], 0) + 1
+        users = [u for u, count in by_user.items() if count >= _USER_LISTING_MIN_IDS]
+        deadline_exceeded = await run_all([lambda u=u: list_user(u) for u in users])
+
+    if not deadline_exceeded:
+        deadline_exceeded = await run_all(
+            [
+                (lambda i=i: list_key(i)) if _key_listable(i) else (lambda i=i: get_object(i))
+                for i in list(pending)
+            ]
+        )
+
+    results: List[Dict[str, Any]] = []
+    for ident in ids:
+        ident_key = (ident["collection"], ident["key"], ident["user_id"])
+        answer = answers.get(ident_key)
+        if answer is None:
+            error = failures.get(ident_key, "Not checked before the time budget ran out")
+            answer = {"exists": None, "error": error}
+        if only_missing and answer["exists"] is True:
+            continue
+        results.append({**ident, **answer})
+    present = sum(1 for answer in answers.values() if answer["exists"])
+    missing = len(answers) - present
+    unknown = total - len(answers)
+
+    envelope: Dict[str, Any] = {
+        "results": results,
+        "present": present,
+        "missing": missing,
+        "unknown": unknown,
+        "unique": total,
+        "duplicates": len(ids) - total,
+        "requests": requests,
+        "complete": unknown == 0,
+        "deadline_exceeded": deadline_exceeded,
+    }
+    hint = None
+    if deadline_exceeded:
+        hint = append_hint(DEADLINE_HINT, "Re-run with the ids whose exists is null.")
+    elif unknown:
+        hint = "Some ids could not be checked (see error); retry them."
+    envelope["hint"] = hint
+    return dump_envelope(StorageExistsEnvelope, envelope)
+
+
+__all__ = ["nakama_storage_exists"]
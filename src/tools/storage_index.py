@@ -0,0 +1,295 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.checkpoints import CursorCheckpoints
+from src.deadline import Deadline, DeadlineExceeded, run_with_deadline
+from src.envelopes import dump_envelope
+from src.hints import DEADLINE_HINT, append_hint
+from src.metadata_index import (
+    DEFAULT_INDEX_QUERY_LIMIT,
+    MAX_INDEX_SYNC_OBJECTS,
+    StorageMetadataIndex,
+)
+from src.models import QueryStorageIndexEnvelope, SyncStorageIndexEnvelope
+from src.nakama_client import NakamaConsoleClient
+from src.object_cache import StorageObjectCache
+from src.pagination import DEFAULT_PREFETCH_PAGES, MAX_BULK_OBJECTS, iter_pages
+from src.progress import ProgressCallback
+from src.tools.storage import _get_storage_object, _storage_pages
+from src.tools.storage_exists import nakama_storage_exists
+from src.value_scan import DEFAULT_SCAN_CONCURRENCY, value_json_bytes
+
+# Query results warn when the last complete sync is older than this.
+_STALE_INDEX_SECONDS = 15 * 60
+
+INDEX_DISABLED_MESSAGE = (
+    "The storage metadata index is disabled. Set NAKAMA_NAKAMA_METADATA_INDEX_PATH "
+    "(a file path, or :memory: for a per-process index) to enable it."
+)
+
+
+def _require_index(index: Optional[StorageMetadataIndex]) -> StorageMetadataIndex:
+    if index is None:
+        raise ValueError(INDEX_DISABLED_MESSAGE)
+    return index
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+async def nakama_sync_storage_index(
+    client: NakamaConsoleClient,
+    index: Optional[StorageMetadataIndex],
+    collection: str,
+    full: bool = False,
+    include_value_sizes: bool = False,
+    concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    checkpoints: Optional[CursorCheckpoints] = None,
+    object_cache: Optional[StorageObjectCache] = None,
+    progress: Optional[ProgressCallback] = None,
+):
+    """Crawl a collection's metadata listing into the local index.
+
+    The Console cannot list by update_time, so every pass re-lists metadata
+    (no values) and rewrites only rows whose version or update_time changed.
+    With ``include_value_sizes`` those rows (and rows never measured) are
+    fetched to record ``value_bytes``. A pass cut short by the time budget is
+    resumed by the next call. A pass that read the whole listing in one call
+    deletes rows it did not see. A resumed pass may have skipped rows that
+    moved between calls, so its unseen rows are rechecked by id (see
+    ``nakama_storage_exists``) and deleted only once confirmed gone.
+    """
+    index = _require_index(index)
+    full = full or await index.run(index.state, collection) is None
+    sync = await index.run(index.begin_sync, collection, full=full)
+    fetch_page, query = _storage_pages(
+        client,
+        collection=collection,
+        key=None,
+        user_id=None,
+        checkpoints=checkpoints,
+        object_cache=object_cache,
+    )
+    pages = iter_pages(
+        fetch_page,
+        items_key="objects",
+        max_objects=MAX_INDEX_SYNC_OBJECTS,
+        deadline=deadline,
+        prefetch=prefetch,
+        start_offset=sync.start_offset,
+        checkpoints=query,
+        limit_cap=MAX_INDEX_SYNC_OBJECTS,
+    )
+    gate = asyncio.Semaphore(max(1, concurrency))
+
+    async def measure(row: Dict[str, Any]) -> Tuple[str, str, int]:
+        key, user_id = row["key"], row.get("user_id") or ""
+        async with gate:
+            obj = await _get_storage_object(client, collection, key, user_id, object_cache)
+        value = obj.get("value") if isinstance(obj, dict) else None
+        return key, user_id, len(value_json_bytes(value))
+
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    listed = 0
+    measured = 0
+    size_errors = 0
+    stopped = False
+    deadline_exceeded = False
+    listing_error: Optional[str] = None
+    started = time.monotonic()
+    try:
+        async for page_rows in pages:
+            changes = await index.run(index.apply_page, sync, page_rows)
+            listed += len(page_rows)
+            counts["inserted"] += changes.inserted
+            counts["updated"] += changes.updated
+            counts["unchanged"] += changes.unchanged
+            to_measure = changes.changed + changes.unsized if include_value_sizes else []
+            if to_measure:
+                try:
+                    sizes = await run_with_deadline(
+                        deadline,
+                        asyncio.gather(*(measure(r) for r in to_measure), return_exceptions=True),
+                    )
+                except DeadlineExceeded:
+                    deadline_exceeded = stopped = True
+                    break
+                ok = [size for size in sizes if isinstance(size, tuple)]
+                await index.run(index.set_value_sizes, collection, ok)
+                measured += len(ok)
+                size_errors += len(sizes) - len(ok)
+            if progress is not None:
+                total = pages.total_count or listed
+                try:
+                    await progress(sync.start_offset + listed, max(total, sync.start_offset + listed))
+                except Exception:
+                    pass
+    except Exception as e:
+        if listed == 0:
+            raise
+        listing_error = str(e)
+        stopped = True
+    finally:
+        await pages.aclose()
+
+    deadline_exceeded = deadline_exceeded or pages.deadline_exceeded
+    finished = not stopped and not deadline_exceeded and pages.complete
+    next_offset = None if finished else sync.start_offset + listed
+    deleted = await index.run(index.finish_sync, sync, next_offset=next_offset)
+    rechecked = 0
+    # A full pass starts empty, so it has nothing stale to recheck.
+    if finished and sync.resumed and not full:
+        unseen = await index.run(index.unseen_rows, sync)
+        for chunk_start in range(0, len(unseen), MAX_BULK_OBJECTS):
+            if deadline is not None and deadline.expired():
+                deadline_exceeded = True
+                break
+            chunk = unseen[chunk_start : chunk_start + MAX_BULK_OBJECTS]
+            checked = await nakama_storage_exists(
+                client,
+                [{"collection": collection, "key": k, "user_id": u} for k, u in chunk],
+                deadline=deadline,
+                prefetch=prefetch,
+                checkpoints=checkpoints,
+                object_cache=object_cache,
+            )
+            outcome: Dict[Any, List[Tuple[str, str]]] = {True: [], False: []}
+            for result in checked["results"]:
+                if result["exists"] is not None:
+                    outcome[result["exists"]].append((result["key"], result["user_id"]))
+            rechecked += len(outcome[True]) + len(outcome[False])
+            deleted += await index.run(
+                index.resolve_unseen, sync, present=outcome[True], missing=outcome[False]
+            )
+            if checked["deadline_exceeded"]:
+                deadline_exceeded = True
+                break
+    state = await index.run(index.state, collection) or {}
+    stale_rows = state.get("stale_rows", 0)
+
+    envelope: Dict[str, Any] = {
+        "collection": collection,
+        "full": full,
+        "resumed": sync.resumed,
+        "start_offset": sync.start_offset,
+        "listed": listed,
+        **counts,
+        "deleted": deleted,
+        "rechecked": rechecked,
+        "stale_rows": stale_rows,
+        "value_sizes_measured": measured,
+        "value_size_errors": size_errors,
+        "indexed_rows": state.get("rows", 0),
+        "complete": finished,
+        "next_offset": next_offset,
+        "deadline_exceeded": deadline_exceeded,
+        "listing_error": listing_error,
+        "index_synced_at": _iso(state.get("synced_at")),
+        "elapsed_seconds": round(time.monotonic() - started, 3),
+    }
+    if stale_rows:
+        hint = (
+            f"{stale_rows} indexed rows were not seen by this pass and could not be "
+            "rechecked yet; they may no longer exist. Sync again to recheck them."
+        )
+        if deadline_exceeded:
+            hint = append_hint(DEADLINE_HINT, hint)
+    elif finished:
+        hint = "Query the index with nakama_query_storage_index."
+    else:
+        hint = (
+            "Sync pass not finished; call nakama_sync_storage_index again to resume at "
+            "next_offset (deletions are applied when the pass completes)."
+        )
+        if deadline_exceeded:
+            hint = append_hint(DEADLINE_HINT, hint)
+    envelope["hint"] = hint
+    return dump_envelope(SyncStorageIndexEnvelope, envelope)
+
+
+async def nakama_query_storage_index(
+    index: Optional[StorageMetadataIndex],
+    collection: str,
+    user_id: Optional[str] = None,
+    key_prefix: Optional[str] = None,
+    where: Optional[Dict[str, Any]] = None,
+    min_value_bytes: Optional[int] = None,
+    max_value_bytes: Optional[int] = None,
+    sort_by: str = "key",
+    descending: bool = False,
+    limit: int = DEFAULT_INDEX_QUERY_LIMIT,
+    offset: int = 0,
+):
+    """Answer a filtered/sorted/counted metadata query from the local index.
+
+    The Console is not called; results reflect the index as of its last sync,
+    reported as ``index_synced_at`` / ``index_age_seconds``.
+    """
+    index = _require_index(index)
+    state = await index.run(index.state, collection)
+    if state is None:
+        raise ValueError(
+            f"Collection {collection!r} is not indexed; run nakama_sync_storage_index first."
+        )
+    objects, total = await index.run(
+        index.query,
+        collection,
+        user_id=user_id,
+        key_prefix=key_prefix,
+        where=where,
+        min_value_bytes=min_value_bytes,
+        max_value_bytes=max_value_bytes,
+        sort_by=sort_by,
+        descending=descending,
+        limit=limit,
+        offset=offset,
+    )
+    returned = len(objects)
+    next_offset = offset + returned if returned and offset + returned < total else None
+    envelope: Dict[str, Any] = {
+        "collection": collection,
+        "objects": objects,
+        "returned": returned,
+        "total": total,
+        "offset": offset,
+        "next_offset": next_offset,
+        "index_backed": True,
+        "index_synced_at": _iso(state["synced_at"]),
+        "index_age_seconds": state["age_seconds"],
+        "index_complete": state["last_sync_complete"] and not state["stale_rows"],
+        "stale_rows": state["stale_rows"],
+    }
+
+    hints: List[str] = []
+    if state["synced_at"] is None:
+        hints.append(
+            "No sync pass has finished yet; results cover only the rows crawled so far."
+        )
+    elif state["age_seconds"] is not None and state["age_seconds"] > _STALE_INDEX_SECONDS:
+        hints.append(
+            f"Index is {int(state['age_seconds'])}s old; run nakama_sync_storage_index to refresh."
+        )
+    if state["stale_rows"]:
+        hints.append(
+            f"{state['stale_rows']} indexed rows may no longer exist; run "
+            "nakama_sync_storage_index to recheck them."
+        )
+    if next_offset is not None:
+        hints.append("Pass offset=next_offset for the next window.")
+    if min_value_bytes is not None or max_value_bytes is not None or sort_by == "value_bytes":
+        hints.append("value_bytes is only known for rows synced with include_value_sizes.")
+    hint = None
+    for part in hints:
+        hint = append_hint(hint, part)
+    envelope["hint"] = hint
+    return dump_envelope(QueryStorageIndexEnvelope, envelope)
+
+
+__all__ = ["nakama_sync_storage_index", "nakama_query_storage_index"]
@@ -0,0 +1,277 @@
+"""Pipelined storage value scans: key listing feeding a bounded window of fetches.
+
+A ``ValueScan`` drains a storage ``PageStream`` into at most ``concurrency``
+concurrent object fetches and yields each result as it completes. Listing,
+fetching and the consumer are connected by queues bounded to the window size,
+so memory stays flat however many objects are scanned; nothing is retained
+once the consumer has seen it. ``open_value_scan`` builds the listing and the
+scan together and closes both when its block exits, however it exits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+
+from src.checkpoints import QueryCheckpoints
+from src.concurrency import RatePacer
+from src.deadline import Deadline, DeadlineExceeded, run_with_deadline
+from src.pagination import (
+    DEFAULT_PREFETCH_PAGES,
+    MAX_BATCH_OBJECTS,
+    FetchPage,
+    PageStream,
+    iter_items,
+)
+from src.progress import ProgressCallback
+
+DEFAULT_SCAN_OBJECTS = 1000
+MAX_SCAN_OBJECTS = 100_000
+DEFAULT_SCAN_CONCURRENCY = 16
+MAX_SCAN_CONCURRENCY = MAX_BATCH_OBJECTS
+DEFAULT_SCAN_SAMPLE = 10
+MAX_SCAN_SAMPLE = 100
+MAX_SCAN_RESOURCE_BYTES = 16 * 1024 * 1024
+DEFAULT_SEARCH_MATCHES = 20
+MAX_SEARCH_MATCHES = 200
+
+_DONE = object()
+# Report progress every this many processed objects (and at the end).
+_PROGRESS_EVERY = 100
+
+FetchObject = Callable[[Dict[str, Any]], Awaitable[Any]]
+GetObject = Callable[[str, str, str], Awaitable[Any]]
+
+
+@dataclass
+class ScannedValue:
+    """One listed row and its fetched object, or the error fetching it."""
+
+    row: Dict[str, Any]
+    index: int = 0
+    obj: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ident(self) -> Dict[str, str]:
+        return {
+            "collection": self.row.get("collection", ""),
+            "key": self.row.get("key", ""),
+            "user_id": self.row.get("user_id", ""),
+        }
+
+
+def value_json_bytes(value: Any) -> bytes:
+    """Compact UTF-8 JSON of a decoded value; undecoded strings are taken as-is."""
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class ValueScan:
+    """Listed storage rows fetched through a bounded window, in completion order.
+
+    ``max_rate`` (objects per second) paces fetch starts on top of the window.
+    When the deadline expires, outstanding fetches are cancelled and iteration
+    ends with ``deadline_exceeded``. A listing error ends the scan early; it is
+    raised if no row was listed, otherwise kept in ``listing_error``. A consumer
+    that stops early should ``await aclose()``. ``progress`` is called every
+    _PROGRESS_EVERY processed objects and when the scan finishes.
+    """
+
+    def __init__(
+        self,
+        rows: PageStream,
+        fetch_object: FetchObject,
+        *,
+        concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+        max_rate: Optional[float] = None,
+        deadline: Optional[Deadline] = None,
+        progress: Optional[ProgressCallback] = None,
+    ):
+        self.rows = rows
+        self._fetch_object = fetch_object
+        self.concurrency = max(1, min(int(concurrency), MAX_SCAN_CONCURRENCY))
+        self._pacer = RatePacer(max_rate) if max_rate else None
+        self.deadline = deadline
+        self._progress = progress
+        self._tasks: List[asyncio.Task] = []
+        self.listed = 0
+        self.processed = 0
+        # Rows [0, processed_prefix) of the listing are all processed; a resume
+        # offset that never skips a row even though fetches finish out of order.
+        self.processed_prefix = 0
+        self._done_ahead: Set[int] = set()
+        self.deadline_exceeded = False
+        self.listing_error: Optional[str] = None
+
+    @property
+    def complete(self) -> bool:
+        """Every listed row was processed and the listing itself finished."""
+        return (
+            not self.deadline_exceeded
+            and self.listing_error is None
+            and self.processed == self.listed
+            and self.rows.complete
+        )
+
+    def __aiter__(self) -> AsyncIterator[ScannedValue]:
+        return self._results()
+
+    async def _feed(self, pending: asyncio.Queue) -> None:
+        try:
+            async for row in self.rows:
+                await pending.put((self.listed, row))
+                self.listed += 1
+        except Exception as e:
+            if self.listed == 0:
+                await pending.put(e)
+            else:
+                self.listing_error = str(e)
+        for _ in range(self.concurrency):
+            await pending.put(_DONE)
+
+    async def _work(self, pending: asyncio.Queue, results: asyncio.Queue) -> None:
+        while True:
+            entry = await pending.get()
+            if entry is _DONE or isinstance(entry, Exception):
+                await results.put(entry)
+                return
+            index, row = entry
+            if self._pacer is not None:
+                await self._pacer.wait()
+            try:
+                scanned = ScannedValue(row, index, obj=await self._fetch_object(row))
+            except Exception as e:
+                scanned = ScannedValue(row, index, error=e)
+            await results.put(scanned)
+
+    async def _results(self) -> AsyncIterator[ScannedValue]:
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        self._tasks = [asyncio.ensure_future(self._feed(pending))] + [
+            asyncio.ensure_future(self._work(pending, results))
+            for _ in range(self.concurrency)
+        ]
+        finished = 0
+        try:
+            while finished < self.concurrency:
+                try:
+                    item = await run_with_deadline(self.deadline, results.get())
+                except DeadlineExceeded:
+                    self.deadline_exceeded = True
+                    return
+                if item is _DONE:
+                    finished += 1
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                self.processed += 1
+                self._mark_done(item.index)
+                yield item
+                if self.processed % _PROGRESS_EVERY == 0:
+                    await self._report()
+            self.deadline_exceeded = self.rows.deadline_exceeded
+            await self._report()
+        finally:
+            await self.aclose()
+
+    async def _report(self) -> None:
+        if self._progress is None:
+            return
+        rows = self.rows
+        total = min(rows.limit, rows.total_count) if rows.total_count else rows.limit
+        try:
+            await self._progress(self.processed, max(total, self.processed))
+        except Exception:
+            pass
+
+    def _mark_done(self, index: int) -> None:
+        self._done_ahead.add(index)
+        while self.processed_prefix in self._done_ahead:
+            self._done_ahead.discard(self.processed_prefix)
+            self.processed_prefix += 1
+
+    async def aclose(self) -> None:
+        """Cancel the listing and any fetches still in flight."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await self.rows.aclose()
+
+
+@asynccontextmanager
+async def open_value_scan(
+    fetch_page: FetchPage,
+    get_object: GetObject,
+    *,
+    collection: str,
+    max_objects: int,
+    start_offset: int = 0,
+    checkpoints: Optional[QueryCheckpoints] = None,
+    predicate: Optional[Callable[[Any], bool]] = None,
+    max_scanned: Optional[int] = None,
+    concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+    max_rate: Optional[float] = None,
+    deadline: Optional[Deadline] = None,
+    prefetch: int = DEFAULT_PREFETCH_PAGES,
+    progress: Optional[ProgressCallback] = None,
+) -> AsyncIterator[ValueScan]:
+    """A ``ValueScan`` over a storage listing, closed when the block exits.
+
+    ``get_object(collection, key, user_id)`` fetches one listed row; rows without
+    a collection are taken from ``collection``. Leaving the block, on success,
+    error or cancellation, cancels outstanding fetches and listing read-ahead.
+    """
+    rows = iter_items(
+        fetch_page,
+        items_key="objects",
+        max_objects=max_objects,
+        deadline=deadline,
+        prefetch=prefetch,
+        start_offset=start_offset,
+        checkpoints=checkpoints,
+        predicate=predicate,
+        max_scanned=max_scanned,
+        limit_cap=MAX_SCAN_OBJECTS,
+    )
+
+    async def fetch_object(row: Dict[str, Any]) -> Any:
+        return await get_object(
+            row.get("collection", collection), row.get("key", ""), row.get("user_id", "")
+        )
+
+    scan = ValueScan(
+        rows,
+        fetch_object,
+        concurrency=concurrency,
+        max_rate=max_rate,
+        deadline=deadline,
+        progress=progress,
+    )
+    try:
+        yield scan
+    finally:
+        await scan.aclose()
+
+
+__all__ = [
+    "DEFAULT_SCAN_OBJECTS",
+    "MAX_SCAN_OBJECTS",
+    "DEFAULT_SCAN_CONCURRENCY",
+    "MAX_SCAN_CONCURRENCY",
+    "DEFAULT_SCAN_SAMPLE",
+    "MAX_SCAN_SAMPLE",
+    "MAX_SCAN_RESOURCE_BYTES",
+    "DEFAULT_SEARCH_MATCHES",
+    "MAX_SEARCH_MATCHES",
+    "ScannedValue",
+    "ValueScan",
+    "open_value_scan",
+    "value_json_bytes",
+]
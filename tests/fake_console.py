@@ -0,0 +1,524 @@
+"""In-process fake Nakama Console for tests and benchmarks (no network).
+
+Serves the Console endpoints this project calls through an ``httpx.MockTransport``
+with Nakama-like cursor pagination. Data is synthesized on demand from indices,
+so a dataset can describe millions of storage objects without materializing them.
+
+    console = FakeNakamaConsole(SyntheticDataset(users=1000, collections={"progress": 2_000_000}))
+    client = console.client()
+    await client.authenticate()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import bisect
+import hashlib
+import json
+import random
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import unquote
+
+import httpx
+
+from src.config import NakamaSettings
+from src.nakama_client import NakamaConsoleClient
+
+PAGE_SIZE = 100
+WALLET_LEDGER_MAX_LIMIT = 100
+BASE_EPOCH = 1_700_000_000
+TOKEN_LIFETIME_SECONDS = 3600
+USERNAME = "admin"
+PASSWORD = "secret"
+CONSOLE_URL = "http://fake-console:7351"
+
+
+def user_id_for(index: int) -> str:
+    return f"{index:08x}-0000-4000-8000-00000000fa4e"
+
+
+def user_index(user_id: str) -> Optional[int]:
+    head, _, tail = user_id.partition("-")
+    if not tail.endswith("00000000fa4e"):
+        return None
+    try:
+        return int(head, 16)
+    except ValueError:
+        return None
+
+
+def _iso(seconds: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(seconds))
+
+
+def _encode_cursor(position: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"p": position}).encode()).decode()
+
+
+def _decode_cursor(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode()))["p"])
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {cursor}") from e
+
+
+@dataclass
+class SyntheticDataset:
+    """Deterministic synthetic Nakama data.
+
+    Storage object ``i`` of a collection belongs to user ``i % users`` and has key
+    ``f"{collection}_{i // users:06d}"``, so listings come out ordered by key then
+    user like Nakama's. ``value_bytes`` pads each JSON value to roughly that size.
+    """
+
+    users: int = 100
+    collections: Dict[str, int] = field(default_factory=lambda: {"progress": 1000})
+    value_bytes: int = 256
+    ledger_entries_per_user: int = 50
+    friends_per_user: int = 5
+    groups_per_user: int = 2
+    revisions: Dict[Tuple[str, int], int] = field(default_factory=dict)
+
+    def username(self, index: int) -> str:
+        return f"player{index:06d}"
+
+    def user(self, index: int) -> Dict[str, Any]:
+        return {
+            "id": user_id_for(index),
+            "username": self.username(index),
+            "display_name": f"Player {index}",
+            "lang_tag": "en",
+            "metadata": json.dumps({"vip": index % 10 == 0}),
+            "create_time": _iso(BASE_EPOCH + index),
+            "update_time": _iso(BASE_EPOCH + index * 2),
+        }
+
+    # --- storage -----------------------------------------------------------
+
+    def object_count(self, collection: str) -> int:
+        return self.collections.get(collection, 0)
+
+    def key_for(self, collection: str, index: int) -> str:
+        return f"{collection}_{index // self.users:06d}"
+
+    def object_index(self, collection: str, key: str, user_id: str) -> Optional[int]:
+        prefix = f"{collection}_"
+        u = user_index(user_id)
+        if u is None or u >= self.users or not key.startswith(prefix):
+            return None
+        try:
+            k = int(key[len(prefix):])
+        except ValueError:
+            return None
+        index = k * self.users + u
+        if index >= self.object_count(collection):
+            return None
+        return index
+
+    def touch(self, collection: str, index: int) -> None:
+        """Simulate a write: bumps version and update_time of one object."""
+        self.revisions[(collection, index)] = self.revisions.get((collection, index), 0) + 1
+
+    def value(self, collection: str, index: int) -> Dict[str, Any]:
+        revision = self.revisions.get((collection, index), 0)
+        value: Dict[str, Any] = {
+            "level": index % 100,
+            "gems": (index * 7) % 1000 + revision,
+            "vip": index % 10 == 0,
+            "tier": ["bronze", "silver", "gold"][index % 3],
+            "inventory": [f"item_{(index + n) % 50}" for n in range(3)],
+        }
+        pad = self.value_bytes - len(json.dumps(value)) - len(',"pad":""')
+        if pad > 0:
+            value["pad"] = "x" * pad
+        return value
+
+    def metadata(self, collection: str, index: int) -> Dict[str, Any]:
+        revision = self.revisions.get((collection, index), 0)
+        created = BASE_EPOCH + index
+        digest = hashlib.md5(f"{collection}:{index}:{revision}".encode()).hexdigest()
+        return {
+            "collection": collection,
+            "key": self.key_for(collection, index),
+            "user_id": user_id_for(index % self.users),
+            "version": digest,
+            "permission_read": index % 3,
+            "permission_write": index % 2,
+            "create_time": _iso(created),
+            "update_time": _iso(created + revision * 3600),
+        }
+
+    def storage_object(self, collection: str, index: int) -> Dict[str, Any]:
+        obj = self.metadata(collection, index)
+        obj["value"] = json.dumps(self.value(collection, index), separators=(",", ":"))
+        return obj
+
+    def storage_indices(
+        self,
+        collection: str,
+        *,
+        key: Optional[str] = None,
+        user: Optional[int] = None,
+        start: int = 0,
+    ) -> Iterator[int]:
+        """Object indices matching the filters, in listing order, from ``start``."""
+        count = self.object_count(collection)
+        prefix = key[:-1] if key is not None and key.endswith("%") else None
+        if key is not None:
+            # Keys sort like their index, so jump straight to the first match.
+            n_keys = -(-count // self.users)
+            first_key = bisect.bisect_left(
+                range(n_keys), prefix if prefix is not None else key,
+                key=lambda k: f"{collection}_{k:06d}",
+            )
+            start = max(start, first_key * self.users)
+        if user is not None:
+            start += (user - start) % self.users
+            step = self.users
+        else:
+            step = 1
+        for index in range(start, count, step):
+            if key is not None:
+                k = self.key_for(collection, index)
+                if not (k.startswith(prefix) if prefix is not None else k == key):
+                    return
+            yield index
+
+    # --- accounts ------------------------------------------------------------
+
+    def ledger_entry(self, user: int, n: int) -> Dict[str, Any]:
+        created = BASE_EPOCH + user * 10_000 + n * 60
+        return {
+            "id": f"{user:08x}-{n:04x}-4000-8000-00000000a11e",
+            "user_id": user_id_for(user),
+            "changeset": {"gems": (n % 7) - 3},
+            "metadata": json.dumps({"reason": "synthetic"}),
+            "create_time": _iso(created),
+            "update_time": _iso(created),
+        }
+
+    def account(self, user: int) -> Dict[str, Any]:
+        return {
+            "user": self.user(user),
+            "wallet": json.dumps({"gems": user * 3}),
+            "devices": [{"id": f"device-{user}"}],
+            "custom_id": f"custom-{user}",
+            "disable_time": None,
+        }
+
+    def friends(self, user: int) -> List[Dict[str, Any]]:
+        return [
+            {"user": self.user((user + n) % self.users), "state": 0}
+            for n in range(1, min(self.friends_per_user, self.users - 1) + 1)
+        ]
+
+    def groups(self, user: int) -> List[Dict[str, Any]]:
+        return [
+            {"group": {"id": f"group-{(user + n) % 10}", "name": f"Group {(user + n) % 10}"}, "state": 2}
+            for n in range(self.groups_per_user)
+        ]
+
+    def export(self, user: int) -> Dict[str, Any]:
+        user_id = user_id_for(user)
+        objects = [
+            self.storage_object(collection, index)
+            for collection in self.collections
+            for index in self.storage_indices(collection, user=user)
+        ]
+        return {
+            "account": self.account(user),
+            "objects": objects,
+            "friends": self.friends(user),
+            "groups": self.groups(user),
+            "messages": [],
+            "notifications": [],
+            "leaderboard_records": [],
+            "wallet_ledgers": [
+                self.ledger_entry(user, n) for n in range(self.ledger_entries_per_user)
+            ],
+            "user_id": user_id,
+        }
+
+
+Fault = Union[int, Exception]
+
+
+class FakeNakamaConsole:
+    """httpx MockTransport handler emulating the Nakama Console API.
+
+    ``latency`` is seconds per request (or a callable of the request). Faults:
+    ``error_rate`` injects ``error_status`` randomly; ``fail_next`` queues exact
+    statuses or exceptions for the next requests. ``requests`` counts calls per
+    endpoint label for benchmarks.
+    """
+
+    def __init__(
+        self,
+        dataset: Optional[SyntheticDataset] = None,
+        *,
+        latency: Union[float, Callable[[httpx.Request], float]] = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+    ):
+        self.dataset = dataset or SyntheticDataset()
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._faults: List[Fault] = []
+        self._tokens: Dict[str, float] = {}
+        self.requests: Counter = Counter()
+        self.bytes_sent = 0
+        self.transport = httpx.MockTransport(self.handle)
+
+    # --- harness API -----------------------------------------------------------
+
+    def fail_next(self, *faults: Fault) -> None:
+        self._faults.extend(faults)
+
+    def expire_tokens(self) -> None:
+        self._tokens.clear()
+
+    def settings(self, **overrides: Any) -> NakamaSettings:
+        return NakamaSettings(
+            nakama_console_url=CONSOLE_URL,
+            nakama_username=USERNAME,
+            nakama_password=PASSWORD,
+            **overrides,
+        )
+
+    def client(self, **settings_overrides: Any) -> NakamaConsoleClient:
+        return NakamaConsoleClient(self.settings(**settings_overrides), transport=self.transport)
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    def reset_counters(self) -> None:
+        self.requests.clear()
+        self.bytes_sent = 0
+
+    # --- request handling ---------------------------------------------------
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        delay = self.latency(request) if callable(self.latency) else self.latency
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self._faults:
+            fault = self._faults.pop(0)
+            if isinstance(fault, Exception):
+                raise fault
+            return httpx.Response(fault, json={"error": "injected", "code": fault})
+        if self.error_rate and self._random.random() < self.error_rate:
+            return httpx.Response(self.error_status, json={"error": "injected"})
+
+        path = unquote(request.url.raw_path.decode().split("?", 1)[0])
+        if request.method == "POST" and path == "/v2/console/authenticate":
+            self.requests["authenticate"] += 1
+            return self._authenticate(request)
+
+        if not self._authorized(request):
+            self.requests["unauthorized"] += 1
+            return httpx.Response(401, json={"error": "Auth token invalid", "code": 16})
+
+        for pattern, label, handler in self._routes:
+            match = pattern.match(request.url.raw_path.decode().split("?", 1)[0])
+            if match and request.method == "GET":
+                self.requests[label] += 1
+                try:
+                    status, body = handler(self, request, *(unquote(g) for g in match.groups()))
+                except ValueError as e:
+                    status, body = 400, {"error": str(e), "code": 3}
+                payload = json.dumps(body, separators=(",", ":")).encode()
+                self.bytes_sent += len(payload)
+                return httpx.Response(
+                    status, content=payload, headers={"content-type": "application/json"}
+                )
+
+        self.requests["not_found"] += 1
+        return httpx.Response(404, json={"error": "Not Found", "code": 5})
+
+    def _authenticate(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content or b"{}")
+        if body.get("username") != USERNAME or body.get("password") != PASSWORD:
+            return httpx.Response(401, json={"error": "Invalid credentials", "code": 16})
+        exp = int(time.time()) + TOKEN_LIFETIME_SECONDS
+        claims = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode().rstrip("=")
+        token = f"eyJhbGciOiJIUzI1NiJ9.{claims}.{len(self._tokens):x}"
+        self._tokens[token] = exp
+        return httpx.Response(200, json={"token": token})
+
+    def _authorized(self, request: httpx.Request) -> bool:
+        header = request.headers.get("authorization", "")
+        token = header[len("Bearer "):] if header.startswith("Bearer ") else ""
+        exp = self._tokens.get(token)
+        return exp is not None and exp > time.time()
+
+    # --- endpoints (return status, body) -------------------------------------------
+
+    def _status(self, request: httpx.Request):
+        return 200, {
+            "nodes": [{"name": "nakama1", "health": "STATUS_HEALTH_OK", "session_count": 0}],
+            "timestamp": _iso(int(time.time())),
+        }
+
+    def _collections(self, request: httpx.Request):
+        return 200, {"collections": sorted(self.dataset.collections)}
+
+    def _storage_list(self, request: httpx.Request):
+        params = request.url.params
+        collection = params.get("collection")
+        key = params.get("key")
+        user_id = params.get("user_id")
+        cursor = params.get("cursor")
+        ds = self.dataset
+
+        user = None
+        if user_id is not None:
+            user = user_index(user_id)
+            if user is None or user >= ds.users:
+                return 200, {"objects": [], "total_count": 0}
+
+        if collection is None:
+            if user is None:
+                return 200, {"objects": [], "total_count": 0}
+            if cursor:
+                raise ValueError("Cursor not allowed when filter only contains user ID.")
+            # Nakama returns every object of the user in one unpaginated response.
+            objects = [
+                ds.metadata(c, i) for c in ds.collections for i in ds.storage_indices(c, user=user)
+            ]
+            return 200, {"objects": objects, "total_count": len(objects)}
+
+        start = _decode_cursor(cursor)
+        objects = []
+        next_index = None
+        for index in ds.storage_indices(collection, key=key, user=user, start=start):
+            if len(objects) == PAGE_SIZE:
+                next_index = index
+                break
+            objects.append(ds.metadata(collection, index))
+
+        if user is not None:
+            total = len(range(user, ds.object_count(collection), ds.users))
+        else:
+            total = ds.object_count(collection)
+        body: Dict[str, Any] = {"objects": objects, "total_count": total}
+        if next_index is not None:
+            body["next_cursor"] = _encode_cursor(next_index)
+        return 200, body
+
+    def _storage_get(self, request: httpx.Request, collection: str, key: str, user_id: str):
+        index = self.dataset.object_index(collection, key, user_id)
+        if index is None:
+            return 404, {"error": "Storage not found.", "code": 5}
+        return 200, self.dataset.storage_object(collection, index)
+
+    def _account_list(self, request: httpx.Request):
+        params = request.url.params
+        ds = self.dataset
+        filter_value = params.get("filter")
+        if filter_value:
+            index = user_index(filter_value)
+            if index is None and filter_value.startswith("player"):
+                try:
+                    index = int(filter_value[len("player"):])
+                except ValueError:
+                    index = None
+            users = [ds.user(index)] if index is not None and index < ds.users else []
+            return 200, {"users": users, "total_count": len(users)}
+
+        start = _decode_cursor(params.get("cursor"))
+        end = min(start + PAGE_SIZE, ds.users)
+        body: Dict[str, Any] = {
+            "users": [ds.user(i) for i in range(start, end)],
+            "total_count": ds.users,
+        }
+        if end < ds.users:
+            body["next_cursor"] = _encode_cursor(end)
+        return 200, body
+
+    def _user_or_404(self, user_id: str) -> Optional[int]:
+        index = user_index(user_id)
+        if index is None or index >= self.dataset.users:
+            return None
+        return index
+
+    def _account_get(self, request: httpx.Request, user_id: str):
+        index = self._user_or_404(user_id)
+        if index is None:
+            return 404, {"error": "Account not found.", "code": 5}
+        return 200, self.dataset.account(index)
+
+    def _account_export(self, request: httpx.Request, user_id: str):
+        index = self._user_or_404(user_id)
+        if index is None:
+            return 404, {"error": "Account not found.", "code": 5}
+        return 200, self.dataset.export(index)
+
+    def _account_friends(self, request: httpx.Request, user_id: str):
+        index = self._user_or_404(user_id)
+        if index is None:
+            return 404, {"error": "Account not found.", "code": 5}
+        return 200, {"friends": self.dataset.friends(index), "cursor": ""}
+
+    def _account_groups(self, request: httpx.Request, user_id: str):
+        index = self._user_or_404(user_id)
+        if index is None:
+            return 404, {"error": "Account not found.", "code": 5}
+        return 200, {"groups": self.dataset.groups(index), "cursor": ""}
+
+    def _account_wallet(self, request: httpx.Request, user_id: str):
+        index = self._user_or_404(user_id)
+        if index is None:
+            return 404, {"error": "Account not found.", "code": 5}
+        params = request.url.params
+        limit = int(params.get("limit", WALLET_LEDGER_MAX_LIMIT))
+        if not 1 <= limit <= WALLET_LEDGER_MAX_LIMIT:
+            raise ValueError("Invalid limit - limit must be between 1 and 100.")
+        after, before = params.get("after"), params.get("before")
+        entries = [
+            self.dataset.ledger_entry(index, n)
+            for n in range(self.dataset.ledger_entries_per_user)
+        ]
+        entries = [
+            e
+            for e in entries
+            if (after is None or e["create_time"] > after)
+            and (before is None or e["create_time"] < before)
+        ]
+        start = _decode_cursor(params.get("cursor"))
+        page = entries[start:start + limit]
+        next_cursor = _encode_cursor(start + limit) if start + limit < len(entries) else ""
+        return 200, {"items": page, "next_cursor": next_cursor, "prev_cursor": ""}
+
+    _routes = [
+        (re.compile(r"^/v2/console/status$"), "status", _status),
+        (re.compile(r"^/v2/console/storage/collections$"), "storage_collections", _collections),
+        (re.compile(r"^/v2/console/storage$"), "storage_list", _storage_list),
+        (re.compile(r"^/v2/console/storage/([^/]+)/([^/]+)/([^/]+)$"), "storage_get", _storage_get),
+        (re.compile(r"^/v2/console/account$"), "account_list", _account_list),
+        (re.compile(r"^/v2/console/account/([^/]+)$"), "account_get", _account_get),
+        (re.compile(r"^/v2/console/account/([^/]+)/export$"), "account_export", _account_export),
+        (re.compile(r"^/v2/console/account/([^/]+)/friend$"), "account_friends", _account_friends),
+        (re.compile(r"^/v2/console/account/([^/]+)/group$"), "account_groups", _account_groups),
+        (re.compile(r"^/v2/console/account/([^/]+)/wallet$"), "account_wallet", _account_wallet),
+    ]
+
+
+__all__ = [
+    "PAGE_SIZE",
+    "SyntheticDataset",
+    "FakeNakamaConsole",
+    "user_id_for",
+    "user_index",
+]
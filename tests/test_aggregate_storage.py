@@ -0,0 +1,188 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from src.aggregation import MISSING_LABEL, StorageAggregator, hash_sampler
+from src.deadline import Deadline
+from src.models import AggregateStorageArgs
+from src.tools import storage
+from src.tools.scan import nakama_aggregate_storage
+from tests.fake_console import FakeNakamaConsole, SyntheticDataset
+
+
+@pytest_asyncio.fixture
+async def console_client():
+    console = FakeNakamaConsole(SyntheticDataset(users=20, collections={"progress": 300}))
+    client = console.client()
+    await client.authenticate()
+    yield console, client
+    await client.close()
+
+
+def test_aggregator_fields_histogram_and_groups():
+    agg = StorageAggregator(
+        fields=["stats.level"], histogram_path="tier", group_by="tier", max_groups=1
+    )
+    for level, tier in ((1, "gold"), (5, "gold"), (3, "silver")):
+        agg.add({"stats": {"level": level}, "tier": tier})
+    agg.add({"stats": {"level": "high"}})
+    agg.add("not json")
+
+    summary = agg.summary()
+
+    assert summary["count"] == 4
+    assert summary["undecodable"] == 1
+    assert summary["fields"]["stats.level"] == {
+        "count": 3, "sum": 9, "min": 1, "max": 5, "mean": 3, "missing": 0, "non_numeric": 1,
+    }
+    assert summary["histogram"]["values"] == {"gold": 2, "silver": 1, MISSING_LABEL: 1}
+    assert summary["groups"] == [
+        {"group": "gold", "count": 2, "fields": {
+            "stats.level": {"count": 2, "sum": 6, "min": 1, "max": 5, "mean": 3},
+        }},
+    ]
+    assert summary["distinct_groups"] == 3
+    assert summary["other_groups_count"] == 2
+
+
+def test_numeric_buckets_and_sampled_estimates():
+    agg = StorageAggregator(
+        fields=["n"], histogram_path="n", bucket_width=10, sample_rate=0.25
+    )
+    for n in (1, 9, 10, 25, 2.5):
+        agg.add({"n": n})
+
+    summary = agg.summary()
+
+    assert summary["histogram"]["buckets"] == {"[0, 10)": 3, "[10, 20)": 1, "[20, 30)": 1}
+    assert summary["estimated_count"] == 20
+    assert summary["fields"]["n"]["sum"] == 47.5
+    assert summary["fields"]["n"]["estimated_sum"] == 190
+
+
+def test_hash_sampler_is_deterministic():
+    rows = [{"collection": "c", "key": f"k{i}", "user_id": "u"} for i in range(2000)]
+    keep = hash_sampler(0.1)
+    kept = [row["key"] for row in rows if keep(row)]
+
+    assert kept == [row["key"] for row in rows if hash_sampler(0.1)(row)]
+    assert 100 < len(kept) < 300
+
+
+@pytest.mark.asyncio
+async def test_aggregates_whole_collection(console_client):
+    _, client = console_client
+
+    result = await nakama_aggregate_storage(
+        client,
+        collection="progress",
+        fields=["level"],
+        histogram_path="level",
+        bucket_width=50,
+        group_by="tier",
+    )
+
+    assert result["complete"] is True
+    assert result["approximate"] is False
+    assert result["count"] == 300
+    assert result["fields"]["level"]["sum"] == 3 * sum(range(100))
+    assert result["fields"]["level"]["max"] == 99
+    assert result["histogram"]["buckets"] == {"[0, 50)": 150, "[50, 100)": 150}
+    assert sorted((g["group"], g["count"]) for g in result["groups"]) == [
+        ("bronze", 100), ("gold", 100), ("silver", 100),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sampling_fetches_a_fraction_and_extrapolates(console_client):
+    console, client = console_client
+    console.reset_counters()
+
+    result = await nakama_aggregate_storage(
+        client, collection="progress", fields=["gems"], sample_rate=0.5
+    )
+
+    assert result["approximate"] is True
+    assert result["listed"] == 300
+    assert 90 < result["count"] < 210
+    assert result["estimated_count"] == result["count"] * 2
+    assert console.total_requests < 300
+    assert "estimate" in result["hint"]
+
+
+@pytest.mark.asyncio
+async def test_limit_returns_resume_offset(console_client):
+    _, client = console_client
+
+    result = await nakama_aggregate_storage(client, collection="progress", max_objects=120)
+
+    assert result["count"] == 120
+    assert result["limit_reached"] is True
+    assert result["next_offset"] == 120
+
+
+@pytest.mark.asyncio
+async def test_sampled_resume_offset_moves_forward_from_start_offset():
+    console = FakeNakamaConsole(SyntheticDataset(users=20, collections={"progress": 5000}))
+    client = console.client()
+    await client.authenticate()
+
+    # No checkpoints: the listing pages from the start to reach row 2000.
+    result = await nakama_aggregate_storage(
+        client, collection="progress", sample_rate=0.5, max_objects=500, start_offset=2000
+    )
+    await client.close()
+
+    assert result["limit_reached"] is True
+    assert result["listed"] == 500
+    assert result["next_offset"] == 2500
+
+
+@pytest.mark.asyncio
+async def test_deadline_returns_resume_offset(console_client):
+    console, client = console_client
+    console.latency = 0.02
+
+    result = await nakama_aggregate_storage(
+        client, collection="progress", fields=["gems"], deadline=Deadline(0.1, reserve=0)
+    )
+
+    assert result["deadline_exceeded"] is True
+    assert result["complete"] is False
+    assert 0 < result["next_offset"] <= result["processed"] < 300
+    assert "next_offset" in result["hint"]
+
+
+@pytest.mark.asyncio
+async def test_large_values_decode_off_the_event_loop(monkeypatch):
+    console = FakeNakamaConsole(
+        SyntheticDataset(users=2, collections={"big": 3}, value_bytes=80 * 1024)
+    )
+    client = console.client()
+    await client.authenticate()
+    offloaded = []
+    real_to_thread = asyncio.to_thread
+
+    async def spy(func, *args):
+        offloaded.append(func)
+        return await real_to_thread(func, *args)
+
+    monkeypatch.setattr(storage.asyncio, "to_thread", spy)
+    try:
+        result = await nakama_aggregate_storage(client, collection="big", fields=["level"])
+    finally:
+        await client.close()
+
+    assert result["fields"]["level"]["count"] == 3
+    assert len(offloaded) == 3
+
+
+def test_args_validate_paths():
+    with pytest.raises(ValueError):
+        AggregateStorageArgs(collection="c", bucket_width=5)
+    with pytest.raises(ValueError):
+        AggregateStorageArgs(collection="c", group_by="a..b")
+    with pytest.raises(ValueError):
+        AggregateStorageArgs(collection="c", sample_rate=0)
+    assert AggregateStorageArgs(collection="c", fields=["a", "a"]).fields == ["a"]
@@ -0,0 +1,133 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+from src.deadline import Deadline
+from src.pagination import MAX_BATCH_OBJECTS
+from src.progress import progress_reporter
+from src.resources import BATCH_RESOURCE_SCHEME, ExportCache
+from src.tool_result import ToolResult
+from src.tools.storage import nakama_get_storage_objects
+from tests.fake_console import FakeNakamaConsole, SyntheticDataset, user_id_for
+
+
+@pytest_asyncio.fixture
+async def console_client():
+    console = FakeNakamaConsole(SyntheticDataset(users=20, collections={"progress": 500}))
+    client = console.client()
+    await client.authenticate()
+    yield console, client
+    await client.close()
+
+
+def _ids(console, indices):
+    ds = console.dataset
+    return [
+        {
+            "collection": "progress",
+            "key": ds.key_for("progress", i),
+            "user_id": user_id_for(i % ds.users),
+        }
+        for i in indices
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_beyond_worker_count_keeps_input_order(console_client):
+    console, client = console_client
+    indices = list(range(MAX_BATCH_OBJECTS * 3 + 7))[::-1]
+    ids = _ids(console, indices)
+    console.reset_counters()
+
+    result = await nakama_get_storage_objects(client, objects=ids, include_value=False)
+
+    assert result["fetched"] == len(ids)
+    assert result["complete"] is True
+    assert [r["key"] for r in result["results"]] == [i["key"] for i in ids]
+    assert console.total_requests == len(ids)
+
+
+@pytest.mark.asyncio
+async def test_batch_fetches_repeated_ids_once(console_client):
+    console, client = console_client
+    ids = _ids(console, [1, 2, 1, 3, 2, 1])
+    console.reset_counters()
+
+    result = await nakama_get_storage_objects(client, objects=ids)
+
+    assert result["unique"] == 3
+    assert result["duplicates"] == 3
+    assert result["fetched"] == 6
+    assert [r["key"] for r in result["results"]] == [i["key"] for i in ids]
+    assert console.total_requests == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_progress_through_to_total(console_client):
+    console, client = console_client
+    ids = _ids(console, range(120))
+    calls = []
+
+    async def progress(done, total):
+        calls.append((done, total))
+
+    await nakama_get_storage_objects(client, objects=ids, progress=progress)
+
+    assert calls
+    assert calls[-1] == (120, 120)
+    assert [done for done, _ in calls] == sorted(done for done, _ in calls)
+    assert len(calls) < 120
+
+
+@pytest.mark.asyncio
+async def test_batch_spills_to_resource(console_client):
+    console, client = console_client
+    cache = ExportCache()
+    ids = _ids(console, range(10))
+
+    result = await nakama_get_storage_objects(
+        client, objects=ids, response_mode="resource", export_cache=cache
+    )
+
+    assert isinstance(result, ToolResult)
+    assert result.structured["results"] == []
+    assert result.structured["fetched"] == 10
+    uri = result.structured["resource_uri"]
+    assert uri.startswith(BATCH_RESOURCE_SCHEME + "/")
+    stored = json.loads(cache.get(uri).payload)
+    assert [r["key"] for r in stored["results"]] == [i["key"] for i in ids]
+
+
+@pytest.mark.asyncio
+async def test_batch_deadline_marks_unfetched_items(console_client):
+    console, client = console_client
+    console.latency = 0.05
+    ids = _ids(console, range(MAX_BATCH_OBJECTS * 2))
+
+    result = await nakama_get_storage_objects(client, objects=ids, deadline=Deadline(0.01))
+
+    assert result["deadline_exceeded"] is True
+    assert result["complete"] is False
+    assert len(result["results"]) == len(ids)
+    assert result["failed"] == len(ids) - result["fetched"]
+
+
+@pytest.mark.asyncio
+async def test_progress_reporter_uses_request_progress_token():
+    sent = []
+
+    class Session:
+        async def send_progress_notification(self, token, progress, **kwargs):
+            sent.append((token, progress, kwargs["total"]))
+
+    class Server:
+        request_context = SimpleNamespace(
+            meta=SimpleNamespace(progressToken="tok"), session=Session(), request_id=7
+        )
+
+    assert progress_reporter(object()) is None
+    report = progress_reporter(Server())
+    await report(5, 10)
+    assert sent == [("tok", 5.0, 10.0)]
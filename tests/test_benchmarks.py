@@ -0,0 +1,29 @@
+import json
+
+import pytest
+
+from benchmarks.bench_tools import TOOL_CASES, run_benchmarks, write_report
+from src.tools.registry import TOOL_SPECS
+
+
+def test_every_registered_tool_has_a_benchmark_case():
+    assert {spec.name for spec in TOOL_SPECS} <= set(TOOL_CASES)
+
+
+@pytest.mark.asyncio
+async def test_smoke_run_reports_all_tools(tmp_path):
+    results = await run_benchmarks(datasets=["small"], concurrency_levels=[2], iterations=2)
+
+    assert {r.tool for r in results} == {spec.name for spec in TOOL_SPECS}
+    assert all(r.errors == 0 for r in results)
+    assert all(r.calls == 2 for r in results)
+    batch = next(r for r in results if r.tool == "nakama_get_storage_objects")
+    assert batch.console_calls_per_tool_call == 50
+
+    path = tmp_path / "bench.json"
+    write_report(results, path, {"iterations": 2})
+    report = json.loads(path.read_text())
+    assert report["meta"]["iterations"] == 2
+    assert {"p50_ms", "p95_ms", "p99_ms", "requests_per_sec", "peak_memory_kb"} <= set(
+        report["results"][0]
+    )
@@ -0,0 +1,154 @@
+import pytest
+import pytest_asyncio
+from pydantic import ValidationError
+
+from src.checkpoints import CursorCheckpoints
+from src.models import ListStorageArgs
+from src.pagination import fetch_page_once, fetch_pages
+from src.tools.storage import nakama_list_storage
+from tests.fake_console import FakeNakamaConsole, SyntheticDataset
+
+
+def test_nearest_returns_closest_checkpoint_at_or_before_offset():
+    store = CursorCheckpoints()
+    query = store.for_query("/v2/console/storage", {"collection": "c"})
+    for offset in (100, 200, 300):
+        query.record(offset, f"c{offset}")
+
+    assert query.nearest(250) == (200, "c200")
+    assert query.nearest(300) == (300, "c300")
+    assert query.nearest(50) == (0, None)
+    assert query.offset_of("c200") == 200
+    # Params order is irrelevant; other queries never share cursors.
+    assert store.for_query("/v2/console/storage", {"collection": "c"}).nearest(999) == (
+        300,
+        "c300",
+    )
+    assert store.for_query("/v2/console/storage", {"collection": "d"}).nearest(999) == (0, None)
+
+
+def test_checkpoints_expire_and_are_bounded(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("src.checkpoints.time.monotonic", lambda: clock[0])
+    store = CursorCheckpoints(ttl_seconds=10, max_queries=2, max_per_query=2)
+    query = store.for_query("/p")
+    query.record(100, "a")
+    clock[0] = 5
+    query.record(200, "b")
+    query.record(300, "c")
+
+    assert query.nearest(150) == (0, None)  # offset 100 (oldest) was dropped
+    clock[0] = 16
+    assert query.nearest(300) == (0, None)
+    assert query.offset_of("c") is None
+
+    store.for_query("/q").record(100, "q")
+    store.for_query("/r").record(100, "r")
+    assert store.stats()["queries"] == 2
+
+
+def _pages(count, per_page, log):
+    async def fetch_page(cursor):
+        log.append(cursor)
+        index = int(cursor or 0)
+        page = {"objects": [{"n": index * per_page + n} for n in range(per_page)]}
+        if index + 1 < count:
+            page["next_cursor"] = str(index + 1)
+        return page
+
+    return fetch_page
+
+
+@pytest.mark.asyncio
+async def test_start_offset_skips_rows_and_reuses_checkpoints():
+    store = CursorCheckpoints()
+    log = []
+    fetch_page = _pages(20, 10, log)
+
+    first = await fetch_pages(
+        fetch_page,
+        items_key="objects",
+        max_objects=5,
+        start_offset=73,
+        checkpoints=store.for_query("/p"),
+        prefetch=0,
+    )
+    assert [o["n"] for o in first["objects"]] == [73, 74, 75, 76, 77]
+    assert first["checkpoint_offset"] == 0
+    assert len(log) == 8
+
+    log.clear()
+    second = await fetch_pages(
+        fetch_page,
+        items_key="objects",
+        max_objects=5,
+        start_offset=75,
+        checkpoints=store.for_query("/p"),
+        prefetch=0,
+    )
+    assert [o["n"] for o in second["objects"]] == [75, 76, 77, 78, 79]
+    assert second["checkpoint_offset"] == 70
+    assert log == ["7"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_once_extends_checkpoints_along_a_cursor_chain():
+    query = CursorCheckpoints().for_query("/p")
+    log = []
+    fetch_page = _pages(5, 10, log)
+
+    page = await fetch_page_once(fetch_page, items_key="objects", checkpoints=query)
+    page = await fetch_page_once(
+        fetch_page, items_key="objects", cursor=page["next_cursor"], checkpoints=query
+    )
+
+    assert query.nearest(25) == (20, "2")
+
+    # A cursor the index has never seen cannot be placed, so nothing is recorded.
+    await fetch_page_once(fetch_page, items_key="objects", cursor="3", checkpoints=query)
+    assert query.offset_of("4") is None
+
+
+def test_start_offset_and_cursor_are_exclusive():
+    with pytest.raises(ValidationError, match="either cursor or start_offset"):
+        ListStorageArgs.model_validate({"cursor": "abc", "start_offset": 10})
+
+
+@pytest_asyncio.fixture
+async def console_client():
+    console = FakeNakamaConsole(SyntheticDataset(users=50, collections={"progress": 2000}))
+    client = console.client()
+    await client.authenticate()
+    yield console, client
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_list_storage_start_offset_jumps_to_checkpoint(console_client):
+    console, client = console_client
+    checkpoints = CursorCheckpoints()
+
+    full = await nakama_list_storage(client, collection="progress", max_objects=1000)
+    console.reset_counters()
+    deep = await nakama_list_storage(
+        client,
+        collection="progress",
+        start_offset=950,
+        max_objects=20,
+        checkpoints=checkpoints,
+    )
+    assert [o["key"] for o in deep["objects"]] == [o["key"] for o in full["objects"][950:970]]
+    assert deep["checkpoint_offset"] == 0
+    cold_requests = console.requests["storage_list"]
+
+    console.reset_counters()
+    again = await nakama_list_storage(
+        client,
+        collection="progress",
+        start_offset=960,
+        max_objects=20,
+        checkpoints=checkpoints,
+    )
+    assert again["checkpoint_offset"] == 900
+    assert [o["key"] for o in again["objects"]] == [o["key"] for o in full["objects"][960:980]]
+    assert console.requests["storage_list"] < cold_requests
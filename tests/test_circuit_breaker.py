@@ -0,0 +1,125 @@
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.circuit_breaker import CircuitBreaker, ConsoleUnavailableError
+from src.nakama_client import NakamaConsoleClient
+from src.tools.status import nakama_status
+from tests.test_nakama_client import _settings
+
+
+def test_opens_after_threshold_and_rejects():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    with pytest.raises(ConsoleUnavailableError, match="circuit open"):
+        breaker.before_request()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_half_open_probe_closes_on_success():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    with patch("src.circuit_breaker.time.monotonic", return_value=100.0):
+        breaker.record_failure()
+    with patch("src.circuit_breaker.time.monotonic", return_value=131.0):
+        assert breaker.state == "half_open"
+        breaker.before_request()  # probe admitted
+        with pytest.raises(ConsoleUnavailableError):
+            breaker.before_request()  # only one probe at a time
+        breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    with patch("src.circuit_breaker.time.monotonic", return_value=100.0):
+        for _ in range(3):
+            breaker.record_failure()
+    with patch("src.circuit_breaker.time.monotonic", return_value=131.0):
+        probe = breaker.before_request()
+        breaker.record_failure(probe)
+        assert breaker.state == "open"
+        assert breaker.stats()["next_probe_in"] == 30.0
+
+
+def test_only_the_probe_frees_the_probe_slot():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    assert breaker.before_request() is None  # closed: an ordinary request
+    with patch("src.circuit_breaker.time.monotonic", return_value=100.0):
+        breaker.record_failure()
+    with patch("src.circuit_breaker.time.monotonic", return_value=131.0):
+        probe = breaker.before_request()
+        assert probe is not None
+        # A request admitted before the circuit opened is cancelled mid-probe.
+        breaker.record_abandoned(None)
+        with pytest.raises(ConsoleUnavailableError):
+            breaker.before_request()
+        breaker.record_abandoned(probe)
+        assert breaker.before_request() == probe + 1
+
+
+@pytest.mark.asyncio
+async def test_client_fails_fast_once_open():
+    settings = _settings().model_copy(
+        update={
+            "nakama_breaker_failure_threshold": 2,
+            "nakama_retry_max_attempts": 1,
+        }
+    )
+    client = NakamaConsoleClient(settings)
+    client._token = "token"
+
+    with patch.object(client._client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.side_effect = httpx.ConnectError("refused")
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                await client.get("/v2/console/account")
+        with pytest.raises(ConsoleUnavailableError):
+            await client.get("/v2/console/account")
+
+    assert mock_request.await_count == 2
+    assert client.stats()["breaker"]["state"] == "open"
+
+    status = await nakama_status(client, settings)
+    assert status["breaker_state"] == "open"
+    assert "circuit breaker" in status["hint"]
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_probe_cancelled_while_queued_for_a_slot_is_handed_back():
+    client = NakamaConsoleClient(_settings())
+    client._token = "token"
+    client.breaker.failure_threshold = 1
+    client.breaker.record_failure()
+    client.breaker.reset_timeout = 0  # Half-open: the next request is the probe.
+    held = client.limiter.limit
+    for _ in range(held):
+        await client.limiter.acquire()
+
+    ok = MagicMock(status_code=200, raise_for_status=MagicMock())
+    ok.json = MagicMock(return_value={"ok": True})
+    with patch.object(client._client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.return_value = ok
+        blocked = asyncio.ensure_future(client.get("/v2/console/account"))
+        await asyncio.sleep(0.01)
+        assert client.breaker.probes == 1
+        blocked.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await blocked
+        await asyncio.sleep(0.01)  # Let the coalesced request task unwind.
+        for _ in range(held):
+            client.limiter.release()
+
+        assert await client.get("/v2/console/account/u1") == {"ok": True}
+
+    assert client.breaker.probes == 2
+    assert client.breaker.state == "closed"
+    await client.close()
@@ -0,0 +1,114 @@
+import asyncio
+import gc
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.concurrency import AdaptiveLimiter, RatePacer
+from src.nakama_client import NakamaConsoleClient
+from tests.test_nakama_client import _settings
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_while_saturated_and_healthy():
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=4)
+    for _ in range(20):
+        held = limiter.limit
+        for _ in range(held):
+            await limiter.acquire()
+        for _ in range(held):
+            limiter.release(latency=0.01)
+    assert limiter.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_limit_does_not_grow_when_underused():
+    limiter = AdaptiveLimiter(initial_limit=4)
+    for _ in range(20):
+        await limiter.acquire()
+        limiter.release(latency=0.01)
+    assert limiter.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_overload_decreases_once_per_window():
+    limiter = AdaptiveLimiter(initial_limit=10, min_limit=2)
+    for _ in range(3):
+        await limiter.acquire()
+    for _ in range(3):
+        limiter.release(overloaded=True)
+    assert limiter.limit == 7
+    assert limiter.stats()["overloads"] == 3
+    assert limiter.stats()["decreases"] == 1
+
+
+@pytest.mark.asyncio
+async def test_latency_spike_sheds_load():
+    limiter = AdaptiveLimiter(initial_limit=10)
+    await limiter.acquire()
+    limiter.release(latency=0.01)
+    await limiter.acquire()
+    limiter.release(latency=1.0)
+    assert limiter.limit < 10
+
+
+@pytest.mark.asyncio
+async def test_waiters_queue_beyond_limit_and_cancel_cleanly():
+    limiter = AdaptiveLimiter(initial_limit=1)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    cancelled = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.stats()["waiting"] == 2
+
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    limiter.release(latency=0.01)
+    await asyncio.wait_for(waiter, 1)
+    assert limiter.stats()["in_use"] == 1
+    assert limiter.stats()["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_client_requests_respect_shared_limit():
+    # A full GC pass landing mid-test reads as a latency spike and backs the limit off.
+    gc.collect()
+    settings = _settings().model_copy(
+        update={"nakama_concurrency_initial": 3, "nakama_concurrency_max": 3}
+    )
+    client = NakamaConsoleClient(settings)
+    client._token = "token"
+    state = {"current": 0, "peak": 0}
+
+    async def fake_request(method, url, **kwargs):
+        state["current"] += 1
+        state["peak"] = max(state["peak"], state["current"])
+        await asyncio.sleep(0.01)
+        state["current"] -= 1
+        resp = MagicMock()
+        resp.status_code = 200
+        resp.raise_for_status = MagicMock()
+        resp.json = MagicMock(return_value={})
+        return resp
+
+    with patch.object(client._client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.side_effect = fake_request
+        await asyncio.gather(
+            *(client.get(f"/v2/console/storage/FG/{i}/u1") for i in range(12))
+        )
+
+    assert state["peak"] == 3
+    assert client.stats()["concurrency"]["limit"] == 3
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_rate_pacer_spaces_waits():
+    pacer = RatePacer(50)
+    started = time.monotonic()
+    for _ in range(6):
+        await pacer.wait()
+    assert time.monotonic() - started >= 5 / 50 * 0.9
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from src.deadline import Deadline, DeadlineExceeded
+from src.pagination import fetch_page_once, fetch_pages
+from src.tools.storage import nakama_get_storage_objects
+
+
+def test_unbounded_deadline_never_expires():
+    deadline = Deadline(None)
+    assert deadline.remaining() is None
+    assert deadline.expired is False
+
+
+@pytest.mark.asyncio
+async def test_run_cancels_work_past_the_budget():
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(DeadlineExceeded):
+        await Deadline(0.05, reserve=0).run(slow())
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_fetch_pages_returns_partial_results_with_resumable_cursor():
+    async def fetch_page(cursor):
+        if cursor == "p3":
+            await asyncio.sleep(10)
+        next_cursor = {None: "p2", "p2": "p3"}[cursor]
+        return {"objects": [{"key": cursor or "p1"}], "total_count": 5, "next_cursor": next_cursor}
+
+    envelope = await fetch_pages(
+        fetch_page,
+        items_key="objects",
+        max_objects=100,
+        deadline=Deadline(0.1, reserve=0),
+    )
+    assert envelope["fetched"] == 2
+    assert envelope["complete"] is False
+    assert envelope["deadline_exceeded"] is True
+    assert envelope["next_cursor"] == "p3"
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_once_timeout_retries_same_cursor():
+    async def fetch_page(cursor):
+        await asyncio.sleep(10)
+
+    envelope = await fetch_page_once(
+        fetch_page,
+        items_key="objects",
+        cursor="p7",
+        deadline=Deadline(0.05, reserve=0),
+    )
+    assert envelope["fetched"] == 0
+    assert envelope["complete"] is False
+    assert envelope["next_cursor"] == "p7"
+    assert envelope["deadline_exceeded"] is True
+
+
+@pytest.mark.asyncio
+async def test_batch_get_reports_unfinished_items():
+    class SlowClient:
+        async def get(self, path, params=None):
+            if "/slow/" in path:
+                await asyncio.sleep(10)
+            return {"collection": "FG", "key": path.rsplit("/", 2)[-2], "value": "{}"}
+
+    result = await nakama_get_storage_objects(
+        SlowClient(),
+        objects=[
+            {"collection": "FG", "key": "fast", "user_id": "u1"},
+            {"collection": "slow", "key": "k", "user_id": "u1"},
+        ],
+        deadline=Deadline(0.1, reserve=0),
+    )
+    assert result["fetched"] == 1
+    assert result["failed"] == 1
+    assert result["complete"] is False
+    assert result["deadline_exceeded"] is True
+    assert result["results"][0]["ok"] is True
+    assert "Deadline" in result["results"][1]["error"]
@@ -0,0 +1,136 @@
+import httpx
+import pytest
+import pytest_asyncio
+
+from src.tools.accounts import (
+    nakama_export_account,
+    nakama_get_account,
+    nakama_list_accounts,
+    nakama_list_wallet_ledger,
+)
+from src.tools.status import nakama_status
+from src.tools.storage import (
+    nakama_get_storage_objects,
+    nakama_list_collections,
+    nakama_list_storage,
+    nakama_list_storage_keys,
+)
+from src.resources import ExportCache
+from tests.fake_console import FakeNakamaConsole, SyntheticDataset, user_id_for
+
+
+@pytest_asyncio.fixture
+async def console_client():
+    console = FakeNakamaConsole(
+        SyntheticDataset(users=50, collections={"progress": 1000, "inventory": 120})
+    )
+    client = console.client()
+    await client.authenticate()
+    yield console, client
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_storage_listing_follows_cursors(console_client):
+    console, client = console_client
+
+    result = await nakama_list_storage(client, collection="progress", max_objects=250)
+    assert result["fetched"] == 250
+    assert result["total_count"] == 1000
+    assert result["complete"] is False
+    assert console.requests["storage_list"] == 3
+
+    keys = [(o["key"], o["user_id"]) for o in result["objects"]]
+    assert keys == sorted(keys)
+    assert len(set(keys)) == 250
+
+
+@pytest.mark.asyncio
+async def test_storage_filters_by_user_and_prefix(console_client):
+    _, client = console_client
+    user = user_id_for(7)
+
+    by_user = await nakama_list_storage(client, collection="progress", user_id=user)
+    assert by_user["fetched"] == 20
+    assert all(o["user_id"] == user for o in by_user["objects"])
+
+    by_prefix = await nakama_list_storage_keys(
+        client, collection="progress", key_prefix="progress_00001%", max_objects=1000
+    )
+    assert by_prefix["fetched"] == 500
+    assert by_prefix["complete"] is True
+    assert {k["key"] for k in by_prefix["keys"]} == {
+        f"progress_{n:06d}" for n in range(10, 20)
+    }
+
+    exact = await nakama_list_storage(
+        client, collection="progress", key="progress_000003", max_objects=1000
+    )
+    assert exact["fetched"] == 50
+    assert exact["complete"] is True
+
+
+@pytest.mark.asyncio
+async def test_storage_get_and_collections(console_client):
+    _, client = console_client
+    collections = await nakama_list_collections(client)
+    assert collections["collections"] == ["inventory", "progress"]
+
+    result = await nakama_get_storage_objects(
+        client,
+        objects=[
+            {"collection": "progress", "key": "progress_000000", "user_id": user_id_for(3)},
+            {"collection": "progress", "key": "missing", "user_id": user_id_for(3)},
+        ],
+    )
+    assert result["fetched"] == 1
+    assert result["results"][0]["object"]["value"]["level"] == 3
+    assert "404" in result["results"][1]["error"]
+
+
+@pytest.mark.asyncio
+async def test_accounts_ledger_export_and_status(console_client):
+    console, client = console_client
+    accounts = await nakama_list_accounts(client, max_objects=1000)
+    assert accounts["fetched"] == 50
+    assert accounts["complete"] is True
+
+    account = await nakama_get_account(client, id=user_id_for(1))
+    assert account["user"]["username"] == "player000001"
+
+    ledger = await nakama_list_wallet_ledger(client, id=user_id_for(1), max_objects=30)
+    assert ledger["fetched"] == 30
+    assert ledger["next_cursor"]
+
+    export = await nakama_export_account(
+        client, user_id_for(1), response_mode="inline", export_cache=ExportCache()
+    )
+    assert len(export.structured["objects"]) == 20 + 3
+    assert len(export.structured["wallet_ledgers"]) == 50
+
+    status = await nakama_status(client, console.settings())
+    assert status["nodes"][0]["name"] == "nakama1"
+
+
+@pytest.mark.asyncio
+async def test_injected_faults_and_token_expiry(console_client):
+    console, client = console_client
+
+    console.fail_next(503, httpx.ConnectError("refused"))
+    collections = await client.get("/v2/console/storage/collections", use_cache=False)
+    assert collections["collections"]
+    assert client.stats()["retry"]["retries"] == 2
+
+    console.expire_tokens()
+    await client.get("/v2/console/status", use_cache=False)
+    assert console.requests["unauthorized"] == 1
+    assert console.requests["authenticate"] == 2
+
+
+def test_synthetic_dataset_scales_without_materializing():
+    dataset = SyntheticDataset(users=1000, collections={"progress": 5_000_000})
+    last = dataset.metadata("progress", 4_999_999)
+    assert last["key"] == "progress_004999"
+    assert last["user_id"] == user_id_for(999)
+    first = next(dataset.storage_indices("progress", key="progress_004000%"))
+    assert first == 4_000_000
@@ -1,5 +1,5 @@
 from src.hints import build_list_hint
-from src.pagination import MAX_BATCH_OBJECTS
+from src.pagination import MAX_BULK_OBJECTS
 
 
 def test_storage_complete_hint_suggests_batch_get():
@@ -13,7 +13,7 @@ def test_storage_complete_hint_suggests_batch_get():
     assert "nakama_get_storage_objects" in hint
 
 
-def test_storage_complete_many_keys_suggests_multiple_batches():
+def test_storage_complete_many_keys_suggests_single_batch_call():
     hint = build_list_hint(
         complete=True,
         fetched=120,
@@ -22,9 +22,19 @@ def test_storage_complete_many_keys_suggests_multiple_batches():
     )
     assert hint is not None
     assert "120 keys returned" in hint
-    batches = (120 + MAX_BATCH_OBJECTS - 1) // MAX_BATCH_OBJECTS
-    assert str(batches) in hint
-    assert str(MAX_BATCH_OBJECTS) in hint
+    assert "one nakama_get_storage_objects call" in hint
+
+
+def test_storage_complete_beyond_bulk_limit_suggests_multiple_batches():
+    fetched = MAX_BULK_OBJECTS * 2 + 1
+    hint = build_list_hint(
+        complete=True,
+        fetched=fetched,
+        total_count=fetched,
+        filters={"collection": "FG"},
+    )
+    assert hint is not None
+    assert f"3 batches of up to {MAX_BULK_OBJECTS}" in hint
 
 
 def test_storage_user_id_only_warns_no_pagination():
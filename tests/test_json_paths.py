@@ -0,0 +1,34 @@
+import pytest
+
+from src.json_paths import MAX_VALUE_PATHS, normalize_paths, parse_path, resolve_path
+
+
+def test_pointer_and_dotted_paths_parse_alike():
+    assert parse_path("/a/items/0/id") == ("a", "items", "0", "id")
+    assert parse_path("a.items[0].id") == ("a", "items", "0", "id")
+    assert parse_path("a.items.0.id") == ("a", "items", "0", "id")
+
+
+def test_pointer_unescapes_segments():
+    assert parse_path("/a~1b/c~0d") == ("a/b", "c~d")
+
+
+def test_resolve_reports_missing():
+    value = {"a": [{"b": 1}], "0": "zero"}
+    assert resolve_path(value, parse_path("a.0.b")) == (True, 1)
+    assert resolve_path(value, parse_path("/0")) == (True, "zero")
+    assert resolve_path(value, parse_path("a.1.b")) == (False, None)
+    assert resolve_path(value, parse_path("a.b")) == (False, None)
+
+
+@pytest.mark.parametrize("bad", ["", "a..b", "."])
+def test_invalid_dotted_paths_rejected(bad):
+    with pytest.raises(ValueError):
+        parse_path(bad)
+
+
+def test_normalize_caps_and_dedupes():
+    assert normalize_paths(["a", "a", "b"]) == ["a", "b"]
+    assert normalize_paths([]) is None
+    with pytest.raises(ValueError):
+        normalize_paths([f"f{i}" for i in range(MAX_VALUE_PATHS + 1)])
@@ -0,0 +1,196 @@
+import pytest
+import pytest_asyncio
+
+from src.deadline import Deadline
+from src.key_index import KeyIndexCache, KeyIndexEntry
+from src.models import FindStorageKeysArgs
+from src.tools.key_search import nakama_find_storage_keys
+from tests.fake_console import FakeNakamaConsole, SyntheticDataset, user_id_for
+
+
+@pytest_asyncio.fixture
+async def console_client():
+    # 400 objects over 4 users: keys progress_000000..progress_000099, 4 owners each.
+    console = FakeNakamaConsole(SyntheticDataset(users=4, collections={"progress": 400}))
+    client = console.client()
+    await client.authenticate()
+    yield console, client
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_index_is_built_once_and_answers_prefix_queries_locally(console_client):
+    console, client = console_client
+    cache = KeyIndexCache()
+
+    first = await nakama_find_storage_keys(
+        client, cache, collection="progress", prefixes=["progress_00001"], limit=5
+    )
+    assert first["index_refreshed"] is True
+    assert first["index_complete"] is True
+    assert first["index_rows"] == 400 and first["index_distinct_keys"] == 100
+    assert first["matched"] == 40
+    assert [k["key"] for k in first["keys"]] == ["progress_000010"] * 4 + ["progress_000011"]
+    assert first["next_offset"] == 5
+
+    console.reset_counters()
+    multi = await nakama_find_storage_keys(
+        client,
+        cache,
+        collection="progress",
+        prefixes=["progress_00002", "progress_00000", "progress_00002"],
+        user_id=user_id_for(1),
+        limit=100,
+    )
+    assert console.total_requests == 0
+    assert multi["index_refreshed"] is False
+    assert multi["matched"] == 20
+    assert {k["user_id"] for k in multi["keys"]} == {user_id_for(1)}
+    assert [k["key"] for k in multi["keys"]] == sorted(k["key"] for k in multi["keys"])
+    assert multi["next_offset"] is None
+
+
+@pytest.mark.asyncio
+async def test_contains_and_glob_match_whole_keys(console_client):
+    _, client = console_client
+    cache = KeyIndexCache()
+
+    infix = await nakama_find_storage_keys(
+        client, cache, collection="progress", contains="4", user_id=user_id_for(0), limit=100
+    )
+    # 04, 14, ..., 94 and 40..49 share 44.
+    assert infix["matched"] == 19
+
+    globbed = await nakama_find_storage_keys(
+        client, cache, collection="progress", glob="progress_0000[13]?", limit=100
+    )
+    assert globbed["matched"] == 80
+    assert {k["key"][-2] for k in globbed["keys"]} == {"1", "3"}
+
+    both = await nakama_find_storage_keys(
+        client, cache, collection="progress", glob="*7", contains="_00006", limit=100
+    )
+    assert [k["key"] for k in both["keys"]] == ["progress_000067"] * 4
+
+
+@pytest.mark.asyncio
+async def test_ttl_and_refresh_rebuild_the_index(console_client):
+    console, client = console_client
+    cache = KeyIndexCache(ttl_seconds=300)
+    await nakama_find_storage_keys(client, cache, collection="progress", contains="0")
+
+    console.dataset.collections["progress"] = 200
+    cached = await nakama_find_storage_keys(client, cache, collection="progress", contains="0")
+    assert cached["index_rows"] == 400
+
+    refreshed = await nakama_find_storage_keys(
+        client, cache, collection="progress", contains="0", refresh=True
+    )
+    assert refreshed["index_refreshed"] is True
+    assert refreshed["index_rows"] == 200
+
+    cache.ttl_seconds = 0
+    console.reset_counters()
+    expired = await nakama_find_storage_keys(client, cache, collection="progress", contains="0")
+    assert expired["index_refreshed"] is True
+    assert console.total_requests > 0
+
+
+@pytest.mark.asyncio
+async def test_build_cut_short_by_deadline_continues_on_next_call(console_client):
+    console, client = console_client
+    cache = KeyIndexCache()
+    console.latency = 0.02
+
+    partial = await nakama_find_storage_keys(
+        client,
+        cache,
+        collection="progress",
+        prefixes=["progress_"],
+        deadline=Deadline(0.05, reserve=0),
+        prefetch=1,
+    )
+    assert partial["index_complete"] is False
+    assert partial["index_rows"] < 400
+    assert "still building" in partial["hint"]
+
+    console.latency = 0.0
+    done = await nakama_find_storage_keys(
+        client, cache, collection="progress", prefixes=["progress_"], limit=1
+    )
+    assert done["index_complete"] is True
+    assert done["index_refreshed"] is True
+    assert done["matched"] == done["index_rows"] == 400
+
+
+@pytest.mark.asyncio
+async def test_fetch_objects_returns_matching_window_as_batch(console_client):
+    _, client = console_client
+
+    result = await nakama_find_storage_keys(
+        client,
+        KeyIndexCache(),
+        collection="progress",
+        glob="progress_00005?",
+        user_id=user_id_for(2),
+        limit=3,
+        fetch_objects=True,
+        value_paths=["level"],
+    )
+
+    batch = result["batch"]
+    assert batch["fetched"] == 3
+    assert [r["key"] for r in batch["results"]] == [k["key"] for k in result["keys"]]
+    assert all("level" in r["object"]["value_paths"] for r in batch["results"])
+
+
+def test_cache_evicts_least_recently_used_collections_over_row_cap():
+    cache = KeyIndexCache(max_total_rows=5)
+    for collection in ("a", "b", "c"):
+        entry, _ = cache.get(collection)
+        entry.add({"key": f"k{i}", "user_id": "u"} for i in range(3))
+        entry.freeze(complete=True)
+        cache.settle(entry)
+
+    assert cache.stats()["collections"] == 1
+    assert cache.get("c")[1] is False
+
+
+def test_entry_skips_malformed_rows_and_dedupes():
+    entry = KeyIndexEntry("c")
+    row = {"key": "a", "user_id": "u"}
+    added = entry.add([row, dict(row), {"key": 1}, None])
+    entry.freeze(complete=True)
+
+    assert added == 2
+    assert entry.rows == 1
+    assert list(entry.snapshot.match(prefixes=["a"])) == [("a", "u")]
+
+
+def test_partial_freezes_merge_into_one_sorted_snapshot():
+    entry = KeyIndexEntry("c")
+    batches = [
+        [{"key": "m", "user_id": "u1"}, {"key": "b", "user_id": "u2"}],
+        [{"key": "a", "user_id": "u3"}, {"key": "m", "user_id": "u1"}],
+        [{"key": "m", "user_id": "u0"}, {"key": "z", "user_id": "u2"}],
+    ]
+    for batch in batches[:-1]:
+        entry.add(batch)
+        entry.freeze(complete=False)
+    assert entry.rows == 3
+    entry.add(batches[-1])
+    entry.freeze(complete=True)
+
+    assert list(entry.snapshot.match()) == [
+        ("a", "u3"), ("b", "u2"), ("m", "u1"), ("m", "u0"), ("z", "u2"),
+    ]
+    assert list(entry.snapshot.match(user_id="u0")) == [("m", "u0")]
+    assert list(entry.snapshot.match(user_id="nobody")) == []
+
+
+def test_args_require_a_condition_and_normalize_prefixes():
+    assert FindStorageKeysArgs(collection="c", prefixes=["lvl%"]).prefixes == ["lvl"]
+    with pytest.raises(ValueError, match="at least one"):
+        FindStorageKeysArgs(collection="c")
+    with pytest.raises(ValueError, match="fetch_objects"):
+        FindStorageKeysArgs(collection="c", contains="x", limit=5000)
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
 
 from src.tools.storage import nakama_list_storage_keys
 
@@ -7,24 +7,19 @@ from src.tools.storage import nakama_list_storage_keys
 @pytest.mark.asyncio
 async def test_list_storage_keys_projects_metadata():
     client = AsyncMock()
+    client.get.return_value = {
+        "objects": [
+            {"collection": "FG", "key": "44", "user_id": "u1", "version": "v1"},
+            {"collection": "FG", "key": "681", "user_id": "u1", "version": "v2"},
+        ],
+        "total_count": 2,
+    }
 
-    async def fake_list_storage(*args, **kwargs):
-        return {
-            "objects": [
-                {"collection": "FG", "key": "44", "user_id": "u1", "version": "v1"},
-                {"collection": "FG", "key": "681", "user_id": "u1", "version": "v2"},
-            ],
-            "total_count": 2,
-            "fetched": 2,
-            "complete": True,
-        }
-
-    with patch("src.tools.storage._list_storage_envelope", side_effect=fake_list_storage):
-        result = await nakama_list_storage_keys(
-            client,
-            collection="FG",
-            user_id="u1",
-        )
+    result = await nakama_list_storage_keys(
+        client,
+        collection="FG",
+        user_id="u1",
+    )
 
     assert result["keys"] == [
         {"key": "44", "user_id": "u1"},
@@ -33,3 +28,18 @@ async def test_list_storage_keys_projects_metadata():
     assert result["total_count"] == 2
     assert result["complete"] is True
     assert "hint" in result
+
+
+@pytest.mark.asyncio
+async def test_list_storage_keys_projects_single_cursor_page():
+    client = AsyncMock()
+    client.get.return_value = {
+        "objects": [{"collection": "FG", "key": "9", "user_id": "u2", "version": "v"}],
+        "next_cursor": "next",
+    }
+
+    result = await nakama_list_storage_keys(client, collection="FG", cursor="page2")
+
+    assert client.get.await_args.kwargs["params"]["cursor"] == "page2"
+    assert result["keys"] == [{"key": "9", "user_id": "u2"}]
+    assert result["next_cursor"] == "next"
@@ -1,8 +1,11 @@
+import asyncio
+
+import httpx
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from src.config import NakamaSettings
-from src.nakama_client import NakamaConsoleClient
+from src.nakama_client import TOKEN_REFRESH_MIN_DELAY_SECONDS, NakamaConsoleClient
 
 
 def _settings() -> NakamaSettings:
@@ -42,3 +45,257 @@ async def test_reauthenticates_on_401_and_retries():
     assert mock_request.await_count == 2
 
     await client.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_limits_come_from_settings():
+    settings = _settings().model_copy(
+        update={
+            "nakama_max_connections": 5,
+            "nakama_max_keepalive_connections": 2,
+            "nakama_keepalive_expiry_seconds": 12.0,
+        }
+    )
+    client = NakamaConsoleClient(settings)
+
+    stats = client.pool_stats()
+    assert stats["max_connections"] == 5
+    assert stats["max_keepalive_connections"] == 2
+    assert stats["keepalive_expiry"] == 12.0
+    assert stats["open"] == 0
+    assert stats["waiting"] == 0
+    assert stats["in_flight"] == 0
+    assert client.stats()["pool"] == stats
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_survive_unknown_httpcore_internals():
+    client = NakamaConsoleClient(_settings())
+    transport = client._client._transport
+    client._client._transport = object()  # No ``_pool`` at all.
+    try:
+        stats = client.pool_stats()
+    finally:
+        client._client._transport = transport
+
+    assert stats["max_connections"] == client.limits.max_connections
+    assert (stats["open"], stats["idle"], stats["active"], stats["waiting"]) == (None,) * 4
+    assert stats["in_flight"] == 0
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_http2_falls_back_when_h2_missing():
+    settings = _settings().model_copy(update={"nakama_http2": True})
+    with patch("src.nakama_client._http2_available", return_value=False):
+        client = NakamaConsoleClient(settings)
+
+    assert client.http2 is False
+    assert client.pool_stats()["http2"] is False
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_coalesces_identical_gets():
+    client = NakamaConsoleClient(_settings())
+    client._token = "token"
+
+    async def slow_request(method, url, **kwargs):
+        await asyncio.sleep(0.01)
+        resp = MagicMock()
+        resp.status_code = 200
+        resp.raise_for_status = MagicMock()
+        resp.json = MagicMock(return_value={"user": {"id": "u1"}})
+        return resp
+
+    with patch.object(client._client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.side_effect = slow_request
+        results = await asyncio.gather(
+            client.get("/v2/console/account/u1"),
+            client.get("/v2/console/account/u1"),
+            client.get("/v2/console/account/u2"),
+        )
+
+    assert mock_request.await_count == 2
+    assert results[0] == results[1]
+    assert client.stats()["singleflight"]["hits"] == 1
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_caches_collections_and_supports_bypass():
+    client = NakamaConsoleClient(_settings())
+    client._token = "token"
+
+    response = MagicMock()
+    response.status_code = 200
+    response.raise_for_status = MagicMock()
+    response.json = MagicMock(return_value={"collections": ["FG"]})
+
+    with patch.object(client._client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.return_value = response
+        first = await client.get("/v2/console/storage/collections")
+        first["collections"].append("mutated")
+        second = await client.get("/v2/console/storage/collections")
+        assert mock_request.await_count == 1
+        assert second == {"collections": ["FG"]}
+
+        await client.get("/v2/console/storage/collections", use_cache=False)
+        assert mock_request.await_count == 2
+
+        await client.get("/v2/console/storage/FG/44/u1")
+        await client.get("/v2/console/storage/FG/44/u1")
+        assert mock_request.await_count == 4
+
+    assert client.stats()["cache"]["hits"] == 1
+
+    await client.close()
+
+
+def _jwt(exp: float) -> str:
+    import base64
+    import json
+
+    def _b64(data: dict) -> str:
+        raw = json.dumps(data).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    return f"{_b64({'alg': 'HS256'})}.{_b64({'exp': exp})}.sig"
+
+
+def test_jwt_expiry_decodes_exp_claim():
+    from src.nakama_client import _jwt_expiry
+
+    assert _jwt_expiry(_jwt(1_900_000_000)) == 1_900_000_000
+    assert _jwt_expiry("not-a-jwt") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_401s_share_one_reauthentication():
+    client = NakamaConsoleClient(_settings())
+    client._token = "stale-token"
+
+    async def fake_request(method, url, **kwargs):
+        await asyncio.sleep(0)
+        resp = MagicMock()
+        if kwargs["headers"]["Authorization"] == "Bearer stale-token":
+            resp.status_code = 401
+        else:
+            resp.status_code = 200
+            resp.raise_for_status = MagicMock()
+            resp.json = MagicMock(return_value={"ok": True})
+        return resp
+
+    async def fake_post(url, json):
+        await asyncio.sleep(0.01)
+        resp = MagicMock()
+        resp.status_code = 200
+        resp.json = MagicMock(return_value={"token": "fresh-token"})
+        return resp
+
+    with patch.object(client._client, "request", new_callable=AsyncMock) as mock_request:
+        with patch.object(client._client, "post", new_callable=AsyncMock) as mock_post:
+            mock_request.side_effect = fake_request
+            mock_post.side_effect = fake_post
+            results = await asyncio.gather(
+                *(client.get(f"/v2/console/storage/FG/{i}/u1") for i in range(10))
+            )
+
+    assert all(r == {"ok": True} for r in results)
+    assert mock_post.await_count == 1
+    assert mock_request.await_count == 20
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_login_schedules_refresh_before_expiry():
+    import time
+
+    client = NakamaConsoleClient(_settings())
+    auth_response = MagicMock()
+    auth_response.status_code = 200
+    auth_response.json = MagicMock(return_value={"token": _jwt(time.time() + 3600)})
+
+    with patch.object(client._client, "post", new_callable=AsyncMock) as mock_post:
+        mock_post.return_value = auth_response
+        await client.authenticate()
+
+        delay = client._refresh_delay()
+        assert 3600 - 61 < delay < 3600 - 59
+        assert client._refresh_task is not None
+
+        first_token = client._token
+        auth_response.json = MagicMock(return_value={"token": _jwt(time.time() + 7200)})
+        await client._refresh_later(0, first_token)
+
+    assert client._token != first_token
+    assert mock_post.await_count == 2
+    assert client.auth_stats()["proactive_refreshes"] == 1
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_refresh_never_loops_and_backs_off_after_failure():
+    import time
+
+    client = NakamaConsoleClient(_settings())
+    auth_response = MagicMock()
+    auth_response.status_code = 200
+    # Already expired on arrival, e.g. the Console clock is behind ours.
+    auth_response.json = MagicMock(return_value={"token": _jwt(time.time() - 10)})
+
+    with patch.object(client._client, "post", new_callable=AsyncMock) as mock_post:
+        mock_post.return_value = auth_response
+        await client.authenticate()
+        assert client._refresh_delay() == TOKEN_REFRESH_MIN_DELAY_SECONDS
+
+        token = client._token
+        auth_response.json = MagicMock(return_value={"token": _jwt(time.time() + 3600)})
+        await client.authenticate(force=True)
+        assert client._token != token
+
+        mock_post.side_effect = httpx.ConnectError("refused")
+        await client._refresh_later(0, client._token)
+        assert client._refresh_delay() == 2 * TOKEN_REFRESH_MIN_DELAY_SECONDS
+        await client._refresh_later(0, client._token)
+        assert client._refresh_delay() == 4 * TOKEN_REFRESH_MIN_DELAY_SECONDS
+        assert client._refresh_task is not None
+        assert client.auth_stats()["refresh_failures"] == 2
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_token_is_replaced_before_request():
+    import time
+
+    client = NakamaConsoleClient(_settings())
+    client._token = _jwt(time.time() - 5)
+    client._token_expires_at = time.time() - 5
+
+    success = MagicMock()
+    success.status_code = 200
+    success.raise_for_status = MagicMock()
+    success.json = MagicMock(return_value={"users": []})
+
+    auth_response = MagicMock()
+    auth_response.status_code = 200
+    auth_response.json = MagicMock(return_value={"token": _jwt(time.time() + 3600)})
+
+    with patch.object(client._client, "request", new_callable=AsyncMock) as mock_request:
+        with patch.object(client._client, "post", new_callable=AsyncMock) as mock_post:
+            mock_request.return_value = success
+            mock_post.return_value = auth_response
+            await client.get("/v2/console/account")
+
+    assert mock_post.await_count == 1
+    assert mock_request.await_count == 1
+
+    await client.close()
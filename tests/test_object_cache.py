@@ -0,0 +1,113 @@
+import pytest
+import pytest_asyncio
+
+from src.object_cache import StorageObjectCache
+from src.tools.storage import (
+    nakama_get_storage_object,
+    nakama_get_storage_objects,
+    nakama_list_storage,
+)
+from tests.fake_console import FakeNakamaConsole, SyntheticDataset, user_id_for
+
+
+def _obj(version="v1", value="x"):
+    return {"collection": "c", "key": "k", "user_id": "u", "version": version, "value": value}
+
+
+def _listed(version="v1"):
+    return {"collection": "c", "key": "k", "user_id": "u", "version": version}
+
+
+def test_hit_requires_matching_observed_version():
+    cache = StorageObjectCache()
+    cache.put(_obj("v1"))
+    assert cache.get("c", "k", "u") is None  # a fetch alone does not revalidate
+    cache.observe([_listed("v1")])
+    assert cache.get("c", "k", "u")["value"] == "x"
+
+    cache.observe([{"collection": "c", "key": "k", "user_id": "u", "version": "v2"}])
+    assert cache.get("c", "k", "u") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_hit_returns_private_copy():
+    cache = StorageObjectCache()
+    cache.put(_obj())
+    cache.observe([_listed()])
+    cache.get("c", "k", "u")["value"] = "mutated"
+    assert cache.get("c", "k", "u")["value"] == "x"
+
+
+def test_stale_observation_is_a_miss(monkeypatch):
+    cache = StorageObjectCache(revalidate_seconds=10)
+    now = [1000.0]
+    monkeypatch.setattr("src.object_cache.time.monotonic", lambda: now[0])
+    cache.put(_obj())
+    cache.observe([_listed()])
+    now[0] += 11
+    assert cache.get("c", "k", "u") is None
+    cache.observe([_obj()])
+    assert cache.get("c", "k", "u") is not None
+
+
+def test_lru_by_bytes():
+    one = _obj(value="a" * 100)
+    cache = StorageObjectCache(max_bytes=len(str(one)) + 60)
+    cache.put(one)
+    cache.put({**one, "key": "k2"})
+    cache.observe([_listed(), {**_listed(), "key": "k2"}])
+    assert cache.get("c", "k", "u") is None
+    assert cache.get("c", "k2", "u") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disabled_cache_stores_nothing():
+    cache = StorageObjectCache(max_bytes=0)
+    cache.put(_obj())
+    assert cache.get("c", "k", "u") is None
+
+
+@pytest_asyncio.fixture
+async def console_client():
+    console = FakeNakamaConsole(SyntheticDataset(users=10, collections={"progress": 50}))
+    client = console.client()
+    await client.authenticate()
+    yield console, client
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_listing_revalidates_cached_objects(console_client):
+    console, client = console_client
+    cache = StorageObjectCache()
+    ds = console.dataset
+    ident = {"collection": "progress", "key": ds.key_for("progress", 4), "user_id": user_id_for(4)}
+
+    await nakama_get_storage_object(client, **ident, object_cache=cache)
+    await nakama_list_storage(client, collection="progress", max_objects=50, object_cache=cache)
+    console.reset_counters()
+
+    again = await nakama_get_storage_object(client, **ident, object_cache=cache)
+    assert console.total_requests == 0
+    assert again["value"]["level"] is not None
+
+    ds.touch("progress", 4)
+    await nakama_list_storage(client, collection="progress", max_objects=50, object_cache=cache)
+    console.reset_counters()
+    batch = await nakama_get_storage_objects(client, objects=[ident], object_cache=cache)
+    assert batch["fetched"] == 1
+    assert console.total_requests == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_alone_never_hides_a_later_write(console_client):
+    console, client = console_client
+    cache = StorageObjectCache()
+    ds = console.dataset
+    ident = {"collection": "progress", "key": ds.key_for("progress", 4), "user_id": user_id_for(4)}
+
+    first = await nakama_get_storage_object(client, **ident, object_cache=cache)
+    ds.touch("progress", 4)
+    again = await nakama_get_storage_object(client, **ident, object_cache=cache)
+
+    assert again["version"] != first["version"]
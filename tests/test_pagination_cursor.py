@@ -1,6 +1,14 @@
+import asyncio
+
 import pytest
 
-from src.pagination import fetch_page_once, fetch_pages
+from src.pagination import (
+    collect_items,
+    fetch_page_once,
+    fetch_pages,
+    iter_items,
+    iter_pages,
+)
 
 
 @pytest.mark.asyncio
@@ -45,3 +53,140 @@ async def test_fetch_pages_exposes_next_cursor_when_truncated():
     assert envelope["fetched"] == 100
     assert envelope["complete"] is False
     assert envelope["next_cursor"] == "p2"
+
+
+@pytest.mark.asyncio
+async def test_iter_items_streams_with_fetch_pages_semantics():
+    pages = {
+        None: {"objects": [{"key": "1"}, {"key": "2"}], "total_count": 5, "next_cursor": "p2"},
+        "p2": {"objects": [{"key": "3"}, {"key": "4"}], "total_count": 5, "next_cursor": "p3"},
+        "p3": {"objects": [{"key": "5"}], "total_count": 5},
+    }
+    requested = []
+
+    async def fetch_page(cursor):
+        requested.append(cursor)
+        return pages[cursor]
+
+    stream = iter_items(fetch_page, items_key="objects", max_objects=4, prefetch=0)
+    seen = []
+    async for item in stream:
+        seen.append(item["key"])
+        # Items arrive before later pages are requested
+        assert len(requested) == (len(seen) + 1) // 2
+
+    assert seen == ["1", "2", "3", "4"]
+    assert requested == [None, "p2"]
+    assert stream.summary() == {
+        "total_count": 5,
+        "fetched": 4,
+        "complete": False,
+        "next_cursor": "p3",
+        "deadline_exceeded": False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_and_collect_items_project():
+    async def fetch_page(cursor):
+        if cursor is None:
+            return {"users": [{"id": "a", "x": 1}], "next_cursor": "c2"}
+        return {"users": [{"id": "b", "x": 2}]}
+
+    pages = [page async for page in iter_pages(fetch_page, items_key="users", max_objects=10)]
+    assert pages == [[{"id": "a", "x": 1}], [{"id": "b", "x": 2}]]
+
+    envelope = await collect_items(
+        iter_items(fetch_page, items_key="users", max_objects=10),
+        project=lambda user: user["id"],
+    )
+    assert envelope["users"] == ["a", "b"]
+    assert envelope["complete"] is True
+    assert envelope["next_cursor"] is None
+
+
+def _chained_pages(count, per_page, *, latency=0.0, log=None):
+    async def fetch_page(cursor):
+        index = int(cursor or 0)
+        if log is not None:
+            log.append(("start", index))
+        await asyncio.sleep(latency)
+        if log is not None:
+            log.append(("end", index))
+        page = {"objects": [{"key": f"{index}-{n}"} for n in range(per_page)]}
+        if index + 1 < count:
+            page["next_cursor"] = str(index + 1)
+        return page
+
+    return fetch_page
+
+
+@pytest.mark.asyncio
+async def test_prefetch_requests_next_page_while_current_is_processed():
+    log = []
+    fetch_page = _chained_pages(3, 2, latency=0.01, log=log)
+
+    async for _page in iter_pages(fetch_page, items_key="objects", max_objects=100, prefetch=1):
+        log.append(("processed", None))
+        await asyncio.sleep(0.02)
+
+    # Page 1 was requested before page 0 had been processed.
+    assert log.index(("start", 1)) < log.index(("processed", None))
+
+
+@pytest.mark.asyncio
+async def test_prefetch_depth_is_bounded_while_consumer_is_slow():
+    fetch_page = _chained_pages(20, 1)
+    stream = iter_pages(fetch_page, items_key="objects", max_objects=100, prefetch=2)
+    consumed = 0
+    async for _page in stream:
+        consumed += 1
+        await asyncio.sleep(0.005)
+        assert stream.pages_requested <= consumed + 2
+        if consumed == 5:
+            break
+    await stream.aclose()
+    assert stream.pages_requested <= 7
+
+
+@pytest.mark.asyncio
+async def test_prefetch_never_requests_past_max_objects():
+    requested = []
+    inner = _chained_pages(10, 5)
+
+    async def fetch_page(cursor):
+        requested.append(cursor)
+        return await inner(cursor)
+
+    result = await fetch_pages(fetch_page, items_key="objects", max_objects=10, prefetch=4)
+
+    assert requested == [None, "1"]
+    assert result["fetched"] == 10
+    assert result["next_cursor"] == "2"
+    assert result["complete"] is False
+
+
+@pytest.mark.asyncio
+async def test_prefetch_is_cancelled_when_consumer_stops_early():
+    log = []
+    fetch_page = _chained_pages(5, 1, latency=0.05, log=log)
+    stream = iter_pages(fetch_page, items_key="objects", max_objects=100, prefetch=1)
+
+    async for _page in stream:
+        break
+    await stream.aclose()
+
+    # The read-ahead for page 1 was started and then cancelled, never completed.
+    assert ("start", 1) in log
+    assert ("end", 1) not in log
+
+
+@pytest.mark.asyncio
+async def test_prefetch_surfaces_fetch_errors_to_the_consumer():
+    async def fetch_page(cursor):
+        if cursor is None:
+            return {"objects": [{"key": "a"}], "next_cursor": "boom"}
+        raise RuntimeError("Console error")
+
+    with pytest.raises(RuntimeError, match="Console error"):
+        await fetch_pages(fetch_page, items_key="objects", max_objects=10, prefetch=1)
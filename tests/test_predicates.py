@@ -0,0 +1,208 @@
+import pytest
+import pytest_asyncio
+from pydantic import ValidationError
+
+from src.models import ListStorageArgs
+from src.pagination import fetch_page_once, iter_items
+from src.predicates import (
+    VALUE_SNIPPET_CHARS,
+    StoragePredicate,
+    ValueMatcher,
+    parse_timestamp,
+    storage_predicate,
+)
+from src.tools.storage import nakama_list_storage, nakama_list_storage_keys
+from tests.fake_console import (
+    BASE_EPOCH,
+    FakeNakamaConsole,
+    SyntheticDataset,
+    _decode_cursor,
+    _iso,
+)
+
+ROW = {
+    "collection": "progress",
+    "key": "progress_000042",
+    "user_id": "u1",
+    "permission_read": 2,
+    "permission_write": 1,
+    "create_time": "2024-01-01T00:00:00Z",
+    "update_time": "2024-03-01T12:00:00Z",
+}
+
+
+def test_storage_predicate_combines_conditions():
+    assert StoragePredicate(permission_read=2, key_contains="0004")(ROW)
+    assert not StoragePredicate(permission_read=1)(ROW)
+    assert StoragePredicate(key_regex=r"_\d+2$")(ROW)
+    assert not StoragePredicate(key_regex=r"^inventory")(ROW)
+    assert StoragePredicate(
+        updated_after="2024-02-01T00:00:00Z", created_before="2024-01-02"
+    )(ROW)
+    # Bounds are exclusive and rows without the field never match.
+    assert not StoragePredicate(updated_after="2024-03-01T12:00:00+00:00")(ROW)
+    assert not StoragePredicate(created_after="2023-01-01T00:00:00Z")({"key": "k"})
+
+
+def test_storage_predicate_none_when_where_is_empty():
+    assert storage_predicate(None) is None
+    assert storage_predicate({"key_contains": None}) is None
+
+
+def test_parse_timestamp_accepts_z_and_naive():
+    assert parse_timestamp("2024-01-01T00:00:00Z") == parse_timestamp("2024-01-01T00:00:00")
+    with pytest.raises(ValueError, match="ISO-8601"):
+        parse_timestamp("yesterday")
+
+
+def test_where_args_validate_eagerly():
+    with pytest.raises(ValidationError, match="ISO-8601"):
+        ListStorageArgs.model_validate({"where": {"updated_after": "soon"}})
+    with pytest.raises(ValidationError, match="Invalid key_regex"):
+        ListStorageArgs.model_validate({"where": {"key_regex": "("}})
+    with pytest.raises(ValidationError):
+        ListStorageArgs.model_validate({"where": {"value_contains": "x"}})
+
+
+def _pages(count, per_page):
+    async def fetch_page(cursor):
+        index = int(cursor or 0)
+        page = {
+            "objects": [{"key": f"{index * per_page + n}"} for n in range(per_page)],
+            "total_count": count * per_page,
+        }
+        if index + 1 < count:
+            page["next_cursor"] = str(index + 1)
+        return page
+
+    return fetch_page
+
+
+def _even(obj):
+    return int(obj["key"]) % 2 == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_counts_only_matches_toward_max_objects():
+    stream = iter_items(_pages(10, 10), items_key="objects", max_objects=10, predicate=_even)
+    keys = [item["key"] async for item in stream]
+
+    assert keys == [str(n) for n in range(0, 20, 2)]
+    summary = stream.summary()
+    assert summary["scanned"] == 20
+    assert summary["complete"] is False
+    assert summary["next_cursor"] == "2"
+    assert summary["scan_limit_reached"] is False
+
+
+@pytest.mark.asyncio
+async def test_stream_scan_cap_stops_on_page_boundary():
+    stream = iter_items(
+        _pages(10, 10),
+        items_key="objects",
+        max_objects=100,
+        predicate=lambda obj: False,
+        max_scanned=25,
+    )
+    assert [item async for item in stream] == []
+    summary = stream.summary()
+    assert summary["scanned"] == 30
+    assert summary["scan_limit_reached"] is True
+    assert summary["next_cursor"] == "3"
+    assert stream.pages_requested == 3
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_once_reports_scanned():
+    envelope = await fetch_page_once(
+        _pages(2, 10), items_key="objects", cursor="1", predicate=_even
+    )
+    assert envelope["fetched"] == 5
+    assert envelope["scanned"] == 10
+
+
+@pytest_asyncio.fixture
+async def console_client():
+    console = FakeNakamaConsole(SyntheticDataset(users=50, collections={"progress": 1000}))
+    client = console.client()
+    await client.authenticate()
+    yield console, client
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_list_storage_where_returns_relevant_rows(console_client):
+    console, client = console_client
+    for index in (7, 420, 901):
+        console.dataset.touch("progress", index)
+
+    result = await nakama_list_storage(
+        client,
+        collection="progress",
+        max_objects=50,
+        where={"updated_after": _iso(BASE_EPOCH + 2000)},
+    )
+
+    assert result["fetched"] == 3
+    assert result["complete"] is True
+    assert result["scanned"] == 1000
+    assert "Scanned" not in (result["hint"] or "")
+
+    public = await nakama_list_storage(
+        client, collection="progress", max_objects=50, where={"permission_read": 2}
+    )
+    assert public["fetched"] == 50
+    assert all(obj["permission_read"] == 2 for obj in public["objects"])
+    assert public["scanned"] == 200
+    assert "Scanned 200" in public["hint"]
+
+
+@pytest.mark.asyncio
+async def test_list_storage_keys_where_hits_scan_cap(console_client):
+    _console, client = console_client
+
+    result = await nakama_list_storage_keys(
+        client,
+        collection="progress",
+        where={"key_contains": "no-such-key"},
+        max_scanned=250,
+    )
+
+    assert result["keys"] == []
+    assert result["scan_limit_reached"] is True
+    assert result["next_cursor"]
+    assert "max_scanned" in result["hint"]
+
+
+@pytest.mark.asyncio
+async def test_scan_cap_counts_only_rows_from_start_offset(console_client):
+    _console, client = console_client
+
+    result = await nakama_list_storage_keys(
+        client,
+        collection="progress",
+        where={"key_contains": "no-such-key"},
+        max_scanned=250,
+        start_offset=600,
+    )
+
+    assert result["keys"] == []
+    assert result["scanned"] == 300
+    assert result["scan_limit_reached"] is True
+    assert _decode_cursor(result["next_cursor"]) == 900
+
+
+def test_value_matcher_snippets_and_json_equality():
+    contains = ValueMatcher(contains="SWORD", ignore_case=True)
+    snippet = contains.match({"inventory": ["x" * 300 + "sword" + "y" * 300]})
+    assert "sword" in snippet
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert len(snippet) <= VALUE_SNIPPET_CHARS + 2
+
+    flag = ValueMatcher(path="/vip", equals=True)
+    assert flag.match({"vip": True}) == "true"
+    assert flag.match({"vip": 1}) is None
+    assert flag.match({}) is None
+
+    with pytest.raises(ValueError):
+        ValueMatcher(contains="a", regex="b")
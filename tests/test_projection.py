@@ -0,0 +1,77 @@
+import pytest
+import pytest_asyncio
+
+from src.models import ListAccountsArgs, ListStorageArgs
+from src.projection import Projection, field_projection, normalize_fields
+from src.tools.accounts import nakama_list_accounts
+from src.tools.storage import nakama_list_storage
+from tests.fake_console import FakeNakamaConsole, SyntheticDataset
+
+
+def test_projection_keeps_requested_and_identity_fields():
+    project = field_projection(["version", "version", "missing"], always=("key", "user_id"))
+
+    assert project.fields == ("key", "user_id", "version", "missing")
+    assert project({"key": "k", "user_id": "u", "version": "v", "value": "{}"}) == {
+        "key": "k",
+        "user_id": "u",
+        "version": "v",
+    }
+    assert project("not-a-dict") == "not-a-dict"
+
+
+def test_projection_default_fills_missing_fields():
+    project = Projection(("key", "user_id"), default="")
+    assert project({"key": "k"}) == {"key": "k", "user_id": ""}
+
+
+def test_field_projection_none_keeps_whole_items():
+    assert field_projection(None) is None
+    assert field_projection([]) is None
+
+
+def test_normalize_fields_rejects_blank_and_too_many():
+    assert normalize_fields([" username ", "username"]) == ["username"]
+    with pytest.raises(ValueError, match="non-empty"):
+        normalize_fields(["  "])
+    with pytest.raises(ValueError, match="At most"):
+        normalize_fields([f"f{i}" for i in range(33)])
+
+
+def test_list_args_normalize_fields():
+    assert ListAccountsArgs.model_validate({"fields": ["username "]}).fields == ["username"]
+    assert ListStorageArgs.model_validate({"collection": "c", "fields": []}).fields is None
+
+
+@pytest_asyncio.fixture
+async def console_client():
+    console = FakeNakamaConsole(SyntheticDataset(users=30, collections={"progress": 300}))
+    client = console.client()
+    await client.authenticate()
+    yield console, client
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_list_accounts_fields_trim_each_user(console_client):
+    _console, client = console_client
+
+    result = await nakama_list_accounts(client, max_objects=30, fields=["username"])
+
+    assert result["fetched"] == 30
+    assert all(set(user) == {"id", "username"} for user in result["users"])
+
+
+@pytest.mark.asyncio
+async def test_list_storage_fields_trim_each_object(console_client):
+    _console, client = console_client
+
+    whole = await nakama_list_storage(client, collection="progress", max_objects=150)
+    trimmed = await nakama_list_storage(
+        client, collection="progress", max_objects=150, fields=["version"]
+    )
+
+    assert trimmed["fetched"] == whole["fetched"] == 150
+    assert set(trimmed["objects"][0]) == {"collection", "key", "user_id", "version"}
+    assert [o["key"] for o in trimmed["objects"]] == [o["key"] for o in whole["objects"]]
+    assert len(str(trimmed)) < len(str(whole))
@@ -4,7 +4,7 @@ from src.tools.registry import TOOL_MAP, TOOL_SPECS
 def test_registry_has_unique_tool_names():
     names = [spec.name for spec in TOOL_SPECS]
     assert len(names) == len(set(names))
-    assert len(TOOL_SPECS) == 13
+    assert len(TOOL_SPECS) == 21
 
 
 def test_zero_arg_tools_have_empty_input_schema():
@@ -0,0 +1,59 @@
+from unittest.mock import patch
+
+from src.response_cache import ResponseCache
+
+
+def test_ttl_policies_by_endpoint():
+    cache = ResponseCache()
+    assert cache.ttl_for("/v2/console/storage/collections") == 60.0
+    assert cache.ttl_for("/v2/console/status") == 5.0
+    assert cache.ttl_for("/v2/console/account/u1") == 30.0
+    assert cache.ttl_for("/v2/console/account/u1/group") == 30.0
+    assert cache.ttl_for("/v2/console/storage/FG/44/u1") == 0.0
+    assert cache.ttl_for("/v2/console/account") == 0.0
+    assert cache.ttl_for("/v2/console/account/u1/export") == 0.0
+
+
+def test_hit_returns_private_copy():
+    cache = ResponseCache()
+    cache.set("k", {"collections": ["a"]}, ttl=60)
+
+    hit, value = cache.get("k")
+    assert hit is True
+    value["collections"].append("b")
+
+    _, again = cache.get("k")
+    assert again == {"collections": ["a"]}
+    assert cache.stats()["hits"] == 2
+
+
+def test_entries_expire():
+    cache = ResponseCache()
+    with patch("src.response_cache.time.monotonic", return_value=100.0):
+        cache.set("k", {"a": 1}, ttl=5)
+    with patch("src.response_cache.time.monotonic", return_value=104.0):
+        assert cache.get("k")[0] is True
+    with patch("src.response_cache.time.monotonic", return_value=106.0):
+        assert cache.get("k")[0] is False
+    assert cache.stats()["entries"] == 0
+
+
+def test_zero_ttl_is_not_stored():
+    cache = ResponseCache()
+    cache.set("k", {"a": 1}, ttl=0)
+    assert cache.get("k") == (False, None)
+
+
+def test_lru_eviction_by_bytes():
+    cache = ResponseCache(max_bytes=40)
+    cache.set("a", {"v": "x" * 10}, ttl=60)
+    cache.set("b", {"v": "y" * 10}, ttl=60)
+    cache.get("a")  # a becomes most recently used
+    cache.set("c", {"v": "z" * 10}, ttl=60)
+
+    assert cache.get("b")[0] is False
+    assert cache.get("a")[0] is True
+    assert cache.get("c")[0] is True
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= 40
@@ -0,0 +1,126 @@
+import pytest
+import pytest_asyncio
+
+from src.result_sets import ResultSetCache, sort_rows
+from src.tools.accounts import nakama_list_accounts
+from src.tools.results import nakama_read_result_set
+from src.tools.storage import nakama_list_storage, nakama_list_storage_keys
+from tests.fake_console import FakeNakamaConsole, SyntheticDataset
+
+
+def test_result_set_cache_returns_private_copies():
+    cache = ResultSetCache()
+    handle = cache.store("nakama_list_storage", "objects", [{"key": "a"}], {"complete": True})
+
+    entry = cache.get(handle)
+    rows = entry.items()
+    rows[0]["key"] = "mutated"
+
+    assert cache.get(handle).items() == [{"key": "a"}]
+    assert entry.count == 1
+    assert entry.meta == {"complete": True}
+
+
+def test_result_set_cache_evicts_lru_by_bytes_and_entries():
+    cache = ResultSetCache(max_bytes=200, max_entries=3)
+    first = cache.store("s", "objects", [{"pad": "x" * 60}])
+    second = cache.store("s", "objects", [{"pad": "y" * 60}])
+    cache.get(first)
+    third = cache.store("s", "objects", [{"pad": "z" * 60}])
+
+    assert cache.get(second) is None
+    assert cache.get(first) is not None and cache.get(third) is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.store("s", "objects", [{"pad": "x" * 500}]) is None
+
+    small = ResultSetCache(max_entries=2)
+    handles = [small.store("s", "objects", [{"n": n}]) for n in range(3)]
+    assert small.get(handles[0]) is None
+    assert small.stats()["entries"] == 2
+
+
+def test_result_set_cache_expires_and_can_be_disabled(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("src.result_sets.time.monotonic", lambda: clock[0])
+    cache = ResultSetCache(ttl_seconds=10)
+    handle = cache.store("s", "objects", [{"n": 1}])
+    clock[0] += 11
+
+    assert cache.get(handle) is None
+    assert ResultSetCache(max_bytes=0).store("s", "objects", [{"n": 1}]) is None
+
+
+def test_sort_rows_handles_missing_and_mixed_values():
+    rows = [{"v": 2}, {"v": "b"}, {}, {"v": 1}, {"v": "a"}]
+    assert sort_rows(rows, "v") == [{"v": 1}, {"v": 2}, {"v": "a"}, {"v": "b"}, {}]
+    assert sort_rows(rows, "v", descending=True)[-1] == {}
+
+
+@pytest_asyncio.fixture
+async def console_client():
+    console = FakeNakamaConsole(SyntheticDataset(users=40, collections={"progress": 600}))
+    client = console.client()
+    await client.authenticate()
+    yield console, client
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_read_result_set_serves_windows_without_console(console_client):
+    console, client = console_client
+    result_sets = ResultSetCache()
+
+    listing = await nakama_list_storage(
+        client, collection="progress", max_objects=500, result_sets=result_sets
+    )
+    handle = listing["result_handle"]
+    console.reset_counters()
+
+    window = await nakama_read_result_set(result_sets, handle, offset=200, limit=200)
+    assert [o["key"] for o in window["items"]] == [
+        o["key"] for o in listing["objects"][200:400]
+    ]
+    assert window["next_offset"] == 400
+    assert window["source_complete"] is False
+
+    resorted = await nakama_read_result_set(
+        result_sets,
+        handle,
+        offset=490,
+        limit=50,
+        sort_by="create_time",
+        descending=True,
+        fields=["create_time"],
+    )
+    assert resorted["returned"] == 10
+    assert resorted["next_offset"] is None
+    assert set(resorted["items"][0]) == {"collection", "key", "user_id", "create_time"}
+    assert resorted["items"][0]["create_time"] >= resorted["items"][-1]["create_time"]
+
+    assert console.total_requests == 0
+
+
+@pytest.mark.asyncio
+async def test_only_aggregated_listings_get_handles(console_client):
+    _console, client = console_client
+    result_sets = ResultSetCache()
+
+    page = await nakama_list_storage(
+        client, collection="progress", cursor=None, max_objects=10, result_sets=result_sets
+    )
+    keys = await nakama_list_storage_keys(
+        client, collection="progress", max_objects=10, result_sets=result_sets
+    )
+    accounts = await nakama_list_accounts(client, max_objects=5, result_sets=result_sets)
+    single = await nakama_list_accounts(client, cursor="", result_sets=result_sets)
+
+    assert page["result_handle"] and keys["result_handle"] and accounts["result_handle"]
+    assert single["result_handle"] is None
+    read = await nakama_read_result_set(result_sets, keys["result_handle"], fields=["key"])
+    assert set(read["items"][0]) == {"key", "user_id"}
+
+
+@pytest.mark.asyncio
+async def test_read_result_set_rejects_unknown_handle():
+    with pytest.raises(ValueError, match="Unknown or expired result set"):
+        await nakama_read_result_set(ResultSetCache(), "rs_missing")
@@ -0,0 +1,122 @@
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.nakama_client import NakamaConsoleClient
+from src.retry import RetryBudget, RetryPolicy, retry_after_seconds
+from tests.test_nakama_client import _settings
+
+
+def _response(status: int, *, json=None, headers=None) -> httpx.Response:
+    request = httpx.Request("GET", "http://127.0.0.1:7351/v2/console/account")
+    return httpx.Response(status, json=json, headers=headers, request=request)
+
+
+def _client(**overrides) -> NakamaConsoleClient:
+    settings = _settings().model_copy(
+        update={"nakama_retry_base_delay_seconds": 0.001, **overrides}
+    )
+    client = NakamaConsoleClient(settings)
+    client._token = "token"
+    return client
+
+
+def test_backoff_is_capped():
+    policy = RetryPolicy(base_delay=1.0, max_delay=2.0)
+    for retry_number in range(10):
+        assert 0 <= policy.backoff(retry_number) <= 2.0
+
+
+def test_retry_after_parses_seconds_and_dates():
+    assert retry_after_seconds(_response(429, headers={"Retry-After": "3"})) == 3.0
+    assert retry_after_seconds(_response(429)) is None
+    past = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert retry_after_seconds(_response(503, headers={"Retry-After": past})) == 0.0
+
+
+def test_budget_limits_retries():
+    budget = RetryBudget(ratio=0.5, min_tokens=1.0)
+    assert budget.try_spend() is True
+    assert budget.try_spend() is False
+    budget.record_request()
+    budget.record_request()
+    assert budget.try_spend() is True
+    assert budget.stats()["retries"] == 2
+    assert budget.stats()["budget_exhausted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_retries_transient_errors():
+    client = _client()
+
+    with patch.object(client._client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.side_effect = [
+            httpx.ConnectError("refused"),
+            _response(503),
+            _response(200, json={"users": []}),
+        ]
+        data = await client.get("/v2/console/account")
+
+    assert data == {"users": []}
+    assert mock_request.await_count == 3
+    assert client.stats()["retry"]["retries"] == 2
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_get_gives_up_after_max_attempts():
+    client = _client(nakama_retry_max_attempts=2)
+
+    with patch.object(client._client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.return_value = _response(500)
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get("/v2/console/account")
+
+    assert mock_request.await_count == 2
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_retry_after_longer_than_max_delay_fails_fast():
+    client = _client()
+
+    with patch.object(client._client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.return_value = _response(429, headers={"Retry-After": "120"})
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get("/v2/console/account")
+
+    assert mock_request.await_count == 1
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_post_is_not_retried():
+    client = _client()
+
+    with patch.object(client._client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.return_value = _response(503)
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.post("/v2/console/something")
+
+    assert mock_request.await_count == 1
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_exhausted_budget_stops_retries():
+    client = _client()
+    client.retry_budget = RetryBudget(ratio=0.0, min_tokens=0.0)
+
+    with patch.object(client._client, "request", new_callable=AsyncMock) as mock_request:
+        mock_request.return_value = _response(502)
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get("/v2/console/account")
+
+    assert mock_request.await_count == 1
+    assert client.stats()["retry"]["budget_exhausted"] == 1
+
+    await client.close()
@@ -0,0 +1,136 @@
+import asyncio
+import functools
+import json
+
+import pytest
+import pytest_asyncio
+
+from src.resources import SCAN_RESOURCE_SCHEME, ExportCache
+from src.deadline import Deadline
+from src.tools.scan import nakama_scan_collection
+from src.tools.storage import _get_storage_object, _storage_pages
+from src.value_scan import open_value_scan
+from tests.fake_console import FakeNakamaConsole, SyntheticDataset
+
+
+@pytest_asyncio.fixture
+async def console_client():
+    console = FakeNakamaConsole(
+        SyntheticDataset(users=20, collections={"progress": 450}, value_bytes=300)
+    )
+    client = console.client()
+    await client.authenticate()
+    yield console, client
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_scan_aggregates_every_value(console_client):
+    console, client = console_client
+
+    result = await nakama_scan_collection(client, collection="progress", max_objects=1000)
+
+    assert result["listed"] == 450
+    assert result["fetched"] == 450
+    assert result["fetch_errors"] == 0
+    assert result["decode_failures"] == 0
+    assert result["complete"] is True
+    assert result["limit_reached"] is False
+    assert sum(result["value_size"]["histogram"].values()) == 450
+    assert len(result["sampled_keys"]) == 10
+
+
+@pytest.mark.asyncio
+async def test_scan_slices_resume_with_next_offset(console_client):
+    _, client = console_client
+
+    first = await nakama_scan_collection(client, collection="progress", max_objects=150)
+    assert first["limit_reached"] is True
+    assert first["next_offset"] == 150
+
+    rest = await nakama_scan_collection(
+        client, collection="progress", max_objects=1000, start_offset=first["next_offset"]
+    )
+    assert rest["processed"] == 300
+    assert rest["complete"] is True
+
+
+@pytest.mark.asyncio
+async def test_scan_window_bounds_requests_in_flight(console_client):
+    console, client = console_client
+    in_flight = 0
+    peak = 0
+    original = client.get
+
+    async def tracking_get(path, *args, **kwargs):
+        nonlocal in_flight, peak
+        if path.count("/") > 4:
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                await asyncio.sleep(0.001)
+                return await original(path, *args, **kwargs)
+            finally:
+                in_flight -= 1
+        return await original(path, *args, **kwargs)
+
+    client.get = tracking_get
+    result = await nakama_scan_collection(
+        client, collection="progress", max_objects=200, concurrency=4
+    )
+    assert result["fetched"] == 200
+    assert peak <= 4
+
+
+@pytest.mark.asyncio
+async def test_scan_writes_ndjson_resource(console_client):
+    _, client = console_client
+    cache = ExportCache()
+
+    result = await nakama_scan_collection(
+        client, collection="progress", max_objects=30, include_values=True, export_cache=cache
+    )
+
+    uri = result["resource_uri"]
+    assert uri.startswith(SCAN_RESOURCE_SCHEME + "/progress/")
+    entry = cache.get(uri)
+    assert entry.mime_type == "application/x-ndjson"
+    lines = entry.payload.decode("utf-8").splitlines()
+    assert len(lines) == 30
+    assert isinstance(json.loads(lines[0])["value"], dict)
+    assert result["values_truncated"] is False
+
+
+@pytest.mark.asyncio
+async def test_scan_deadline_returns_partial_aggregate(console_client):
+    console, client = console_client
+    console.latency = 0.02
+
+    result = await nakama_scan_collection(
+        client, collection="progress", max_objects=450, deadline=Deadline(0.3, reserve=0)
+    )
+
+    assert result["deadline_exceeded"] is True
+    assert result["complete"] is False
+    assert result["processed"] < 450
+    assert 0 < result["next_offset"] <= result["processed"]
+    assert "next_offset" in result["hint"]
+
+
+@pytest.mark.asyncio
+async def test_value_scan_block_cancels_fetches_however_it_exits(console_client):
+    console, client = console_client
+    console.latency = 0.02
+    before = asyncio.all_tasks()
+    fetch_page, _ = _storage_pages(client, collection="progress")
+    get_object = functools.partial(_get_storage_object, client)
+
+    with pytest.raises(RuntimeError):
+        async with open_value_scan(
+            fetch_page, get_object, collection="progress", max_objects=450
+        ) as scan:
+            results = scan.__aiter__()  # Held, so only the block can close it.
+            await results.__anext__()
+            raise RuntimeError("consumer failed")
+
+    assert asyncio.all_tasks() - before == set()
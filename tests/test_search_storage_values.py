@@ -0,0 +1,77 @@
+import pytest
+import pytest_asyncio
+
+from src.models import SearchStorageValuesArgs
+from src.tools.scan import nakama_search_storage_values
+from tests.fake_console import FakeNakamaConsole, SyntheticDataset, user_id_for
+
+
+@pytest_asyncio.fixture
+async def console_client():
+    console = FakeNakamaConsole(SyntheticDataset(users=20, collections={"progress": 300}))
+    client = console.client()
+    await client.authenticate()
+    yield console, client
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_path_equality_finds_every_match(console_client):
+    console, client = console_client
+    ds = console.dataset
+
+    result = await nakama_search_storage_values(
+        client, collection="progress", path="level", equals=7, max_matches=200
+    )
+
+    assert result["complete"] is True
+    assert result["scanned"] == 300
+    assert sorted((m["key"], m["user_id"]) for m in result["matches"]) == sorted(
+        (ds.key_for("progress", i), user_id_for(i % ds.users)) for i in (7, 107, 207)
+    )
+    assert result["matches"][0]["snippet"] == "7"
+
+
+@pytest.mark.asyncio
+async def test_stops_at_max_matches_with_resume_offset(console_client):
+    console, client = console_client
+
+    result = await nakama_search_storage_values(
+        client, collection="progress", contains='"vip":true', max_matches=2, concurrency=1
+    )
+
+    assert result["matched"] == 2
+    assert result["match_limit_reached"] is True
+    assert result["complete"] is False
+    assert result["next_offset"] == 11
+    assert all('"vip":true' in m["snippet"] for m in result["matches"])
+
+
+@pytest.mark.asyncio
+async def test_scan_cap_bounds_fetches(console_client):
+    console, client = console_client
+    console.reset_counters()
+
+    result = await nakama_search_storage_values(
+        client, collection="progress", regex="GOLDEN", ignore_case=True, max_scanned=50
+    )
+
+    assert result["matched"] == 0
+    assert result["scanned"] == 50
+    assert result["scan_limit_reached"] is True
+    assert result["next_offset"] == 50
+    assert console.total_requests <= 50 + 2
+
+
+def test_args_require_exactly_one_test():
+    with pytest.raises(ValueError):
+        SearchStorageValuesArgs(collection="c")
+    with pytest.raises(ValueError):
+        SearchStorageValuesArgs(collection="c", contains="a", regex="b")
+    with pytest.raises(ValueError):
+        SearchStorageValuesArgs(collection="c", contains="a", equals=1)
+    with pytest.raises(ValueError):
+        SearchStorageValuesArgs(collection="c", regex="(")
+    with pytest.raises(ValueError):
+        SearchStorageValuesArgs(collection="c", regex="")
+    assert SearchStorageValuesArgs(collection="c", path="a.b").path == "a.b"
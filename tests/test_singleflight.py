@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from src.singleflight import SingleFlight, request_key
+
+
+def test_request_key_ignores_param_order():
+    assert request_key("/p", {"a": 1, "b": "x"}) == request_key("/p", {"b": "x", "a": 1})
+    assert request_key("/p", {"a": 1}) != request_key("/q", {"a": 1})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = {"count": 0}
+    release = asyncio.Event()
+
+    async def work():
+        calls["count"] += 1
+        await release.wait()
+        return {"value": 1}
+
+    tasks = [asyncio.create_task(flight.do("k", work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls["count"] == 1
+    assert all(r == {"value": 1} for r in results)
+    assert flight.stats() == {"hits": 4, "misses": 1, "in_flight": 0}
+    # Coalesced callers get independent copies
+    results[0]["value"] = 2
+    assert results[1]["value"] == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_all_waiters():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        raise RuntimeError("boom")
+
+    tasks = [asyncio.create_task(flight.do("k", work)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelling_only_waiter_cancels_task():
+    flight = SingleFlight()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def work():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    task = asyncio.create_task(flight.do("k", work))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.wait_for(cancelled.wait(), 1)
+
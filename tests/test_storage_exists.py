@@ -0,0 +1,159 @@
+import pytest
+
+from src.deadline import Deadline
+from src.models import StorageExistsArgs
+from src.tools.storage_exists import nakama_storage_exists
+from tests.fake_console import FakeNakamaConsole, SyntheticDataset, user_id_for
+
+
+async def _client(console: FakeNakamaConsole):
+    client = console.client()
+    await client.authenticate()
+    console.reset_counters()
+    return client
+
+
+def _ident(ds: SyntheticDataset, collection: str, index: int) -> dict:
+    return {
+        "collection": collection,
+        "key": ds.key_for(collection, index),
+        "user_id": user_id_for(index % ds.users),
+    }
+
+
+@pytest.mark.asyncio
+async def test_dense_ids_are_answered_by_one_collection_listing():
+    console = FakeNakamaConsole(SyntheticDataset(users=10, collections={"progress": 300}))
+    ds = console.dataset
+    client = await _client(console)
+    present = [_ident(ds, "progress", i) for i in range(0, 300, 7)]
+    absent = [
+        {"collection": "progress", "key": "progress_000099", "user_id": user_id_for(1)},
+        {"collection": "progress", "key": "progress_000005", "user_id": user_id_for(99)},
+    ]
+
+    result = await nakama_storage_exists(client, present + absent)
+    await client.close()
+
+    assert (result["present"], result["missing"], result["unknown"]) == (43, 2, 0)
+    assert result["complete"] is True
+    assert result["requests"]["collection_listing"] <= 3
+    assert result["requests"]["get"] == result["requests"]["key_listing"] == 0
+    assert console.requests["storage_get"] == 0
+    first = result["results"][0]
+    assert first["exists"] is True and first["source"] == "collection_listing"
+    assert first["version"] and first["update_time"]
+    assert [r["exists"] for r in result["results"][-2:]] == [False, False]
+
+
+@pytest.mark.asyncio
+async def test_sparse_ids_in_a_large_collection_fall_back_to_key_listings():
+    console = FakeNakamaConsole(SyntheticDataset(users=1000, collections={"progress": 100_000}))
+    ds = console.dataset
+    client = await _client(console)
+    ids = [_ident(ds, "progress", i) for i in (5, 50_007, 99_999)]
+    # Sorts before every listed key, but key order alone never proves absence.
+    ids.append({"collection": "progress", "key": "progress_00000", "user_id": user_id_for(8)})
+
+    # Default read-ahead: the cost estimate is made before page 2 is requested.
+    result = await nakama_storage_exists(client, ids)
+    await client.close()
+
+    assert (result["present"], result["missing"]) == (3, 1)
+    # The first page answers index 5 and shows a full listing would cost 1000 pages.
+    assert result["requests"] == {
+        "collection_listing": 1,
+        "user_listing": 0,
+        "key_listing": 3,
+        "get": 0,
+    }
+    assert [r["source"] for r in result["results"]] == [
+        "collection_listing",
+        "key_listing",
+        "key_listing",
+        "key_listing",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_several_ids_of_one_user_share_a_user_listing():
+    console = FakeNakamaConsole(
+        SyntheticDataset(users=1000, collections={"progress": 100_000, "inventory": 50_000})
+    )
+    ds = console.dataset
+    client = await _client(console)
+    ids = [
+        _ident(ds, "progress", 50_007),
+        _ident(ds, "inventory", 20_007),
+        {"collection": "progress", "key": "progress_nope", "user_id": user_id_for(7)},
+    ]
+
+    result = await nakama_storage_exists(client, ids)
+    await client.close()
+
+    assert [r["exists"] for r in result["results"]] == [True, True, False]
+    assert {r["source"] for r in result["results"]} == {"user_listing"}
+    assert result["requests"]["user_listing"] == 1
+    assert result["requests"]["key_listing"] == result["requests"]["get"] == 0
+
+
+@pytest.mark.asyncio
+async def test_ids_a_listing_cannot_express_use_get():
+    console = FakeNakamaConsole(SyntheticDataset(users=10, collections={"progress": 300}))
+    ds = console.dataset
+    client = await _client(console)
+    ids = [
+        {"collection": "progress", "key": "progress_000001%", "user_id": user_id_for(1)},
+        {"collection": "inventory", "key": ds.key_for("progress", 3), "user_id": ""},
+    ]
+
+    result = await nakama_storage_exists(client, ids)
+    await client.close()
+
+    assert [(r["exists"], r["source"]) for r in result["results"]] == [
+        (False, "get"),
+        (False, "get"),
+    ]
+    assert result["requests"]["get"] == 2
+
+
+@pytest.mark.asyncio
+async def test_only_missing_and_duplicates():
+    console = FakeNakamaConsole(SyntheticDataset(users=10, collections={"progress": 300}))
+    ds = console.dataset
+    client = await _client(console)
+    hit = _ident(ds, "progress", 12)
+    miss = {**hit, "key": "progress_000777"}
+
+    result = await nakama_storage_exists(client, [hit, miss, hit, miss], only_missing=True)
+    await client.close()
+
+    assert (result["unique"], result["duplicates"]) == (2, 2)
+    assert (result["present"], result["missing"]) == (1, 1)
+    assert [r["key"] for r in result["results"]] == ["progress_000777"] * 2
+
+
+@pytest.mark.asyncio
+async def test_deadline_leaves_unchecked_ids_unknown():
+    console = FakeNakamaConsole(
+        SyntheticDataset(users=10, collections={"progress": 300}), latency=0.05
+    )
+    ds = console.dataset
+    client = await _client(console)
+
+    result = await nakama_storage_exists(
+        client,
+        [_ident(ds, "progress", i) for i in (1, 2)],
+        deadline=Deadline(0.01, reserve=0),
+    )
+    await client.close()
+
+    assert result["deadline_exceeded"] is True
+    assert result["complete"] is False
+    assert result["unknown"] == 2
+    assert all(r["exists"] is None and r["error"] for r in result["results"])
+
+
+def test_args_bound_the_batch():
+    with pytest.raises(ValueError):
+        StorageExistsArgs(objects=[])
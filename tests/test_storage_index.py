@@ -0,0 +1,215 @@
+import threading
+
+import pytest
+import pytest_asyncio
+
+from src.metadata_index import StorageMetadataIndex
+from src.models import QueryStorageIndexArgs
+from src.tools import storage_index
+from src.tools.storage_index import nakama_query_storage_index, nakama_sync_storage_index
+from tests.fake_console import (
+    BASE_EPOCH,
+    FakeNakamaConsole,
+    SyntheticDataset,
+    _iso,
+    user_id_for,
+)
+
+
+@pytest_asyncio.fixture
+async def console_client():
+    console = FakeNakamaConsole(SyntheticDataset(users=20, collections={"progress": 300}))
+    client = console.client()
+    await client.authenticate()
+    yield console, client
+    await client.close()
+
+
+@pytest.fixture
+def index():
+    index = StorageMetadataIndex(":memory:")
+    yield index
+    index.close()
+
+
+@pytest.mark.asyncio
+async def test_first_sync_crawls_and_queries_are_index_backed(console_client, index):
+    console, client = console_client
+
+    synced = await nakama_sync_storage_index(client, index, collection="progress")
+    assert synced["full"] is True
+    assert synced["complete"] is True
+    assert synced["inserted"] == synced["indexed_rows"] == 300
+
+    console.reset_counters()
+    result = await nakama_query_storage_index(
+        index,
+        collection="progress",
+        user_id=user_id_for(3),
+        where={"permission_read": 0},
+        sort_by="update_time",
+        descending=True,
+        limit=2,
+    )
+
+    assert console.total_requests == 0
+    assert result["index_backed"] is True
+    assert result["index_age_seconds"] is not None
+    assert result["total"] == 5  # indices 3, 63, 123, 183, 243 (index % 3 == 0)
+    assert [o["key"] for o in result["objects"]] == ["progress_000012", "progress_000009"]
+    assert result["next_offset"] == 2
+
+    counted = await nakama_query_storage_index(
+        index, collection="progress", key_prefix="progress_00001", limit=0
+    )
+    assert counted["objects"] == [] and counted["total"] == 100
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_rewrites_only_changes_and_applies_deletions(
+    console_client, index
+):
+    console, client = console_client
+    ds = console.dataset
+    await nakama_sync_storage_index(client, index, collection="progress")
+
+    ds.touch("progress", 7)
+    ds.collections["progress"] = 290
+    result = await nakama_sync_storage_index(client, index, collection="progress")
+
+    assert result["full"] is False
+    assert (result["inserted"], result["updated"], result["unchanged"]) == (0, 1, 289)
+    assert result["deleted"] == 10
+    assert result["indexed_rows"] == 290
+    touched = await nakama_query_storage_index(
+        index, collection="progress", where={"updated_after": _iso(BASE_EPOCH + 300)}
+    )
+    assert [(o["key"], o["user_id"]) for o in touched["objects"]] == [
+        (ds.key_for("progress", 7), user_id_for(7))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_resumed_pass_rechecks_unseen_rows_before_deleting(
+    console_client, index, monkeypatch
+):
+    console, client = console_client
+    ds = console.dataset
+    await nakama_sync_storage_index(client, index, collection="progress")
+    ds.collections["progress"] = 250
+    monkeypatch.setattr(storage_index, "MAX_INDEX_SYNC_OBJECTS", 100)
+
+    first = await nakama_sync_storage_index(client, index, collection="progress")
+    assert (first["complete"], first["next_offset"], first["deleted"]) == (False, 100, 0)
+    # As if row 5 had shifted past the resume offset and was never listed.
+    index._db.execute(
+        "UPDATE storage_objects SET generation = 0 WHERE key = ? AND user_id = ?",
+        (ds.key_for("progress", 5), user_id_for(5)),
+    )
+    middle = await nakama_sync_storage_index(client, index, collection="progress")
+    assert middle["resumed"] is True and middle["start_offset"] == 100
+    last = await nakama_sync_storage_index(client, index, collection="progress")
+
+    assert last["complete"] is True
+    assert last["listed"] == 50
+    assert (last["rechecked"], last["deleted"], last["stale_rows"]) == (51, 50, 0)
+    assert index.count("progress") == 250
+    kept = await nakama_query_storage_index(
+        index, collection="progress", key_prefix=ds.key_for("progress", 5), user_id=user_id_for(5)
+    )
+    assert kept["total"] == 1 and kept["index_complete"] is True
+
+
+@pytest.mark.asyncio
+async def test_unconfirmed_deletions_are_reported_as_stale(console_client, index, monkeypatch):
+    console, client = console_client
+    await nakama_sync_storage_index(client, index, collection="progress")
+    console.dataset.collections["progress"] = 250
+    monkeypatch.setattr(storage_index, "MAX_INDEX_SYNC_OBJECTS", 200)
+
+    async def out_of_time(client, objects, **kwargs):
+        return {
+            "results": [{**ident, "exists": None} for ident in objects],
+            "deadline_exceeded": True,
+        }
+
+    monkeypatch.setattr(storage_index, "nakama_storage_exists", out_of_time)
+    await nakama_sync_storage_index(client, index, collection="progress")
+    last = await nakama_sync_storage_index(client, index, collection="progress")
+    assert (last["complete"], last["deleted"], last["stale_rows"]) == (True, 0, 50)
+    assert last["deadline_exceeded"] is True
+
+    result = await nakama_query_storage_index(index, collection="progress", limit=0)
+    assert result["total"] == 300
+    assert (result["index_complete"], result["stale_rows"]) == (False, 50)
+    assert "no longer exist" in result["hint"]
+
+
+@pytest.mark.asyncio
+async def test_sqlite_work_runs_off_the_event_loop_thread(console_client, index, monkeypatch):
+    _, client = console_client
+    threads = set()
+    apply_page = index.apply_page
+
+    def recording_apply_page(*args):
+        threads.add(threading.get_ident())
+        return apply_page(*args)
+
+    monkeypatch.setattr(index, "apply_page", recording_apply_page)
+    result = await nakama_sync_storage_index(client, index, collection="progress")
+
+    assert result["inserted"] == 300
+    assert threads and threading.get_ident() not in threads
+
+
+@pytest.mark.asyncio
+async def test_value_sizes_are_measured_for_changed_rows(console_client, index):
+    console, client = console_client
+
+    await nakama_sync_storage_index(
+        client, index, collection="progress", include_value_sizes=True
+    )
+    result = await nakama_query_storage_index(
+        index, collection="progress", sort_by="value_bytes", descending=True, limit=1
+    )
+    assert result["objects"][0]["value_bytes"] >= 200
+
+    console.reset_counters()
+    again = await nakama_sync_storage_index(
+        client, index, collection="progress", include_value_sizes=True
+    )
+    assert again["value_sizes_measured"] == 0
+    assert console.total_requests == 3  # listing pages only
+
+
+@pytest.mark.asyncio
+async def test_disabled_or_unsynced_index_is_reported(console_client, index):
+    _, client = console_client
+
+    with pytest.raises(ValueError, match="METADATA_INDEX_PATH"):
+        await nakama_sync_storage_index(client, None, collection="progress")
+    with pytest.raises(ValueError, match="not indexed"):
+        await nakama_query_storage_index(index, collection="progress")
+
+
+def test_query_args_normalize_prefix_and_reject_unknown_sort():
+    assert QueryStorageIndexArgs(collection="c", key_prefix="lvl%").key_prefix == "lvl"
+    with pytest.raises(ValueError):
+        QueryStorageIndexArgs(collection="c", sort_by="value")
+
+
+def test_key_regex_and_like_escaping(index):
+    sync = index.begin_sync("c")
+    index.apply_page(
+        sync,
+        [
+            {"key": "a_1", "user_id": "u", "version": "1"},
+            {"key": "ab1", "user_id": "u", "version": "1"},
+        ],
+    )
+
+    assert index.query("c", key_prefix="a_")[1] == 1
+    assert [r["key"] for r in index.query("c", where={"key_regex": r"^a\w1$"})[0]] == [
+        "a_1",
+        "ab1",
+    ]
@@ -22,3 +22,28 @@ def test_format_storage_object_truncates_large_value():
     assert result["value_truncated"] is True
     assert len(result["value_preview"]) == 100
     assert result["value_bytes"] > 100
+
+
+def test_format_storage_object_selects_value_paths():
+    obj = {
+        "collection": "c",
+        "key": "k",
+        "value": {"inventory": {"items": [{"id": "sword"}, {"id": "shield"}]}, "pad": "x" * 5000},
+    }
+    result = format_storage_object(
+        obj, value_paths=["/inventory/items/1/id", "inventory.items[0]", "gems"]
+    )
+    assert "value" not in result
+    assert result["value_paths"] == {
+        "/inventory/items/1/id": "shield",
+        "inventory.items[0]": {"id": "sword"},
+    }
+    assert result["missing_paths"] == ["gems"]
+
+
+def test_format_storage_object_truncates_large_selection():
+    obj = {"collection": "c", "key": "k", "value": {"data": "x" * 5000}}
+    result = format_storage_object(obj, max_value_chars=100, value_paths=["data"])
+    assert "value_paths" not in result
+    assert result["value_truncated"] is True
+    assert result["missing_paths"] == []